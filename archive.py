@@ -0,0 +1,205 @@
+import gzip
+import json
+import os
+from datetime import date
+import instrumentation
+from file_handler import FileHandler
+from storage import id_allocator
+from task import date_to_ordinal
+from text_index import TextIndex, tokenize
+
+class TaskArchive:
+    """Cold store of completed tasks as gzip-compressed JSON Lines"""
+
+    def __init__(self, filename="tasks_archive.jsonl.gz", compresslevel=6):
+        """
+        Args:
+            filename: Archive file; appends add gzip members to it
+            compresslevel: gzip level for appended tasks
+        """
+        self.filename = filename
+        self.compresslevel = compresslevel
+        # Only used for the record layout shared with tasks.json
+        self.records = FileHandler(None)
+
+    @classmethod
+    def for_store(cls, file_handler):
+        """Get the archive kept next to a task store, e.g. tasks_archive.jsonl.gz"""
+        base = os.path.splitext(os.path.normpath(file_handler.filename))[0]
+        return cls(base + "_archive.jsonl.gz")
+
+    def append(self, tasks):
+        """
+        Add tasks to the end of the archive without reading it
+        Returns:
+            Number of tasks written
+        """
+        data = "".join(json.dumps(self.records.task_to_dict(task), ensure_ascii=False) + "\n"
+                       for task in tasks).encode("utf-8")
+        if not data:
+            return 0
+        with open(self.filename, 'ab') as raw:
+            # Each append is a gzip member of its own; readers see one stream
+            with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=self.compresslevel) as file:
+                file.write(data)
+            raw.flush()
+            os.fsync(raw.fileno())
+            instrumentation.count_bytes("bytes_written", raw.tell())
+        return len(tasks)
+
+    def _lines(self):
+        try:
+            file = gzip.open(self.filename, 'rb')
+        except FileNotFoundError:
+            return
+        with file:
+            try:
+                for line in file:
+                    # A line cut short by a crashed append is not a task
+                    if line.endswith(b"\n"):
+                        yield line
+            except EOFError:
+                # The last append was interrupted; everything before is whole
+                return
+
+    def iter_records(self):
+        """Stream the archived task dictionaries, oldest first"""
+        for line in self._lines():
+            yield json.loads(line)
+
+    def iter_tasks(self):
+        """Stream the archived tasks, oldest first"""
+        for record in self.iter_records():
+            yield self.records.dict_to_task(record)
+
+    def count(self):
+        """Count the archived tasks with one streaming pass"""
+        return sum(1 for _ in self._lines())
+
+    def search(self, query, limit=None):
+        """
+        Stream the archive for tasks matching every word of a query
+        Args:
+            query: Words to match; end a word with * to match it as a prefix
+            limit: Stop after this many matches, or None for all
+        Returns:
+            List of matching tasks in archive order
+        """
+        terms = TextIndex.parse_query(query)
+        if not terms:
+            return []
+        found = []
+        for line in self._lines():
+            # Cheap test on the raw line before decoding it
+            lowered = line.decode("utf-8").lower()
+            if not all(term in lowered for term, _ in terms):
+                continue
+            record = json.loads(line)
+            words = set(tokenize(record.get("title")))
+            words.update(tokenize(record.get("description")))
+            if all(any(word.startswith(term) for word in words) if prefix else term in words
+                   for term, prefix in terms):
+                found.append(self.records.dict_to_task(record))
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
+
+    def find(self, task_ids):
+        """
+        Stream the archive for tasks by ID
+        Returns:
+            Dictionary {task_id: Task} of those found
+        """
+        wanted = set(task_ids)
+        found = {}
+        for record in self.iter_records():
+            if record.get("task_id") in wanted:
+                found[record["task_id"]] = self.records.dict_to_task(record)
+        return found
+
+    def remove(self, task_ids):
+        """
+        Rewrite the archive without some tasks, streaming it once
+        Returns:
+            Number of records removed
+        """
+        unwanted = set(task_ids)
+        removed = 0
+        temp_filename = self.filename + ".tmp"
+        with open(temp_filename, 'wb') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=self.compresslevel) as file:
+                for line in self._lines():
+                    if json.loads(line).get("task_id") in unwanted:
+                        removed += 1
+                    else:
+                        file.write(line)
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(temp_filename, self.filename)
+        return removed
+
+    def archive_completed(self, task_manager, file_handler, before):
+        """
+        Move complete tasks due before a date from the store to the archive
+        Args:
+            task_manager: TaskManager holding the store's tasks
+            file_handler: FileHandler of the store
+            before: Date string YYYY-MM-DD; tasks without a valid due date stay
+        Returns:
+            List of archived task IDs
+        Raises:
+            ValueError for an invalid date, RuntimeError if the store
+            could not be saved (the tasks are then also still in it)
+        """
+        ordinal = date_to_ordinal(before)
+        if ordinal is None:
+            raise ValueError(f"Invalid date: {before}")
+        tasks = task_manager.query(status="Complete", due_to=date.fromordinal(ordinal - 1).isoformat())
+        tasks = [task for task in tasks if task.due_ordinal]
+        if not tasks:
+            return []
+
+        # Archive first: a crash in between leaves a task in both places,
+        # never in neither
+        self.append(tasks)
+        task_ids = [task.task_id for task in tasks]
+        with task_manager.batch() as batch:
+            batch.delete(task_ids)
+        if not file_handler.save_changes(task_manager.tasks, task_ids):
+            raise RuntimeError(f"Could not save {file_handler.filename}")
+        return task_ids
+
+    def restore(self, task_manager, file_handler, task_ids):
+        """
+        Move archived tasks back into the store
+        Args:
+            task_manager: TaskManager holding the store's tasks
+            file_handler: FileHandler of the store
+            task_ids: IDs of archived tasks to restore
+        Returns:
+            List of restored tasks; a task whose ID was reused in the
+            meantime comes back under a new ID
+        Raises:
+            ValueError if an ID is not archived, RuntimeError if the store
+            could not be saved
+        """
+        found = self.find(task_ids)
+        missing = [task_id for task_id in task_ids if task_id not in found]
+        if missing:
+            raise ValueError(f"Not in the archive: {', '.join(map(str, missing))}")
+
+        tasks = []
+        # New IDs come from the store, as for new tasks, so none is one
+        # another process reserved or that a deleted task had
+        new_id = id_allocator(file_handler, set(task_manager.tasks) | set(found))
+        for task_id, task in found.items():
+            if task_id in task_manager.tasks:
+                task.task_id = new_id()
+            tasks.append(task)
+        with task_manager.batch() as batch:
+            batch.add_tasks(tasks)
+        if not file_handler.save_changes(task_manager.tasks, sorted(batch.changed)):
+            raise RuntimeError(f"Could not save {file_handler.filename}")
+        # Removed last: a crash before this leaves a copy in the archive
+        self.remove(found)
+        return tasks
@@ -0,0 +1,158 @@
+import threading
+import time
+from file_handler import ConflictError
+
+class BackgroundWriter:
+    """Saves tasks on a background thread, coalescing bursts of changes"""
+
+    def __init__(self, file_handler, task_manager, delay=0.05, retry_delay=1.0):
+        """
+        Args:
+            file_handler: FileHandler used for the actual writes
+            task_manager: TaskManager whose tasks are saved
+            delay: Seconds to wait after a change for more changes to arrive
+            retry_delay: Seconds to wait before retrying a failed write
+        """
+        self.file_handler = file_handler
+        self.task_manager = task_manager
+        self.delay = delay
+        self.retry_delay = retry_delay
+        # The plain JSON handler writes in place unless told otherwise
+        self.file_handler.atomic = True
+
+        self._condition = threading.Condition()
+        self._dirty = False
+        # IDs changed since the last write; None means "save everything"
+        self._changed_ids = set()
+        self._writing = False
+        self._closing = False
+        self._errors = []
+        self._failures = 0
+        self._thread = threading.Thread(target=self._run, name="task-writer", daemon=True)
+        self._thread.start()
+
+    def mark_dirty(self, task_ids=None):
+        """
+        Record that tasks changed and wake the writer
+        Args:
+            task_ids: IDs of changed tasks, or None if everything may have changed
+        """
+        with self._condition:
+            if task_ids is None or self._changed_ids is None:
+                self._changed_ids = None
+            else:
+                self._changed_ids.update(task_ids)
+            self._dirty = True
+            self._condition.notify_all()
+
+    def pending(self):
+        """Check whether changes are waiting to be written"""
+        with self._condition:
+            return self._dirty or self._writing
+
+    def flush(self, timeout=None):
+        """
+        Wait until every change so far has been written
+        Returns:
+            True if nothing is left unsaved, False if a write failed or
+            the timeout passed
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            failures = self._failures
+            while self._dirty or self._writing:
+                if not self._thread.is_alive() or self._failures != failures:
+                    return False
+                # Skip the coalescing delay; someone is waiting
+                self._condition.notify_all()
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining if remaining is not None else 0.1)
+            # A conflict drops the change and leaves nothing pending, so
+            # the loop can end on a write that was discarded
+            return self._failures == failures
+
+    def close(self, timeout=None):
+        """
+        Flush outstanding changes and stop the writer thread
+        Returns:
+            True if everything was written
+        """
+        saved = self.flush(timeout)
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        return saved
+
+    def pop_errors(self):
+        """Get and clear the messages of failed writes"""
+        with self._condition:
+            errors, self._errors = self._errors, []
+            return errors
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._dirty and not self._closing:
+                    self._condition.wait()
+                if not self._dirty:
+                    return
+
+                # Let a burst of changes settle into one write
+                self._condition.wait(self.delay)
+
+                changed_ids, self._changed_ids = self._changed_ids, set()
+                self._dirty = False
+                self._writing = True
+                # A snapshot copies nothing up front, yet the UI thread can
+                # keep adding, deleting and editing while it is written
+                version = self.task_manager.version
+                tasks = self.task_manager.snapshot()
+
+            try:
+                if changed_ids is None:
+                    saved = self.file_handler.save_tasks(tasks)
+                else:
+                    saved = self.file_handler.save_changes(tasks, sorted(changed_ids))
+                error = None if saved else "write failed"
+            except ConflictError as e:
+                # Retrying cannot help; the newer version wins and is
+                # picked up by the next refresh
+                with self._condition:
+                    self._writing = False
+                    self._failures += 1
+                    self._errors.append(f"{e}; your change was discarded.")
+                    # Nothing was written: the tasks that did not clash go
+                    # out with the next write
+                    rest = set(changed_ids or ()) - set(e.task_ids)
+                    if rest:
+                        if self._changed_ids is not None:
+                            self._changed_ids.update(rest)
+                        self._dirty = True
+                    self._condition.notify_all()
+                continue
+            except Exception as e:
+                error = str(e)
+            finally:
+                tasks.close()
+
+            with self._condition:
+                self._writing = False
+                if error is None:
+                    self.task_manager.mark_stored(version)
+                else:
+                    self._failures += 1
+                    self._errors.append(f"Could not save tasks ({error}); will retry.")
+                    # Put the changes back so nothing is lost
+                    if changed_ids is None or self._changed_ids is None:
+                        self._changed_ids = None
+                    else:
+                        self._changed_ids.update(changed_ids)
+                    self._dirty = True
+                self._condition.notify_all()
+                if error is not None and not self._closing:
+                    self._condition.wait(self.retry_delay)
+                elif error is not None:
+                    return
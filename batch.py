@@ -0,0 +1,148 @@
+from validator import VALID_PRIORITIES, VALID_STATUSES, Validator
+
+class BatchError(ValueError):
+    """Raised when a batch change is invalid; nothing of the batch is kept"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(errors))
+
+class Batch:
+    """
+    Bulk changes to a TaskManager applied as one transaction
+
+    Use it as a context manager: if any change is invalid, or the block
+    raises, every change made so far is undone. Afterwards changed holds
+    the IDs to persist with a single save_changes call:
+
+        with task_manager.batch() as batch:
+            batch.set_status("Complete", status="Pending", due_to="2025-11-30")
+            batch.delete([4, 8, 15])
+        file_handler.save_changes(task_manager.tasks, sorted(batch.changed))
+    """
+
+    def __init__(self, task_manager):
+        self.task_manager = task_manager
+        # IDs of tasks added, edited or deleted so far
+        self.changed = set()
+        # Steps to undo the changes, newest last
+        self._undo = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.rollback()
+        return False
+
+    def select(self, task_ids=None, query=None, **criteria):
+        """
+        Get the tasks a bulk change applies to
+        Args:
+            task_ids: List of task IDs, all of which must exist
+            query: Query object selecting the tasks instead
+            criteria: Keyword arguments of Query selecting the tasks instead
+        Returns:
+            List of tasks
+        Raises:
+            BatchError if an ID does not exist
+        """
+        if task_ids is not None:
+            tasks = self.task_manager.tasks
+            missing = [task_id for task_id in task_ids if task_id not in tasks]
+            if missing:
+                raise BatchError([f"Task with ID {task_id} not found" for task_id in missing])
+            return [tasks[task_id] for task_id in dict.fromkeys(task_ids)]
+        if query is None and not criteria:
+            raise ValueError("Select tasks by ID list or by filter")
+        return self.task_manager.query(query, **criteria)
+
+    def add_tasks(self, tasks):
+        """
+        Add many tasks, replacing any with the same IDs
+        Raises:
+            BatchError if any task is invalid; none are added then
+        """
+        errors = []
+        for row, task in enumerate(tasks):
+            record = {"task_id": task.task_id, "title": task.title, "description": task.description,
+                      "priority": task.priority, "due_date": task.due_date, "status": task.status}
+            errors.extend(f"Task {task.task_id}: {message}"
+                          for _, _, message in Validator.validate_record(record, row))
+        if errors:
+            self.rollback()
+            raise BatchError(errors)
+
+        for task in tasks:
+            self._undo.append(("add", task.task_id, self.task_manager.tasks.get(task.task_id)))
+            self.task_manager.add_task(task)
+            self.changed.add(task.task_id)
+        return len(tasks)
+
+    def _set_field(self, field, value, tasks):
+        for task in tasks:
+            old = getattr(task, field)
+            if old != value:
+                self._undo.append(("set", task, field, old))
+                setattr(task, field, value)
+                self.changed.add(task.task_id)
+        return len(tasks)
+
+    def set_status(self, new_status, task_ids=None, query=None, **criteria):
+        """
+        Change the status of every selected task (see select)
+        Returns:
+            Number of tasks selected
+        """
+        if new_status not in VALID_STATUSES:
+            self.rollback()
+            raise BatchError([f"Invalid status {new_status!r}"])
+        return self._set_field("status", new_status, self._select(task_ids, query, criteria))
+
+    def set_priority(self, new_priority, task_ids=None, query=None, **criteria):
+        """
+        Change the priority of every selected task (see select)
+        Returns:
+            Number of tasks selected
+        """
+        if new_priority not in VALID_PRIORITIES:
+            self.rollback()
+            raise BatchError([f"Invalid priority {new_priority!r}"])
+        return self._set_field("priority", new_priority, self._select(task_ids, query, criteria))
+
+    def delete(self, task_ids=None, query=None, **criteria):
+        """
+        Delete every selected task (see select)
+        Returns:
+            Number of tasks deleted
+        """
+        tasks = self._select(task_ids, query, criteria)
+        for task in tasks:
+            self._undo.append(("delete", task))
+            self.task_manager.delete_task(task.task_id)
+            self.changed.add(task.task_id)
+        return len(tasks)
+
+    def _select(self, task_ids, query, criteria):
+        try:
+            return self.select(task_ids, query, **criteria)
+        except ValueError:
+            self.rollback()
+            raise
+
+    def rollback(self):
+        """Undo every change of the batch, newest first"""
+        while self._undo:
+            step = self._undo.pop()
+            if step[0] == "set":
+                _, task, field, old = step
+                setattr(task, field, old)
+            elif step[0] == "delete":
+                self.task_manager.add_task(step[1])
+            else:
+                _, task_id, replaced = step
+                self.task_manager.delete_task(task_id)
+                if replaced is not None:
+                    self.task_manager.add_task(replaced)
+        self.changed = set()
@@ -0,0 +1,64 @@
+"""
+Measure time to first menu of the interactive app, with and without the
+fast start (TASK_MANAGER_FAST_START=1).
+
+Run from the repository root:
+    python -m benchmarks.bench_startup [count]
+
+Each run starts main.py in a fresh interpreter on a synthetic tasks.json,
+so import time is included. "ready" is when the menu could act on the
+tasks: the exit choice is sent at once and waits for the load.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.generators import generate_tasks
+from file_handler import FileHandler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEATS = 5
+
+def time_start(directory, fast_start):
+    """
+    Start the app once
+    Returns:
+        (seconds to first menu, seconds until it could act on the tasks)
+    """
+    env = dict(os.environ, PYTHONUNBUFFERED="1", TASK_MANAGER_FAST_START="1" if fast_start else "0")
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, "main.py")], cwd=directory, env=env,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    first_menu = None
+    for line in process.stdout:
+        if "MAIN MENU" in line:
+            first_menu = time.perf_counter() - started
+            process.stdin.write("0\n")
+            process.stdin.flush()
+            break
+    process.communicate()
+    ready = time.perf_counter() - started
+    if first_menu is None:
+        raise RuntimeError("The menu was never shown")
+    return first_menu, ready
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("count", nargs="?", type=int, default=100_000, help="number of tasks (default: 100000)")
+    count = parser.parse_args(argv).count
+    with tempfile.TemporaryDirectory() as directory:
+        FileHandler(os.path.join(directory, "tasks.json")).save_tasks(generate_tasks(count))
+        results = []
+        for name, fast_start in (("eager load", False), ("fast start", True)):
+            runs = [time_start(directory, fast_start) for _ in range(REPEATS)]
+            results.append((name, min(run[0] for run in runs), min(run[1] for run in runs)))
+
+    print(f"{count} tasks, best of {REPEATS}")
+    print(f"{'':<12} {'first menu':>12} {'ready':>12}")
+    for name, first_menu, ready in results:
+        print(f"{name:<12} {first_menu * 1000:9.1f} ms {ready * 1000:9.1f} ms")
+
+if __name__ == "__main__":
+    main()
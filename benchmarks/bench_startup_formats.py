@@ -0,0 +1,57 @@
+"""
+Compare startup cost of the tasks.json layout against the binary snapshot.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup_formats [count]
+"""
+import argparse
+import os
+import tempfile
+import time
+from benchmarks.generators import generate_tasks
+from binary_handler import BinaryFileHandler, BinarySnapshot
+from file_handler import FileHandler
+
+def best_of(repeats, function):
+    """Return the fastest wall-clock time of several runs"""
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("count", nargs="?", type=int, default=100_000, help="number of tasks (default: 100000)")
+    count = parser.parse_args(argv).count
+    tasks = generate_tasks(count)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_handler = FileHandler(os.path.join(temp_dir, "tasks.json"))
+        binary_handler = BinaryFileHandler(os.path.join(temp_dir, "tasks.bin"))
+        json_handler.save_tasks(tasks)
+        binary_handler.save_tasks(tasks)
+
+        def json_header():
+            # The JSON layout needs a full parse to learn count and next_id
+            loaded = json_handler.load_tasks()
+            return len(loaded), max(loaded.keys()) + 1
+
+        def binary_header():
+            with BinarySnapshot(binary_handler.filename) as snapshot:
+                return len(snapshot), snapshot.next_id
+
+        results = [
+            ("json: full load", best_of(3, json_handler.load_tasks)),
+            ("binary: full load", best_of(3, binary_handler.load_tasks)),
+            ("json: count + next_id", best_of(3, json_header)),
+            ("binary: count + next_id", best_of(3, binary_header)),
+        ]
+        sizes = (os.path.getsize(json_handler.filename), os.path.getsize(binary_handler.filename))
+
+    print(f"{count} tasks, json {sizes[0] / 2**20:.1f} MiB, binary {sizes[1] / 2**20:.1f} MiB")
+    for name, seconds in results:
+        print(f"{name:<26} {seconds * 1000:10.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compare the memory used by compact Task objects against the previous
+dict-backed layout.
+
+Run from the repository root:
+    python -m benchmarks.bench_task_memory [count]
+"""
+import argparse
+import random
+import tracemalloc
+from datetime import date, timedelta
+from task import Task
+
+class DictTask:
+    """The former Task layout: a plain __dict__ holding strings"""
+    
+    def __init__(self, task_id, title, description, priority, due_date):
+        self.task_id = task_id
+        self.title = title
+        self.description = description
+        self.priority = priority
+        self.due_date = due_date
+        self.status = "Pending"
+
+def generate_rows(count, seed=42):
+    """Generate task fields the way they arrive from a JSON file"""
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    for task_id in range(1, count + 1):
+        due = start + timedelta(days=rng.randrange(730))
+        # Build fresh strings per row, as json.load does
+        yield (task_id, f"Task {task_id}", f"Description {task_id}",
+               "".join(rng.choice(["High", "Medium", "Low"])),
+               "".join(due.isoformat()))
+
+def measure(task_class, count):
+    """Return the bytes still held once count tasks are built from raw rows"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # Raw rows are dropped after construction, so only what the tasks keep
+    # alive (including their field values) is counted
+    tasks = [task_class(*row) for row in generate_rows(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tasks
+    return after - before
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("count", nargs="?", type=int, default=100_000, help="number of tasks (default: 100000)")
+    count = parser.parse_args(argv).count
+    legacy = measure(DictTask, count)
+    compact = measure(Task, count)
+    print(f"{count} tasks")
+    print(f"dict-backed Task: {legacy / count:8.1f} bytes/task  {legacy / 2**20:8.1f} MiB")
+    print(f"compact Task:     {compact / count:8.1f} bytes/task  {compact / 2**20:8.1f} MiB")
+    print(f"saving:           {100 * (1 - compact / legacy):7.1f}%")
+
+if __name__ == "__main__":
+    main()
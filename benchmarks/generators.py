@@ -0,0 +1,49 @@
+"""Seeded generators for synthetic task stores used by the benchmarks"""
+import random
+from datetime import date, timedelta
+from task import Task
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+# Roughly what a real store looks like: most work is Medium priority,
+# due dates cluster around today, and older tasks are mostly done
+PRIORITY_WEIGHTS = (("High", 0.2), ("Medium", 0.5), ("Low", 0.3))
+TODAY = date(2025, 11, 15)
+DUE_SPREAD_DAYS = 120
+WORDS = (
+    "report review plan sprint budget client meeting deploy release fix bug "
+    "design draft email invoice update database backup test docs onboarding "
+    "migration audit roadmap survey contract hiring training launch research"
+).split()
+
+def generate_tasks(count, seed=42):
+    """
+    Generate a dictionary of tasks with realistic field distributions
+    Args:
+        count: Number of tasks
+        seed: Random seed, so runs are comparable
+    Returns:
+        Dictionary of tasks {task_id: Task object}
+    """
+    rng = random.Random(seed)
+    priorities = [name for name, _ in PRIORITY_WEIGHTS]
+    weights = [weight for _, weight in PRIORITY_WEIGHTS]
+    tasks = {}
+    for task_id in range(1, count + 1):
+        offset = int(rng.gauss(0, DUE_SPREAD_DAYS))
+        due = TODAY + timedelta(days=offset)
+        title = " ".join(rng.choices(WORDS, k=rng.randint(2, 4))).capitalize()
+        description = " ".join(rng.choices(WORDS, k=rng.randint(4, 12)))
+        task = Task(task_id, title, description, rng.choices(priorities, weights)[0], due.isoformat())
+        # Overdue work is usually finished, future work usually is not
+        if rng.random() < (0.85 if offset < 0 else 0.1):
+            task.mark_complete()
+        tasks[task_id] = task
+    return tasks
+
+def generate_records(count, seed=42):
+    """Generate task dictionaries in the tasks.json layout"""
+    tasks = generate_tasks(count, seed)
+    return [{"task_id": task.task_id, "title": task.title, "description": task.description,
+             "priority": task.priority, "due_date": task.due_date, "status": task.status}
+            for task in tasks.values()]
@@ -0,0 +1,192 @@
+"""
+Load generator for the HTTP server: measures requests per second and latency.
+
+Run from the repository root:
+    python -m benchmarks.load_generator --tasks 100000 --connections 32 --duration 10
+    python -m benchmarks.load_generator --url http://127.0.0.1:8080
+
+Without --url a server is started in a subprocess on a synthetic store, so
+client and server do not share an interpreter lock.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+from benchmarks.generators import generate_tasks
+from storage import STORAGE_BACKENDS, open_storage
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Share of each request kind in the generated traffic
+MIX = (("get", 0.6), ("filter", 0.3), ("update", 0.1))
+FILTER_TARGET = "/tasks?status=Pending&priority=High&order_by=due_date&limit=20"
+
+def percentile(sorted_values, fraction):
+    """Get a percentile from an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    position = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[position]
+
+def build_request(kind, task_id, host):
+    if kind == "get":
+        method, target, body = "GET", f"/tasks/{task_id}", b""
+    elif kind == "filter":
+        method, target, body = "GET", FILTER_TARGET, b""
+    else:
+        method, target = "PATCH", f"/tasks/{task_id}"
+        body = json.dumps({"title": f"Updated {random.random():.6f}"}).encode("utf-8")
+    head = f"{method} {target} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n"
+    return head.encode("latin-1") + body
+
+async def read_response(reader):
+    """
+    Read one response, including chunked ones
+    Returns:
+        (status, body bytes)
+    """
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding") == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).strip(), 16)
+            data = await reader.readexactly(size + 2)
+            if size == 0:
+                break
+            chunks.append(data[:-2])
+        return status, b"".join(chunks)
+    return status, await reader.readexactly(int(headers.get("content-length", 0)))
+
+async def client(host, port, task_ids, deadline, latencies, failures):
+    """One keep-alive connection sending requests until the deadline"""
+    reader, writer = await asyncio.open_connection(host, port)
+    kinds = [kind for kind, _ in MIX]
+    weights = [weight for _, weight in MIX]
+    try:
+        while time.perf_counter() < deadline:
+            kind = random.choices(kinds, weights)[0]
+            request = build_request(kind, random.choice(task_ids), host)
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status, _ = await read_response(reader)
+            latencies[kind].append(time.perf_counter() - started)
+            if status >= 400:
+                failures[kind] = failures.get(kind, 0) + 1
+    finally:
+        writer.close()
+
+async def fetch_ids(host, port):
+    """Ask a running server for some task IDs to request"""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /tasks?order_by=task_id&limit=1000 HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    _, body = await read_response(reader)
+    writer.close()
+    return [task["task_id"] for task in json.loads(body)]
+
+async def run_load(host, port, connections, duration, task_ids=None):
+    if task_ids is None:
+        task_ids = await fetch_ids(host, port)
+    if not task_ids:
+        raise ValueError("The server holds no tasks to request")
+    latencies = {kind: [] for kind, _ in MIX}
+    failures = {}
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(client(host, port, task_ids, deadline, latencies, failures)
+                           for _ in range(connections)))
+    return latencies, failures, time.perf_counter() - started
+
+def start_server(count, directory, storage):
+    """Start a server on a synthetic store; returns (process, host, port)"""
+    filename = os.path.join(directory, "tasks")
+    handler = open_storage(storage, filename)
+    handler.save_tasks(generate_tasks(count))
+    getattr(handler, "close", lambda: None)()
+    process = subprocess.Popen([sys.executable, "main.py", "serve", "--port", "0",
+                                "--storage", storage, "--data", filename],
+                               cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    for line in process.stdout:
+        if "Serving" in line:
+            address = urlsplit(line.split()[-1])
+            return process, address.hostname, address.port
+    raise RuntimeError("Server did not start")
+
+def report(latencies, failures, elapsed):
+    """Print and return throughput and latency per request kind"""
+    results = {}
+    total = 0
+    for kind, values in latencies.items():
+        values.sort()
+        total += len(values)
+        results[kind] = {
+            "requests": len(values),
+            "failures": failures.get(kind, 0),
+            "p50_ms": percentile(values, 0.50) * 1000,
+            "p99_ms": percentile(values, 0.99) * 1000,
+        }
+        print(f"  {kind:<8} {len(values):>8} requests  p50 {results[kind]['p50_ms']:8.2f} ms"
+              f"  p99 {results[kind]['p99_ms']:8.2f} ms  {results[kind]['failures']} failed")
+    everything = sorted(value for values in latencies.values() for value in values)
+    results["total"] = {
+        "requests": total,
+        "requests_per_second": total / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(everything, 0.50) * 1000,
+        "p99_ms": percentile(everything, 0.99) * 1000,
+    }
+    print(f"✓ {total} requests in {elapsed:.1f}s: {results['total']['requests_per_second']:,.0f} req/s,"
+          f" p99 {results['total']['p99_ms']:.2f} ms")
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="server to load (default: start one on a synthetic store)")
+    parser.add_argument("--tasks", type=int, default=10000, help="synthetic store size when starting a server")
+    parser.add_argument("--storage", choices=sorted(STORAGE_BACKENDS), default="journal",
+                        help="backend of the started server (default: journal, which saves only changes)")
+    parser.add_argument("--connections", type=int, default=16, help="concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds to send requests for")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        process = None
+        if args.url:
+            address = urlsplit(args.url)
+            host, port = address.hostname, address.port or 80
+            task_ids = None
+        else:
+            process, host, port = start_server(args.tasks, directory, args.storage)
+            task_ids = list(range(1, args.tasks + 1))
+        try:
+            latencies, failures, elapsed = asyncio.run(
+                run_load(host, port, args.connections, args.duration, task_ids))
+        finally:
+            if process is not None:
+                # Interrupt like Ctrl+C so the server saves before exiting
+                process.send_signal(signal.SIGINT)
+                process.wait()
+
+    results = report(latencies, failures, elapsed)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=4)
+    return 1 if any(failures.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
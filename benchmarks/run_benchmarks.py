@@ -0,0 +1,223 @@
+"""
+Time and measure memory of TaskManager, FileHandler and Validator
+operations on synthetic stores, and compare against a stored baseline.
+
+Run from the repository root:
+    python -m benchmarks.run_benchmarks --sizes 1k,100k --output results.json
+    python -m benchmarks.run_benchmarks --baseline benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --save-baseline benchmarks/baseline.json
+
+Exits with status 1 when an operation is slower than the baseline by more
+than the threshold.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from benchmarks.generators import SIZES, TODAY, generate_records, generate_tasks
+from binary_handler import BinaryFileHandler
+from file_handler import FileHandler
+from journal_handler import JournalFileHandler
+from sharded_handler import ShardedFileHandler
+from sqlite_handler import SQLiteFileHandler
+from task import Task
+from task_manager import TaskManager
+from validator import Validator
+
+DEFAULT_THRESHOLD = 0.25
+
+def measure(function, repeats):
+    """
+    Run an operation several times
+    Returns:
+        {"seconds": best wall time, "peak_bytes": peak traced allocation}
+    """
+    times = []
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+
+    # One extra traced run; tracing slows code down, so it is not timed
+    gc.collect()
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": min(times), "peak_bytes": peak}
+
+def manager_operations(tasks):
+    """Operations on a TaskManager already holding the tasks"""
+    manager = TaskManager()
+    manager.tasks = dict(tasks)
+    ids = list(tasks)
+    # Tasks belong to one manager at a time: the replace benchmark gets
+    # copies of its own, so the shared tasks stay attached to manager
+    copies = {}
+    for task_id, task in tasks.items():
+        copy = Task(task_id, task.title, task.description, task.priority, task.due_date)
+        copy.status = task.status
+        copies[task_id] = copy
+    start = TODAY.isoformat()
+    end = TODAY.replace(day=28).isoformat()
+
+    def add_and_delete():
+        # Delete then re-add a slice of tasks so the store ends unchanged
+        for task_id in ids[:1000]:
+            task = manager.tasks[task_id]
+            manager.delete_task(task_id)
+            manager.add_task(task)
+
+    def toggle_status():
+        # Flip each status and back, so the store ends unchanged
+        for task_id in ids[:1000]:
+            task = manager.get_task_by_id(task_id)
+            status = task.status
+            task.status = "Pending" if status == "Complete" else "Complete"
+            task.status = status
+
+    def reschedule():
+        # Due-date edits reschedule deadline events; the store ends unchanged
+        for task_id in ids[:1000]:
+            task = manager.get_task_by_id(task_id)
+            due_date = task.due_date
+            task.due_date = end
+            task.due_date = due_date
+
+    return {
+        "task_manager.replace_tasks": lambda: setattr(TaskManager(), "tasks", dict(copies)),
+        "task_manager.add_delete_1000": add_and_delete,
+        "task_manager.toggle_status_1000": toggle_status,
+        "task_manager.reschedule_1000": reschedule,
+        "task_manager.filter_by_status": lambda: manager.filter_by_status("Pending"),
+        "task_manager.filter_by_priority": lambda: manager.filter_by_priority("High"),
+        "task_manager.sort_by_due_date": manager.sort_by_due_date,
+        "task_manager.due_between": lambda: manager.due_between(start, end),
+        "task_manager.next_due_20": lambda: manager.next_due(20, start),
+        "task_manager.search": lambda: manager.search("report review"),
+        "task_manager.query_top_10": lambda: manager.query(
+            status="Pending", priority="High", due_from=start, due_to=end, order_by="due_date", limit=10),
+    }
+
+def file_operations(tasks, directory):
+    """Save and load operations for every storage backend"""
+    operations = {}
+    backends = {
+        "json": FileHandler(os.path.join(directory, "tasks.json")),
+        "journal": JournalFileHandler(os.path.join(directory, "journal.json")),
+        "binary": BinaryFileHandler(os.path.join(directory, "tasks.bin")),
+        "sqlite": SQLiteFileHandler(os.path.join(directory, "tasks.db")),
+        "sharded": ShardedFileHandler(os.path.join(directory, "shards")),
+    }
+    first_id = next(iter(tasks))
+    for name, handler in backends.items():
+        handler.save_tasks(tasks)
+        operations[f"file_handler.{name}.save_tasks"] = lambda handler=handler: handler.save_tasks(tasks)
+        operations[f"file_handler.{name}.load_tasks"] = handler.load_tasks
+        operations[f"file_handler.{name}.save_one_change"] = (
+            lambda handler=handler: handler.save_changes(tasks, [first_id]))
+    return operations, backends
+
+def validator_operations(records):
+    """Single and batch validation calls"""
+    dates = [record["due_date"] for record in records]
+    priorities = [record["priority"] for record in records]
+
+    def validate_each():
+        for date_string in dates:
+            Validator.validate_date(date_string)
+
+    return {
+        "validator.validate_date_each": validate_each,
+        "validator.validate_dates": lambda: Validator.validate_dates(dates),
+        "validator.validate_priorities": lambda: Validator.validate_priorities(priorities),
+        "validator.validate_records": lambda: Validator.validate_records(records),
+    }
+
+def run_size(label, count, repeats):
+    """Run every operation against one store size"""
+    tasks = generate_tasks(count)
+    records = generate_records(count)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        operations = {}
+        operations.update(manager_operations(tasks))
+        file_ops, backends = file_operations(tasks, directory)
+        operations.update(file_ops)
+        operations.update(validator_operations(records))
+
+        for name, function in operations.items():
+            results[name] = measure(function, repeats)
+            print(f"  {label:>5} {name:<42} {results[name]['seconds'] * 1000:10.2f} ms"
+                  f" {results[name]['peak_bytes'] / 2**20:9.2f} MiB peak")
+        backends["sqlite"].close()
+    return results
+
+def compare(results, baseline, threshold):
+    """
+    Compare timings against a baseline
+    Returns:
+        List of (size, operation, baseline seconds, new seconds) regressions
+    """
+    regressions = []
+    for size, operations in results.items():
+        for name, measured in operations.items():
+            previous = baseline.get("results", {}).get(size, {}).get(name)
+            if previous and measured["seconds"] > previous["seconds"] * (1 + threshold):
+                regressions.append((size, name, previous["seconds"], measured["seconds"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1k,100k",
+                        help=f"comma-separated store sizes from {', '.join(SIZES)} (default: 1k,100k)")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per operation")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against results saved earlier")
+    parser.add_argument("--save-baseline", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before flagging, as a fraction (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    sizes = [size.strip().lower() for size in args.sizes.split(",") if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeats": args.repeats,
+        },
+        "results": {},
+    }
+    for size in sizes:
+        print(f"Store size {size}:")
+        report["results"][size] = run_size(size, SIZES[size], args.repeats)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as file:
+                json.dump(report, file, indent=4)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(report["results"], baseline, args.threshold)
+        for size, name, before, after in regressions:
+            print(f"✗ {size} {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms")
+        if regressions:
+            return 1
+        print(f"✓ No regressions beyond {args.threshold:.0%} of the baseline.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
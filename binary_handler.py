@@ -0,0 +1,287 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+import instrumentation
+from file_handler import FileHandler
+from task import Task
+from validator import Validator
+
+# File layout (all integers little-endian):
+#   header   magic, version, record count, next_id and section offsets
+#   records  fixed-width rows in the original order: task_id followed by
+#            string-table indexes for title, description, priority,
+#            due_date and status
+#   id index (task_id, record number) pairs sorted by task_id
+#   strings  one end offset per string, then the UTF-8 blob
+MAGIC = b"TSKB"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxQqQQQQ")
+RECORD = struct.Struct("<qIIIII")
+ID_ENTRY = struct.Struct("<qQ")
+NO_STRING = 0xFFFFFFFF
+FIELDS = ("title", "description", "priority", "due_date", "status")
+
+class BinarySnapshot:
+    """Read-only, memory-mapped view of a binary task snapshot"""
+
+    def __init__(self, filename):
+        with open(filename, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, self.count, self.next_id, self.records_offset,
+             self.index_offset, self.strings_offset, self.string_count) = HEADER.unpack_from(self.map, 0)
+        except struct.error:
+            self.map.close()
+            raise ValueError(f"{filename} is not a binary task snapshot")
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise ValueError(f"{filename} is not a binary task snapshot")
+
+        # End offsets of every string; string i spans ends[i-1]..ends[i]
+        ends_bytes = memoryview(self.map)[self.strings_offset:self.strings_offset + 8 * self.string_count]
+        if sys.byteorder == "little":
+            self.ends = ends_bytes.cast("Q")
+        else:
+            self.ends = array("Q", ends_bytes)
+            self.ends.byteswap()
+            ends_bytes.release()
+        self.blob_offset = self.strings_offset + 8 * self.string_count
+
+    def close(self):
+        """Release the memory map"""
+        if isinstance(self.ends, memoryview):
+            self.ends.release()
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def string(self, index):
+        """Decode one entry of the string table"""
+        if index == NO_STRING:
+            return None
+        start = self.ends[index - 1] if index else 0
+        return self.map[self.blob_offset + start:self.blob_offset + self.ends[index]].decode("utf-8")
+
+    def strings(self):
+        """Decode the whole string table"""
+        blob = self.map[self.blob_offset:self.blob_offset + (self.ends[-1] if self.string_count else 0)]
+        table = []
+        start = 0
+        for end in self.ends:
+            table.append(blob[start:end].decode("utf-8"))
+            start = end
+        return table
+
+    def record(self, position):
+        """Get the raw fields of the record at a position"""
+        return RECORD.unpack_from(self.map, self.records_offset + position * RECORD.size)
+
+    def get(self, task_id):
+        """Find one task by ID with a binary search over the ID index"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            entry_id, position = ID_ENTRY.unpack_from(self.map, self.index_offset + middle * ID_ENTRY.size)
+            if entry_id < task_id:
+                low = middle + 1
+            elif entry_id > task_id:
+                high = middle
+            else:
+                row = self.record(position)
+                return self.make_task(row, self.string)
+        return None
+
+    def iter_rows(self):
+        """Iterate the raw fields of every record in stored order"""
+        end = self.records_offset + self.count * RECORD.size
+        return RECORD.iter_unpack(self.map[self.records_offset:end])
+
+    @staticmethod
+    def make_task(row, lookup):
+        task_id, title, description, priority, due_date, status = row
+        task = Task(task_id, lookup(title), lookup(description), lookup(priority), lookup(due_date))
+        task.status = lookup(status)
+        return task
+
+class BinaryFileHandler(FileHandler):
+    """Handles saving and loading tasks in the binary snapshot format"""
+
+    def __init__(self, filename="tasks.bin"):
+        super().__init__(filename)
+        self.next_id = None
+
+    def save_tasks(self, tasks_dict):
+        """
+        Save tasks to a binary snapshot
+        Args:
+            tasks_dict: Dictionary of tasks {task_id: Task object}
+        """
+        try:
+            rows = [self.task_to_dict(task) for task in tasks_dict.values()]
+            temp_filename = self.filename + ".tmp"
+            write_snapshot(temp_filename, rows)
+            os.replace(temp_filename, self.filename)
+            self.next_id = max(tasks_dict.keys(), default=0) + 1
+            return True
+        except Exception as e:
+            print(f"Error saving tasks: {e}")
+            return False
+
+    def load_tasks(self, progress=None, validate=False):
+        """
+        Load tasks from a binary snapshot
+        Args:
+            progress: Optional callable(tasks_loaded, bytes_total) called
+                once loading finishes
+            validate: Check every record and collect problems in
+                validation_errors
+        Returns:
+            Dictionary of tasks {task_id: Task object}
+        """
+        self.validation_errors = []
+        self.load_error = None
+        try:
+            with BinarySnapshot(self.filename) as snapshot:
+                self.next_id = snapshot.next_id
+                table = snapshot.strings()
+                lookup = lambda index: None if index == NO_STRING else table[index]
+                tasks_dict = {}
+                for row_number, row in enumerate(snapshot.iter_rows()):
+                    task = snapshot.make_task(row, lookup)
+                    if validate:
+                        self.validation_errors.extend(
+                            Validator.validate_record(self.task_to_dict(task), row_number))
+                    tasks_dict[task.task_id] = task
+
+            if self.validation_errors:
+                print(f"⚠ {len(self.validation_errors)} problem(s) found in {self.filename}.")
+
+            if progress is not None or instrumentation.enabled:
+                size = os.path.getsize(self.filename)
+                instrumentation.count_bytes("bytes_read", size)
+                if progress is not None:
+                    progress(len(tasks_dict), size)
+            return tasks_dict
+
+        except FileNotFoundError:
+            print(f"File {self.filename} not found. Starting with empty task list.")
+            return {}
+
+        except ValueError as e:
+            print(f"Error reading {self.filename}. File may be corrupted. Starting fresh.")
+            self.load_error = str(e)
+            return {}
+
+        except Exception as e:
+            print(f"Unexpected error loading tasks: {e}")
+            self.load_error = str(e)
+            return {}
+
+def write_snapshot(filename, rows):
+    """
+    Write task dictionaries to a binary snapshot file
+    Args:
+        filename: Destination path
+        rows: Task dictionaries in the layout used by tasks.json
+    """
+    with instrumentation.timed("write_snapshot.serialize"):
+        parts = _pack_snapshot(rows)
+
+    with open(filename, 'wb') as file:
+        for part in parts:
+            file.write(part)
+        with instrumentation.timed("write_snapshot.fsync"):
+            file.flush()
+            os.fsync(file.fileno())
+        instrumentation.count_bytes("bytes_written", file.tell())
+
+def _pack_snapshot(rows):
+    """Encode task dictionaries into the sections of a snapshot file"""
+    string_ids = {}
+    string_list = []
+
+    def intern(value):
+        if value is None:
+            return NO_STRING
+        if not isinstance(value, str):
+            raise ValueError(f"Cannot store non-string value {value!r}")
+        index = string_ids.get(value)
+        if index is None:
+            index = string_ids[value] = len(string_list)
+            string_list.append(value)
+        return index
+
+    records = bytearray()
+    ids = []
+    for position, row in enumerate(rows):
+        records += RECORD.pack(row["task_id"], *(intern(row[field]) for field in FIELDS))
+        ids.append((row["task_id"], position))
+    ids.sort()
+
+    index = bytearray()
+    for task_id, position in ids:
+        index += ID_ENTRY.pack(task_id, position)
+
+    encoded = [value.encode("utf-8") for value in string_list]
+    ends = array("Q")
+    total = 0
+    for value in encoded:
+        total += len(value)
+        ends.append(total)
+    if sys.byteorder != "little":
+        ends.byteswap()
+
+    records_offset = HEADER.size
+    index_offset = records_offset + len(records)
+    strings_offset = index_offset + len(index)
+    next_id = ids[-1][0] + 1 if ids else 1
+
+    header = HEADER.pack(MAGIC, VERSION, len(ids), next_id, records_offset,
+                         index_offset, strings_offset, len(string_list))
+    return [header, records, index, ends.tobytes(), b"".join(encoded)]
+
+def json_to_binary(json_filename, binary_filename):
+    """Convert a tasks.json file to the binary snapshot format"""
+    with open(json_filename, 'r') as file:
+        rows = json.load(file)
+    write_snapshot(binary_filename, rows)
+    return len(rows)
+
+def binary_to_json(binary_filename, json_filename):
+    """Convert a binary snapshot back to the tasks.json layout"""
+    with BinarySnapshot(binary_filename) as snapshot:
+        table = snapshot.strings()
+        rows = []
+        for row in snapshot.iter_rows():
+            task_dict = {"task_id": row[0]}
+            for field, index in zip(FIELDS, row[1:]):
+                task_dict[field] = None if index == NO_STRING else table[index]
+            rows.append(task_dict)
+    with open(json_filename, 'w') as file:
+        json.dump(rows, file, indent=4)
+    return len(rows)
+
+def main(argv=None):
+    """Convert between tasks.json and the binary snapshot format"""
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 3 or args[0] not in ("to-binary", "to-json"):
+        print("Usage: python binary_handler.py to-binary|to-json SOURCE DESTINATION")
+        return 1
+    command, source, destination = args
+    convert = json_to_binary if command == "to-binary" else binary_to_json
+    count = convert(source, destination)
+    print(f"✓ Converted {count} task(s) from {source} to {destination}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import instrumentation
+from archive import TaskArchive
+from storage import STORAGE_BACKENDS, id_allocator, open_storage
+from task_manager import TaskManager
+from validator import Validator
+
+FIELDS = ("task_id", "title", "description", "priority", "due_date", "status")
+FORMATS = ("csv", "jsonl")
+DEFAULT_CHUNK_SIZE = 50000
+# Summary verb of each archive command
+ARCHIVE_VERBS = {"archive": "Archived", "restore": "Restored", "search-archive": "Found"}
+
+def detect_format(filename, requested=None):
+    """Pick csv or jsonl from an explicit choice or the file extension"""
+    if requested:
+        return requested
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Cannot tell the format of {filename}; use --format")
+
+def read_chunks(file, file_format, chunk_size):
+    """
+    Split an input file into chunks of whole records
+    Yields:
+        (first_row, lines) for each chunk
+    """
+    lines = []
+    first_row = 0
+    row = 0
+    inside_quotes = False
+    for line in file:
+        lines.append(line)
+        # A CSV record continues onto the next line while a quoted field is open
+        if file_format == "csv" and line.count('"') % 2:
+            inside_quotes = not inside_quotes
+        if inside_quotes:
+            continue
+        row += 1
+        if row - first_row >= chunk_size:
+            yield first_row, lines
+            lines = []
+            first_row = row
+    if lines:
+        yield first_row, lines
+
+def normalize_record(record):
+    """Fill defaults and convert CSV text fields to task dictionary values"""
+    task_id = record.get("task_id")
+    if task_id in (None, ""):
+        record["task_id"] = None
+    elif isinstance(task_id, str):
+        try:
+            record["task_id"] = int(task_id)
+        except ValueError:
+            pass
+    if record.get("description") is None:
+        record["description"] = ""
+    if not record.get("status"):
+        record["status"] = "Pending"
+    return record
+
+def parse_chunk(file_format, header, first_row, lines):
+    """
+    Parse and validate one chunk of input; runs in a worker process
+    Returns:
+        (records, errors) where errors are (row, field, message)
+    """
+    if file_format == "csv":
+        rows = csv.reader(lines)
+    else:
+        rows = iter(lines)
+
+    records = []
+    errors = []
+    row = first_row
+    while True:
+        try:
+            values = next(rows)
+        except StopIteration:
+            break
+        except csv.Error as e:
+            errors.append((row + 1, None, f"Cannot parse record: {e}"))
+            break
+        row += 1
+
+        if file_format == "csv":
+            if len(values) != len(header):
+                errors.append((row, None, f"Expected {len(header)} fields, found {len(values)}"))
+                continue
+            record = dict(zip(header, values))
+        else:
+            if not values.strip():
+                continue
+            try:
+                record = json.loads(values)
+            except ValueError as e:
+                errors.append((row, None, f"Cannot parse record: {e}"))
+                continue
+            if not isinstance(record, dict):
+                errors.append((row, None, "Record is not an object"))
+                continue
+
+        record = normalize_record(record)
+        # A missing ID is assigned on import, so validate with a placeholder
+        problems = Validator.validate_record(dict(record, task_id=record["task_id"] or 0), row)
+        if problems:
+            errors.extend(problems)
+        else:
+            records.append(record)
+    return records, errors
+
+def parse_file(filename, file_format, workers, chunk_size):
+    """
+    Parse an input file, spreading chunks over a process pool
+    Returns:
+        (records, errors)
+    """
+    with open(filename, 'r', newline='', encoding='utf-8') as file:
+        header = None
+        if file_format == "csv":
+            header = next(csv.reader([file.readline()]), None)
+            missing = [field for field in FIELDS[1:5] if field not in (header or ())]
+            if missing:
+                raise ValueError(f"CSV header is missing column(s): {', '.join(missing)}")
+
+        chunks = read_chunks(file, file_format, chunk_size)
+        if workers <= 1:
+            results = [parse_chunk(file_format, header, first_row, lines) for first_row, lines in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(parse_chunk, file_format, header, first_row, lines)
+                           for first_row, lines in chunks]
+                results = [future.result() for future in futures]
+
+    records = []
+    errors = []
+    for chunk_records, chunk_errors in results:
+        records.extend(chunk_records)
+        errors.extend(chunk_errors)
+    return records, errors
+
+def import_tasks(handler, filename, file_format, workers, chunk_size):
+    """
+    Import a CSV or JSON Lines file into a storage backend with one save
+    Returns:
+        (imported, errors)
+    """
+    records, errors = parse_file(filename, file_format, workers, chunk_size)
+
+    # Nothing is queried during an import, so a plain dictionary is enough
+    tasks = handler.load_tasks()
+    if handler.load_error is not None:
+        # Saving would write the imported rows over the unreadable store
+        raise RuntimeError(f"Could not read {handler.filename} ({handler.load_error}); nothing imported")
+    # Rows without an ID become new tasks; rows with one replace it
+    new_id = id_allocator(handler, set(tasks) | {record["task_id"] for record in records
+                                                 if record["task_id"] is not None})
+
+    imported_ids = []
+    for record in records:
+        if record["task_id"] is None:
+            record["task_id"] = new_id()
+        tasks[record["task_id"]] = handler.dict_to_task(record)
+        imported_ids.append(record["task_id"])
+
+    if imported_ids and not handler.save_changes(tasks, imported_ids):
+        raise RuntimeError("Could not save imported tasks")
+    return len(imported_ids), errors
+
+def export_tasks(handler, filename, file_format):
+    """
+    Export every stored task to a CSV or JSON Lines file
+    Returns:
+        Number of tasks written
+    """
+    tasks = handler.load_tasks()
+    with open(filename, 'w', newline='', encoding='utf-8') as file:
+        if file_format == "csv":
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            for task in tasks.values():
+                writer.writerow(handler.task_to_dict(task))
+        else:
+            for task in tasks.values():
+                file.write(json.dumps(handler.task_to_dict(task), ensure_ascii=False) + "\n")
+    return len(tasks)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="Bulk import and export of tasks")
+    parser.add_argument("--storage", choices=sorted(STORAGE_BACKENDS), default="json",
+                        help="storage backend (default: json)")
+    parser.add_argument("--data", help="task store file (default: the backend's default)")
+    parser.add_argument("--stats", help="record operation timings and write them to this .json or .prom file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="import tasks from CSV or JSON Lines")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--format", choices=FORMATS)
+    import_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                               help="parser processes (default: CPU count)")
+    import_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                               help="records per parsing chunk")
+
+    export_parser = commands.add_parser("export", help="export tasks to CSV or JSON Lines")
+    export_parser.add_argument("file")
+    export_parser.add_argument("--format", choices=FORMATS)
+
+    archive_help = "archive file (default: next to the store, e.g. tasks_archive.jsonl.gz)"
+    archive_parser = commands.add_parser("archive", help="move complete tasks due before a date to the archive")
+    archive_parser.add_argument("--before", required=True, help="YYYY-MM-DD cutoff")
+    archive_parser.add_argument("--archive", help=archive_help)
+
+    restore_parser = commands.add_parser("restore", help="move archived tasks back into the store")
+    restore_parser.add_argument("task_ids", nargs="+", type=int)
+    restore_parser.add_argument("--archive", help=archive_help)
+
+    search_parser = commands.add_parser("search-archive", help="search archived tasks without restoring them")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--limit", type=int)
+    search_parser.add_argument("--archive", help=archive_help)
+    return parser
+
+def run_archive_command(args, handler):
+    """
+    Run the archive, restore and search-archive commands
+    Returns:
+        Number of tasks moved or found
+    """
+    archive = TaskArchive(args.archive) if args.archive else TaskArchive.for_store(handler)
+    if args.command == "search-archive":
+        tasks = archive.search(args.query, args.limit)
+        for task in tasks:
+            print(task)
+        return len(tasks)
+
+    task_manager = TaskManager()
+    task_manager.tasks = handler.load_tasks()
+    if args.command == "archive":
+        return len(archive.archive_completed(task_manager, handler, args.before))
+    return len(archive.restore(task_manager, handler, args.task_ids))
+
+def main(argv=None):
+    """Entry point for non-interactive bulk operations"""
+    args = build_parser().parse_args(argv)
+    try:
+        handler = open_storage(args.storage, args.data)
+        # Backends are imported on demand: enable once the handler class
+        # is loaded, so its methods are wrapped too
+        if args.stats:
+            instrumentation.enable()
+        started = time.perf_counter()
+
+        errors = []
+        if args.command in ARCHIVE_VERBS:
+            count = run_archive_command(args, handler)
+            verb = ARCHIVE_VERBS[args.command]
+        elif args.command == "import":
+            file_format = detect_format(args.file, args.format)
+            count, errors = import_tasks(handler, args.file, file_format, args.workers, args.chunk_size)
+            for row, field, message in errors[:10]:
+                print(f"✗ Row {row}{f' ({field})' if field else ''}: {message}")
+            if len(errors) > 10:
+                print(f"✗ ... and {len(errors) - 10} more problem(s)")
+            verb = "Imported"
+        else:
+            count = export_tasks(handler, args.file, detect_format(args.file, args.format))
+            verb = "Exported"
+
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed > 0 else float("inf")
+        print(f"✓ {verb} {count} task(s) in {elapsed:.2f}s ({rate:,.0f} rows/s).")
+        if args.stats:
+            instrumentation.stats.observe(f"bulk_cli.{args.command}", elapsed)
+            instrumentation.dump(args.stats)
+        return 1 if errors else 0
+
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"✗ Error: {e}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
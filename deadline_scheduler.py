@@ -0,0 +1,163 @@
+import heapq
+from collections import Counter
+from datetime import date
+
+# Event kinds, in the order they fire for one task
+DUE_SOON = "due_soon"
+OVERDUE = "overdue"
+
+class DeadlineScheduler:
+    """Min-heap of upcoming deadline events for tasks not yet complete"""
+
+    def __init__(self, warn_days=1, today=None):
+        """
+        Args:
+            warn_days: Days before the due date to fire a due_soon event
+            today: Callable returning today's date ordinal, for tests
+        """
+        self.warn_days = warn_days
+        self.today = today if today is not None else lambda: date.today().toordinal()
+        self.callbacks = []
+        self.clear()
+
+    def clear(self):
+        """Drop every scheduled event"""
+        # (fire ordinal, task_id, kind, due ordinal, generation)
+        self.heap = []
+        # task_id -> (due ordinal, generation) of tasks with events still to
+        # fire. Every scheduling gets a new generation, so an entry left
+        # from an earlier one is stale and skipped when popped, even when
+        # the task was rescheduled for the same due date.
+        self.scheduled = {}
+        self.generation = 0
+        # IDs of tasks whose overdue event has fired
+        self.overdue = set()
+        self.tasks = {}
+
+    def subscribe(self, callback):
+        """Call callback(kind, task) for every event tick fires"""
+        self.callbacks.append(callback)
+
+    def _schedule(self, task):
+        self.generation += 1
+        self.scheduled[task.task_id] = (task.due_ordinal, self.generation)
+        self.tasks[task.task_id] = task
+        return self.generation
+
+    def _live(self, task_id, generation):
+        entry = self.scheduled.get(task_id)
+        return entry is not None and entry[1] == generation
+
+    def add(self, task):
+        """Schedule the events of a task with a due date that is not complete"""
+        due = task.due_ordinal
+        if not due or task.status == "Complete":
+            return
+        generation = self._schedule(task)
+        heap = self.heap
+        heapq.heappush(heap, (due - self.warn_days, task.task_id, DUE_SOON, due, generation))
+        heapq.heappush(heap, (due + 1, task.task_id, OVERDUE, due, generation))
+
+    def remove(self, task, value=None):
+        """Cancel a task's events; their heap entries go stale"""
+        self.scheduled.pop(task.task_id, None)
+        self.tasks.pop(task.task_id, None)
+        self.overdue.discard(task.task_id)
+        # Stale entries are dropped in bulk once they outnumber live ones
+        if len(self.heap) > 4 * len(self.scheduled) + 64:
+            self._compact()
+
+    def update(self, task, field, old_value):
+        """Reschedule a task after its due date or status changed"""
+        if field in ("due_date", "status"):
+            self.remove(task)
+            self.add(task)
+
+    def rebuild(self, tasks):
+        """Schedule every task in a collection with a single heapify"""
+        self.clear()
+        for task in tasks:
+            if task.due_ordinal and task.status != "Complete":
+                self._schedule(task)
+        self._compact()
+
+    def _compact(self):
+        """Rebuild the heap from the live schedule only"""
+        warn_days = self.warn_days
+        self.heap = []
+        for task_id, (due, generation) in self.scheduled.items():
+            self.heap.append((due - warn_days, task_id, DUE_SOON, due, generation))
+            self.heap.append((due + 1, task_id, OVERDUE, due, generation))
+        heapq.heapify(self.heap)
+
+    def next_event(self):
+        """
+        Get the next live event without firing it
+        Returns:
+            (fire ordinal, kind, task), or None when nothing is scheduled
+        """
+        heap = self.heap
+        while heap:
+            fire_at, task_id, kind, due, generation = heap[0]
+            if self._live(task_id, generation):
+                return fire_at, kind, self.tasks[task_id]
+            heapq.heappop(heap)
+        return None
+
+    def tick(self, today=None):
+        """
+        Fire every event whose day has come, at O(log n) per event
+        Args:
+            today: Date ordinal to fire up to, defaults to today
+        Returns:
+            List of (kind, task) fired, in order
+        """
+        today = self.today() if today is None else today
+        heap = self.heap
+        fired = []
+        while heap and heap[0][0] <= today:
+            _, task_id, kind, due, generation = heapq.heappop(heap)
+            if not self._live(task_id, generation):
+                continue
+            task = self.tasks[task_id]
+            if kind == OVERDUE:
+                # Nothing more to fire until the task is rescheduled
+                del self.scheduled[task_id]
+                del self.tasks[task_id]
+                self.overdue.add(task_id)
+            elif due + 1 <= today:
+                # Already past due as well: only report it as overdue
+                continue
+            fired.append((kind, task))
+            for callback in self.callbacks:
+                callback(kind, task)
+        return fired
+
+    def check(self, tasks):
+        """
+        Compare the schedule against the tasks it was built from
+        Args:
+            tasks: Dictionary of tasks {task_id: Task object}
+        Returns:
+            List of problem descriptions, empty when consistent
+        """
+        problems = []
+        expected = {task_id for task_id, task in tasks.items()
+                    if task.due_ordinal and task.status != "Complete"}
+        if set(self.scheduled) & self.overdue:
+            problems.append("scheduler has tasks both scheduled and overdue")
+        if set(self.scheduled) | self.overdue != expected:
+            problems.append(f"scheduler tracks {len(self.scheduled) + len(self.overdue)} of {len(expected)} tasks")
+        for task_id, (due, _) in self.scheduled.items():
+            task = tasks.get(task_id)
+            if task is None or self.tasks.get(task_id) is not task or task.due_ordinal != due:
+                problems.append(f"scheduler has task {task_id} under a stale due date")
+        # A due_soon event may have fired already; the overdue one never
+        # has. Either firing twice means a stale entry passed as live.
+        live = Counter((task_id, kind) for _, task_id, kind, _, generation in self.heap
+                       if self._live(task_id, generation))
+        if {task_id for task_id, kind in live if kind == OVERDUE} != set(self.scheduled):
+            problems.append("scheduler heap is missing overdue events")
+        if any(count > 1 for count in live.values()):
+            problems.append("scheduler heap holds an event twice")
+        return problems
@@ -1,11 +1,108 @@
 import json
+import os
+import instrumentation
 from task import Task
+from validator import Validator
+
+# How many records to read between progress callbacks
+PROGRESS_EVERY = 10000
+READ_CHUNK_SIZE = 65536
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+def iter_json_array(file, chunk_size=READ_CHUNK_SIZE):
+    """
+    Incrementally parse a top-level JSON array from a text file
+    Args:
+        file: Open text file
+        chunk_size: Number of characters to read at a time
+    Yields:
+        (element, chars_consumed) for each element of the array
+    Raises:
+        json.JSONDecodeError if the content is not a well-formed array
+    """
+    buffer = ""
+    pos = 0
+    consumed = 0
+    eof = False
+    
+    def fill():
+        # Drop what was already parsed and append the next chunk
+        nonlocal buffer, pos, consumed, eof
+        chunk = file.read(chunk_size)
+        if not chunk:
+            eof = True
+        consumed += pos
+        buffer = buffer[pos:] + chunk
+        pos = 0
+    
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or eof:
+                return
+            fill()
+    
+    skip_whitespace()
+    if pos >= len(buffer) or buffer[pos] != "[":
+        raise json.JSONDecodeError("Expecting '['", buffer, pos)
+    pos += 1
+    
+    skip_whitespace()
+    if pos < len(buffer) and buffer[pos] == "]":
+        return
+    
+    while True:
+        skip_whitespace()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            # A number cut off at the end of the buffer still decodes
+            if end == len(buffer) and not eof:
+                fill()
+                continue
+            break
+        pos = end
+        yield value, consumed + pos
+        
+        skip_whitespace()
+        if pos >= len(buffer):
+            raise json.JSONDecodeError("Unterminated array", buffer, pos)
+        if buffer[pos] == "]":
+            return
+        if buffer[pos] != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+        pos += 1
+        if pos > chunk_size:
+            fill()
+
+class ConflictError(Exception):
+    """Raised when tasks were changed by another process since they were read"""
+    
+    def __init__(self, task_ids):
+        self.task_ids = list(task_ids)
+        super().__init__(f"Task(s) {', '.join(map(str, self.task_ids))} changed by another process")
 
 class FileHandler:
     """Handles saving and loading tasks from JSON file"""
     
     def __init__(self, filename="tasks.json"):
         self.filename = filename
+        # Write to a temporary file and rename it over the original
+        self.atomic = False
+        # (row, field, message) reports from the last validated load
+        self.validation_errors = []
+        # Why the last load fell back to no tasks, or None if it did not;
+        # a missing store is not an error
+        self.load_error = None
     
     def save_tasks(self, tasks_dict):
         """
@@ -14,32 +111,79 @@ class FileHandler:
             tasks_dict: Dictionary of tasks {task_id: Task object}
         """
         try:
-            # Convert tasks to list of dictionaries
-            tasks_list = [self.task_to_dict(task) for task in tasks_dict.values()]
-            
-            with open(self.filename, 'w') as file:
-                json.dump(tasks_list, file, indent=4)
+            if self.atomic:
+                self._write_atomic(tasks_dict)
+            else:
+                with open(self.filename, 'w') as file:
+                    self._dump(tasks_dict, file)
             
+            if instrumentation.enabled:
+                instrumentation.count_bytes("bytes_written", os.path.getsize(self.filename))
             return True
         except Exception as e:
             print(f"Error saving tasks: {e}")
             return False
     
-    def load_tasks(self):
+    def _dump(self, tasks_dict, file):
+        """Write tasks as a JSON array to an open file"""
+        tasks_list = [self.task_to_dict(task) for task in tasks_dict.values()]
+        if not instrumentation.enabled:
+            # Straight into the file, without a second copy in memory
+            json.dump(tasks_list, file, indent=4)
+            return
+        # Build the text first, so serializing is timed apart from writing
+        with instrumentation.timed("FileHandler.save_tasks.serialize"):
+            data = json.dumps(tasks_list, indent=4)
+        with instrumentation.timed("FileHandler.save_tasks.write"):
+            file.write(data)
+    
+    def _write_atomic(self, tasks_dict):
+        """Write the file so readers only ever see the old or new version"""
+        temp_filename = self.filename + ".tmp"
+        with open(temp_filename, 'w') as file:
+            self._dump(tasks_dict, file)
+            with instrumentation.timed("FileHandler.save_tasks.fsync"):
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_filename, self.filename)
+    
+    def save_changes(self, tasks_dict, task_ids):
+        """
+        Persist changes to specific tasks
+        Args:
+            tasks_dict: Dictionary of tasks {task_id: Task object}
+            task_ids: IDs of tasks that were added, edited or deleted
+        Returns:
+            True on success, False otherwise
+        """
+        # The plain JSON file can only be rewritten as a whole
+        return self.save_tasks(tasks_dict)
+    
+    def load_tasks(self, progress=None, validate=False):
         """
         Load tasks from JSON file
+        Args:
+            progress: Optional callable(tasks_loaded, chars_read) called
+                periodically while loading
+            validate: Check every record and collect problems in
+                validation_errors; records missing fields are skipped
         Returns:
             Dictionary of tasks {task_id: Task object}
         """
+        self.validation_errors = []
+        self.load_error = None
         try:
             with open(self.filename, 'r') as file:
-                tasks_list = json.load(file)
+                # Build Task objects record by record instead of holding
+                # the whole list of dictionaries in memory first
+                tasks_dict = {}
+                for task in self.iter_tasks(file, progress=progress, validate=validate):
+                    tasks_dict[task.task_id] = task
             
-            # Convert list of dictionaries to dictionary of Task objects
-            tasks_dict = {}
-            for task_data in tasks_list:
-                task = self.dict_to_task(task_data)
-                tasks_dict[task.task_id] = task
+            if self.validation_errors:
+                print(f"⚠ {len(self.validation_errors)} problem(s) found in {self.filename}.")
+            if instrumentation.enabled:
+                instrumentation.count_bytes("bytes_read", os.path.getsize(self.filename))
             
             return tasks_dict
         
@@ -47,14 +191,46 @@ class FileHandler:
             print(f"File {self.filename} not found. Starting with empty task list.")
             return {}
         
-        except json.JSONDecodeError:
+        except json.JSONDecodeError as e:
             print(f"Error reading {self.filename}. File may be corrupted. Starting fresh.")
+            self.load_error = str(e)
             return {}
         
         except Exception as e:
             print(f"Unexpected error loading tasks: {e}")
+            self.load_error = str(e)
             return {}
     
+    def iter_tasks(self, file, progress=None, validate=False):
+        """
+        Stream Task objects out of a file holding a JSON array of tasks
+        Args:
+            file: Open text file positioned at the start of the array
+            progress: Optional callable(tasks_loaded, chars_read)
+            validate: Record problems in validation_errors and skip
+                records that cannot be turned into a Task
+        Raises:
+            json.JSONDecodeError if the file is not a JSON array
+        """
+        count = 0
+        chars_read = 0
+        for row, (task_data, chars_read) in enumerate(iter_json_array(file)):
+            if validate:
+                self.validation_errors.extend(Validator.validate_record(task_data, row))
+                try:
+                    task = self.dict_to_task(task_data)
+                except (KeyError, TypeError):
+                    continue
+            else:
+                task = self.dict_to_task(task_data)
+            yield task
+            count += 1
+            if progress is not None and count % PROGRESS_EVERY == 0:
+                progress(count, chars_read)
+        
+        if progress is not None:
+            progress(count, chars_read)
+    
     def task_to_dict(self, task):
         """
         Convert Task object to dictionary
@@ -0,0 +1,223 @@
+import json
+import os
+from file_handler import FileHandler, iter_json_array
+from journal_handler import JournalFileHandler
+
+FIELDS = ("title", "description", "priority", "due_date", "status")
+
+def task_values(task):
+    """Get the stored fields of a task as a tuple, for cheap comparison"""
+    return (task.title, task.description, task.priority, task.due_date, task.status)
+
+class TaskDiff:
+    """Record-level differences between a store and the tasks in memory"""
+
+    def __init__(self):
+        self.added = []
+        self.changed = []
+        self.removed = []
+
+    def __len__(self):
+        return len(self.added) + len(self.changed) + len(self.removed)
+
+    def __str__(self):
+        return f"{len(self.added)} added, {len(self.changed)} changed, {len(self.removed)} removed"
+
+class FileWatcher:
+    """Polls a task store and applies changes made by other programs"""
+
+    def __init__(self, file_handler, task_manager):
+        """
+        Args:
+            file_handler: FileHandler of the watched store
+            task_manager: TaskManager holding the tasks loaded from it
+        """
+        self.file_handler = file_handler
+        self.task_manager = task_manager
+        # Sharded stores change their manifest on every save
+        self.watched_filename = getattr(file_handler, "manifest_filename", file_handler.filename)
+        self.log_filename = getattr(file_handler, "log_filename", None)
+        # Whether the store was as last applied when our current save began
+        self._clean_before_save = False
+        self.acknowledge()
+
+    def _stat(self, filename):
+        try:
+            stat = os.stat(filename)
+        except (FileNotFoundError, TypeError):
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _signature(self):
+        data_version = getattr(self.file_handler, "data_version", None)
+        if data_version is not None:
+            # Moves only when another connection commits, unlike the
+            # file's stat, so our own saves never look like edits
+            return (data_version(), None)
+        return (self._stat(self.watched_filename), self._stat(self.log_filename))
+
+    def changed(self):
+        """Check, with one or two stat calls, whether the store changed"""
+        return self._signature() != self.signature
+
+    def acknowledge(self):
+        """Treat the store as it is now as already applied, e.g. after our own save"""
+        self.signature = self._signature()
+        log = self.signature[1]
+        self._log_offset = log[2] if log else 0
+
+    def saving(self):
+        """Note, right before a save of our own, whether anyone else wrote"""
+        self._clean_before_save = not self.changed()
+
+    def saved(self):
+        """Note a save of our own so it is not diffed back in"""
+        handler = self.file_handler
+        # Shared stores and SQLite already leave out our own writes
+        if hasattr(handler, "read_changes") or hasattr(handler, "data_version"):
+            return
+        # A whole-file rewrite holds nothing but our tasks. Other formats
+        # keep records we did not write, so skipping the reload is only
+        # safe when nobody else wrote since the last poll
+        if type(handler) is FileHandler or self._clean_before_save:
+            self.acknowledge()
+        self._clean_before_save = False
+
+    def poll(self):
+        """
+        Apply any external changes to the task manager
+        Returns:
+            TaskDiff of what was applied, or None when nothing changed
+        """
+        if not self.changed():
+            return None
+        previous = self.signature
+        diff = self.diff(previous)
+        if diff is None:
+            return None
+        self.apply(diff)
+        return diff
+
+    def diff(self, previous=None):
+        """
+        Compare the store with the tasks in memory
+        Returns:
+            TaskDiff, or None if the store cannot be read right now
+        """
+        previous = self.signature if previous is None else previous
+        read_changes = getattr(self.file_handler, "read_changes", None)
+        if read_changes is not None:
+            # Shared stores track versions and read only other writers' records
+            updated, deleted = read_changes()
+            self.acknowledge()
+            return self._diff_records(((task.task_id, task) for task in updated), deleted)
+
+        current = self._signature()
+        if (isinstance(self.file_handler, JournalFileHandler) and current[0] == previous[0]
+                and current[1] is not None and current[1][2] >= self._log_offset):
+            return self._diff_log_tail()
+        if type(self.file_handler) is FileHandler:
+            return self._diff_json()
+        return self._diff_loaded()
+
+    def _diff_records(self, records, deleted=()):
+        """Build a diff from (task_id, Task) pairs that may have changed"""
+        diff = TaskDiff()
+        tasks = self.task_manager.tasks
+        for task_id, task in records:
+            existing = tasks.get(task_id)
+            if existing is None:
+                diff.added.append(task)
+            elif task_values(existing) != task_values(task):
+                diff.changed.append(task)
+        diff.removed.extend(task_id for task_id in deleted if task_id in tasks)
+        return diff
+
+    def _diff_log_tail(self):
+        """Read only the journal records appended since the last poll"""
+        with open(self.log_filename, 'rb') as file:
+            file.seek(self._log_offset)
+            data = file.read()
+
+        latest = {}
+        deleted = set()
+        offset = self._log_offset
+        for line in data.splitlines(keepends=True):
+            # A record still being appended is read on the next poll
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            offset += len(line)
+            if record["op"] == "put":
+                task = self.file_handler.dict_to_task(record["task"])
+                latest[task.task_id] = task
+                deleted.discard(task.task_id)
+            elif record["op"] == "del":
+                latest.pop(record["task_id"], None)
+                deleted.add(record["task_id"])
+
+        self.signature = self._signature()
+        self._log_offset = offset
+        return self._diff_records(latest.items(), deleted)
+
+    def _diff_json(self):
+        """Stream tasks.json and rebuild only the records that differ"""
+        diff = TaskDiff()
+        tasks = self.task_manager.tasks
+        seen = set()
+        signature = self._signature()
+        try:
+            with open(self.file_handler.filename, 'r') as file:
+                for record, _ in iter_json_array(file):
+                    try:
+                        task_id = record["task_id"]
+                        values = tuple(record[field] for field in FIELDS)
+                    except (KeyError, TypeError):
+                        continue
+                    seen.add(task_id)
+                    existing = tasks.get(task_id)
+                    if existing is None:
+                        diff.added.append(self.file_handler.dict_to_task(record))
+                    elif task_values(existing) != values:
+                        diff.changed.append(self.file_handler.dict_to_task(record))
+        except (OSError, json.JSONDecodeError):
+            # Missing or half-written; look again on the next poll
+            return None
+
+        diff.removed.extend(task_id for task_id in tasks if task_id not in seen)
+        self.signature = signature
+        return diff
+
+    def _diff_loaded(self):
+        """Fallback for formats without a cheaper way: load and compare"""
+        signature = self._signature()
+        # A separate handler: loading resets the bookkeeping the live one
+        # keeps for its next save, e.g. the shards a failed save must retry
+        reader = type(self.file_handler)(self.file_handler.filename)
+        try:
+            loaded = reader.load_tasks()
+        finally:
+            close = getattr(reader, "close", None)
+            if close is not None:
+                close()
+        tasks = self.task_manager.tasks
+        if reader.load_error is not None or (not loaded and tasks):
+            # A corrupted store, or one that is missing, is more likely
+            # half-written than emptied; look again next poll
+            return None
+        diff = self._diff_records(loaded.items(), [task_id for task_id in tasks if task_id not in loaded])
+        self.signature = signature
+        self._log_offset = signature[1][2] if signature[1] else 0
+        return diff
+
+    def apply(self, diff):
+        """Apply a diff through the task manager so every index follows"""
+        for task in diff.added:
+            self.task_manager.add_task(task)
+        for task in diff.changed:
+            self.task_manager.add_task(task)
+        for task_id in diff.removed:
+            self.task_manager.delete_task(task_id)
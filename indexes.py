@@ -0,0 +1,165 @@
+from bisect import bisect_left, bisect_right, insort
+from operator import attrgetter
+
+class HashIndex:
+    """Maps each value of one task field to the tasks holding it"""
+    
+    def __init__(self, field):
+        self.field = field
+        self.buckets = {}
+    
+    def add(self, task):
+        """Index a task under its current field value"""
+        value = getattr(task, self.field)
+        self.buckets.setdefault(value, {})[task.task_id] = task
+    
+    def remove(self, task, value=None):
+        """Remove a task, optionally from the bucket of an older value"""
+        if value is None:
+            value = getattr(task, self.field)
+        bucket = self.buckets.get(value)
+        if bucket is not None:
+            bucket.pop(task.task_id, None)
+            if not bucket:
+                del self.buckets[value]
+    
+    def update(self, task, field, old_value):
+        """Move a task after one of its fields changed"""
+        if field == self.field:
+            self.remove(task, old_value)
+            self.add(task)
+    
+    def clear(self):
+        """Drop every entry"""
+        self.buckets = {}
+    
+    def rebuild(self, tasks):
+        """Index every task in a collection from scratch"""
+        self.clear()
+        for task in tasks:
+            self.add(task)
+    
+    def lookup(self, value):
+        """Get the tasks whose field equals value"""
+        return list(self.buckets.get(value, {}).values())
+    
+    def count(self, value):
+        """Count the tasks whose field equals value"""
+        return len(self.buckets.get(value, ()))
+    
+    def check(self, tasks):
+        """
+        Compare the index against the tasks it was built from
+        Args:
+            tasks: Dictionary of tasks {task_id: Task object}
+        Returns:
+            List of problem descriptions, empty when consistent
+        """
+        problems = []
+        indexed = 0
+        for value, bucket in self.buckets.items():
+            for task_id, task in bucket.items():
+                indexed += 1
+                if tasks.get(task_id) is not task:
+                    problems.append(f"{self.field} index holds unknown task {task_id}")
+                elif getattr(task, self.field) != value:
+                    problems.append(f"{self.field} index has task {task_id} under {value!r}")
+        if indexed != len(tasks):
+            problems.append(f"{self.field} index holds {indexed} of {len(tasks)} tasks")
+        return problems
+
+
+class SortedIndex:
+    """Keeps tasks ordered by a key, ties broken by task ID"""
+    
+    def __init__(self, field, key=None):
+        self.field = field
+        self.key = key if key is not None else attrgetter(field)
+        self.entries = []
+        # task_id -> (key the task is filed under, task)
+        self.by_id = {}
+    
+    def add(self, task):
+        """Insert a task at its position in the order"""
+        key = self.key(task)
+        insort(self.entries, (key, task.task_id))
+        self.by_id[task.task_id] = (key, task)
+    
+    def remove(self, task, value=None):
+        """Remove a task from the position it was filed under"""
+        filed = self.by_id.pop(task.task_id, None)
+        if filed is None:
+            return
+        entry = (filed[0], task.task_id)
+        position = bisect_left(self.entries, entry)
+        if position < len(self.entries) and self.entries[position] == entry:
+            del self.entries[position]
+    
+    def update(self, task, field, old_value):
+        """Reposition a task after one of its fields changed"""
+        if field == self.field:
+            self.remove(task)
+            self.add(task)
+    
+    def clear(self):
+        """Drop every entry"""
+        self.entries = []
+        self.by_id = {}
+    
+    def rebuild(self, tasks):
+        """Index every task in a collection with a single sort"""
+        key = self.key
+        self.by_id = {task.task_id: (key(task), task) for task in tasks}
+        self.entries = sorted((filed[0], task_id) for task_id, filed in self.by_id.items())
+    
+    def _bounds(self, start, end):
+        # (key,) sorts before every (key, task_id) entry
+        low = 0 if start is None else bisect_left(self.entries, (start,))
+        high = len(self.entries)
+        if end is not None:
+            high = bisect_right(self.entries, (end, float("inf")))
+        return low, max(low, high)
+    
+    def iter_range(self, start=None, end=None, reverse=False):
+        """
+        Iterate tasks in order whose key lies in [start, end]
+        Args:
+            start: Lowest key to include, or None for no lower bound
+            end: Highest key to include, or None for no upper bound
+            reverse: Iterate from the highest key down
+        """
+        low, high = self._bounds(start, end)
+        positions = range(high - 1, low - 1, -1) if reverse else range(low, high)
+        for position in positions:
+            yield self.by_id[self.entries[position][1]][1]
+    
+    def slice(self, offset, limit):
+        """Get up to limit tasks starting at a position in the order"""
+        by_id = self.by_id
+        return [by_id[task_id][1] for _, task_id in self.entries[offset:offset + limit]]
+    
+    def count_range(self, start=None, end=None):
+        """Count the tasks whose key lies in [start, end]"""
+        low, high = self._bounds(start, end)
+        return high - low
+    
+    def check(self, tasks):
+        """
+        Compare the index against the tasks it was built from
+        Args:
+            tasks: Dictionary of tasks {task_id: Task object}
+        Returns:
+            List of problem descriptions, empty when consistent
+        """
+        problems = []
+        if self.entries != sorted(self.entries):
+            problems.append(f"{self.field} index is out of order")
+        for key, task_id in self.entries:
+            task = tasks.get(task_id)
+            if task is None or self.by_id.get(task_id, (None, None))[1] is not task:
+                problems.append(f"{self.field} index holds unknown task {task_id}")
+            elif self.key(task) != key:
+                problems.append(f"{self.field} index has task {task_id} under {key!r}")
+        if len(self.entries) != len(tasks):
+            problems.append(f"{self.field} index holds {len(self.entries)} of {len(tasks)} tasks")
+        return problems
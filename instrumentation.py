@@ -0,0 +1,192 @@
+"""
+Opt-in timing and counters for TaskManager and FileHandler operations.
+
+Nothing is measured until enable() is called: method timing is added by
+wrapping the class methods at that point, so disabled code runs exactly as
+written. I/O phases (serialize, fsync) and byte counts are reported from
+inside the handlers behind a check of the module-level enabled flag.
+"""
+import functools
+import json
+import time
+from contextlib import nullcontext
+
+# Upper bounds in seconds, Prometheus style; the last bucket is +Inf
+BUCKETS = (0.00001, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# Per-record conversions would only add noise to the histograms
+UNTIMED_METHODS = {"task_to_dict", "dict_to_task", "task_to_row", "apply_record"}
+
+enabled = False
+_NOT_TIMED = nullcontext()
+_wrapped = []
+
+class Histogram:
+    """Latency histogram with fixed bucket bounds"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, seconds):
+        """Record one latency"""
+        position = 0
+        while position < len(BUCKETS) and seconds > BUCKETS[position]:
+            position += 1
+        self.counts[position] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "max": self.maximum,
+            "mean": self.total / self.count if self.count else 0.0,
+            "buckets": {("+Inf" if position == len(BUCKETS) else str(BUCKETS[position])): count
+                        for position, count in enumerate(self.counts)},
+        }
+
+class Stats:
+    """Collected histograms and counters"""
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+    def increment(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def reset(self):
+        self.histograms = {}
+        self.counters = {}
+
+    def snapshot(self):
+        """
+        Get every statistic as plain data
+        Returns:
+            {"operations": {name: histogram dict}, "counters": {name: value}}
+        """
+        return {
+            "operations": {name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def to_prometheus(self):
+        """Render the statistics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP taskmanager_operation_seconds Latency of task manager operations.",
+            "# TYPE taskmanager_operation_seconds histogram",
+        ]
+        for name, histogram in sorted(self.histograms.items()):
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = 0
+            for position, count in enumerate(histogram.counts):
+                cumulative += count
+                bound = "+Inf" if position == len(BUCKETS) else repr(BUCKETS[position])
+                lines.append(f'taskmanager_operation_seconds_bucket{{operation="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'taskmanager_operation_seconds_sum{{operation="{label}"}} {histogram.total!r}')
+            lines.append(f'taskmanager_operation_seconds_count{{operation="{label}"}} {histogram.count}')
+        for name, value in sorted(self.counters.items()):
+            metric = "taskmanager_" + name.replace(".", "_") + "_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+stats = Stats()
+
+def timed(name):
+    """Context manager timing one phase of an operation when enabled"""
+    if not enabled:
+        return _NOT_TIMED
+    return _Timer(name)
+
+class _Timer:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        stats.observe(self.name, time.perf_counter() - self.started)
+        return False
+
+def count_bytes(name, amount):
+    """Add to a byte counter (bytes_read or bytes_written) when enabled"""
+    if enabled:
+        stats.increment(name, amount)
+
+def _wrap(qualified_name, function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats.observe(qualified_name, time.perf_counter() - started)
+    return wrapper
+
+def _classes_to_wrap():
+    from file_handler import FileHandler
+    from task_manager import TaskManager
+    classes = [TaskManager]
+    pending = [FileHandler]
+    while pending:
+        cls = pending.pop()
+        classes.append(cls)
+        pending.extend(cls.__subclasses__())
+    return classes
+
+def enable():
+    """Start timing every public TaskManager and FileHandler method"""
+    global enabled
+    if enabled:
+        return
+    # Only needed here, and slow to import for every start
+    import inspect
+    for cls in _classes_to_wrap():
+        for name, attribute in list(vars(cls).items()):
+            # Only plain methods; timing a generator would only time its creation
+            if (name.startswith("_") or name in UNTIMED_METHODS or not inspect.isfunction(attribute)
+                    or inspect.isgeneratorfunction(attribute)):
+                continue
+            _wrapped.append((cls, name, attribute))
+            setattr(cls, name, _wrap(f"{cls.__name__}.{name}", attribute))
+    enabled = True
+
+def disable():
+    """Remove the timing wrappers; collected statistics are kept"""
+    global enabled
+    while _wrapped:
+        cls, name, attribute = _wrapped.pop()
+        setattr(cls, name, attribute)
+    enabled = False
+
+def dump_json(filename):
+    """Write the statistics to a JSON file"""
+    with open(filename, 'w') as file:
+        json.dump(stats.snapshot(), file, indent=4)
+
+def dump_prometheus(filename):
+    """Write the statistics to a Prometheus text file (node exporter textfile format)"""
+    with open(filename, 'w') as file:
+        file.write(stats.to_prometheus())
+
+def dump(filename):
+    """Write the statistics, choosing the format from the extension (.prom or .json)"""
+    if filename.endswith(".prom") or filename.endswith(".txt"):
+        dump_prometheus(filename)
+    else:
+        dump_json(filename)
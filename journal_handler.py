@@ -0,0 +1,148 @@
+import json
+import os
+import instrumentation
+from file_handler import FileHandler
+
+class JournalFileHandler(FileHandler):
+    """Stores tasks as a JSON snapshot plus an append-only change log"""
+
+    def __init__(self, filename="tasks.json", compact_every=1000):
+        super().__init__(filename)
+        self.log_filename = filename + ".log"
+        self.compact_every = compact_every
+        self.log_records = 0
+
+    def save_tasks(self, tasks_dict):
+        """
+        Write a full snapshot and empty the change log
+        Args:
+            tasks_dict: Dictionary of tasks {task_id: Task object}
+        """
+        try:
+            self.replace_snapshot([self.task_to_dict(task) for task in tasks_dict.values()])
+            return True
+        except Exception as e:
+            print(f"Error saving tasks: {e}")
+            return False
+
+    def replace_snapshot(self, tasks_list):
+        """
+        Swap in a new snapshot of task dictionaries and empty the change log
+        Raises:
+            OSError if the snapshot cannot be written
+        """
+        # Write the new snapshot next to the old one and swap it in,
+        # so a crash never leaves a half-written tasks.json behind
+        temp_filename = self.filename + ".tmp"
+        with open(temp_filename, 'w') as file:
+            if instrumentation.enabled:
+                # Build the text first, so serializing is timed apart from writing
+                with instrumentation.timed("JournalFileHandler.save_tasks.serialize"):
+                    data = json.dumps(tasks_list)
+                with instrumentation.timed("JournalFileHandler.save_tasks.write"):
+                    file.write(data)
+            else:
+                json.dump(tasks_list, file)
+            with instrumentation.timed("JournalFileHandler.save_tasks.fsync"):
+                file.flush()
+                os.fsync(file.fileno())
+            instrumentation.count_bytes("bytes_written", file.tell())
+        os.replace(temp_filename, self.filename)
+
+        # Log records are idempotent, so replaying them over the new
+        # snapshot after a crash at this point is harmless
+        with open(self.log_filename, 'w'):
+            pass
+        self.log_records = 0
+
+    def save_changes(self, tasks_dict, task_ids):
+        """
+        Append one log record per changed task
+        Args:
+            tasks_dict: Dictionary of tasks {task_id: Task object}
+            task_ids: IDs of tasks that were added, edited or deleted
+        Returns:
+            True on success, False otherwise
+        """
+        try:
+            with instrumentation.timed("JournalFileHandler.save_changes.serialize"):
+                lines = []
+                for task_id in task_ids:
+                    task = tasks_dict.get(task_id)
+                    if task is None:
+                        record = {"op": "del", "task_id": task_id}
+                    else:
+                        record = {"op": "put", "task": self.task_to_dict(task)}
+                    lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+                data = "".join(lines).encode("utf-8")
+
+            with instrumentation.timed("JournalFileHandler.save_changes.fsync"):
+                with open(self.log_filename, 'ab') as file:
+                    file.write(data)
+                    file.flush()
+                    os.fsync(file.fileno())
+            instrumentation.count_bytes("bytes_written", len(data))
+            self.log_records += len(lines)
+        except Exception as e:
+            print(f"Error saving tasks: {e}")
+            return False
+
+        if self.log_records >= self.compact_every:
+            return self.save_tasks(tasks_dict)
+        return True
+
+    def load_tasks(self, progress=None, validate=False):
+        """
+        Load the snapshot and replay the change log on top of it
+        Args:
+            progress: Optional callable(tasks_loaded, chars_read) for the snapshot
+            validate: Validate snapshot records (see FileHandler.load_tasks)
+        Returns:
+            Dictionary of tasks {task_id: Task object}
+        """
+        tasks_dict = super().load_tasks(progress, validate)
+        self.log_records = 0
+
+        try:
+            with open(self.log_filename, 'rb') as file:
+                good_offset = 0
+                for line in file:
+                    # A torn record can only be the tail of an interrupted
+                    # append; everything before it is valid
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    self.apply_record(tasks_dict, record)
+                    self.log_records += 1
+                    good_offset += len(line)
+
+            instrumentation.count_bytes("bytes_read", good_offset)
+
+            # Drop the torn tail so new appends start on a clean line
+            if good_offset != os.path.getsize(self.log_filename):
+                with open(self.log_filename, 'r+b') as file:
+                    file.truncate(good_offset)
+
+        except FileNotFoundError:
+            pass
+
+        except Exception as e:
+            print(f"Unexpected error replaying {self.log_filename}: {e}")
+
+        return tasks_dict
+
+    def apply_record(self, tasks_dict, record):
+        """
+        Apply a single log record to a dictionary of tasks
+        Args:
+            tasks_dict: Dictionary of tasks {task_id: Task object}
+            record: Decoded log record
+        """
+        if record["op"] == "put":
+            task = self.dict_to_task(record["task"])
+            tasks_dict[task.task_id] = task
+        elif record["op"] == "del":
+            tasks_dict.pop(record["task_id"], None)
@@ -1,35 +1,203 @@
-from task import Task
-from task_manager import TaskManager
-from validator import Validator
-from file_handler import FileHandler
+import os
+import sys
+import threading
+
+# Rows shown per screen by the paged views
+PAGE_SIZE = 20
+
+SAVE_MODES = ("sync", "async")
+
+def parse_ids(text):
+    """
+    Parse task IDs such as "3", "1, 4, 9" or "10-14"
+    Returns:
+        List of task IDs in the order given
+    Raises:
+        ValueError if a part is not a number or range
+    """
+    task_ids = []
+    for part in text.replace(",", " ").split():
+        first, dash, last = part.partition("-")
+        if dash:
+            task_ids.extend(range(int(first), int(last) + 1))
+        else:
+            task_ids.append(int(part))
+    if not task_ids:
+        raise ValueError("No task IDs given")
+    return task_ids
 
 class TaskApp:
     """Main application class for Task Manager"""
     
-    def __init__(self):
-        self.task_manager = TaskManager()
-        self.file_handler = FileHandler("tasks.json")
+    def __init__(self, filename=None, storage="json", stats_file=None, save_mode="sync", watch=False,
+                 fast_start=False):
+        if save_mode not in SAVE_MODES:
+            raise ValueError(f"Unknown save mode {save_mode}")
+        self.filename = filename
+        self.storage = storage
+        self.stats_file = stats_file
+        self.save_mode = save_mode
+        self.watch = watch
         self.next_id = 1
-        self.load_tasks()
+        self.writer = None
+        self.watcher = None
+        
+        # Set once the store is open and its tasks are loaded
+        self.loaded = threading.Event()
+        self.load_error = None
+        if fast_start:
+            # Draw the menu at once; choices that need tasks wait for the load
+            threading.Thread(target=self.start_up_in_background, name="task-loader", daemon=True).start()
+        else:
+            self.start_up()
+    
+    def start_up(self):
+        """Open the store, load its tasks and start the writer and watcher"""
+        try:
+            # Imported here rather than at the top so a fast start draws the
+            # menu before paying for them
+            from storage import open_storage
+            from task_manager import TaskManager
+            
+            self.file_handler = open_storage(self.storage, self.filename)
+            
+            # Opt-in timing of every TaskManager/FileHandler call, written on
+            # exit; enabled once the backend class is imported so it is wrapped
+            if self.stats_file:
+                import instrumentation
+                instrumentation.enable()
+            
+            # Let filters run inside the backend when it can answer them
+            backend = self.file_handler if getattr(self.file_handler, "supports_pushdown", False) else None
+            self.task_manager = TaskManager(backend)
+            self.load_tasks()
+            
+            # In async mode saves happen on a writer thread so the menu never
+            # waits for the file to be rewritten
+            if self.save_mode == "async":
+                from background_writer import BackgroundWriter
+                self.writer = BackgroundWriter(self.file_handler, self.task_manager)
+            
+            # In watch mode edits made to the store by other programs are
+            # applied as they appear instead of after a restart
+            if self.watch:
+                from file_watcher import FileWatcher
+                self.watcher = FileWatcher(self.file_handler, self.task_manager)
+        finally:
+            self.loaded.set()
+    
+    def start_up_in_background(self):
+        """Run start_up on the loader thread, keeping any error for the menu"""
+        try:
+            self.start_up()
+        except Exception as e:
+            self.load_error = e
+    
+    def wait_until_loaded(self):
+        """Block until the tasks are loaded; raise the error of a failed load"""
+        self.loaded.wait()
+        if self.load_error is not None:
+            raise self.load_error
     
     def load_tasks(self):
         """Load tasks from file on startup"""
         tasks = self.file_handler.load_tasks()
         self.task_manager.tasks = tasks
         
-        # Set next_id to be one more than the highest existing ID
-        if tasks:
+        # Set next_id to be one more than the highest existing ID, using the
+        # value stored in the file header when the format keeps one
+        stored_next_id = getattr(self.file_handler, "next_id", None)
+        if stored_next_id is not None:
+            self.next_id = stored_next_id
+        elif tasks:
             self.next_id = max(tasks.keys()) + 1
         
         print(f"✓ Loaded {len(tasks)} task(s) from file.")
     
-    def save_tasks(self):
-        """Save tasks to file"""
-        if self.file_handler.save_tasks(self.task_manager.tasks):
+    def save_tasks(self, task_ids=None):
+        """Save tasks to file, or only the given changed tasks"""
+        from file_handler import ConflictError
+        
+        if self.writer is not None:
+            self.writer.mark_dirty(task_ids)
+            return
+        
+        version = self.task_manager.version
+        if self.watcher is not None:
+            self.watcher.saving()
+        try:
+            if task_ids is None:
+                saved = self.file_handler.save_tasks(self.task_manager.tasks)
+            else:
+                saved = self.file_handler.save_changes(self.task_manager.tasks, task_ids)
+        except ConflictError as e:
+            print(f"✗ {e}; your change was discarded.")
+            self.refresh_tasks()
+            # Nothing of the rejected save was written: save again the
+            # tasks that did not clash, so memory and store agree
+            if task_ids is None:
+                self.save_tasks()
+            else:
+                rest = [task_id for task_id in task_ids if task_id not in e.task_ids]
+                if rest:
+                    self.save_tasks(rest)
+            return
+        
+        if saved:
+            self.task_manager.mark_stored(version)
+            if self.watcher is not None:
+                self.watcher.saved()
             print("✓ Tasks saved successfully.")
         else:
             print("✗ Error saving tasks.")
     
+    def refresh_tasks(self):
+        """Pull in tasks other processes saved since the last check"""
+        if self.watcher is not None:
+            self.apply_external_changes()
+            return
+        
+        read_changes = getattr(self.file_handler, "read_changes", None)
+        if read_changes is None:
+            return
+        
+        updated, deleted = read_changes()
+        for task in updated:
+            self.task_manager.add_task(task)
+        for task_id in deleted:
+            if self.task_manager.get_task_by_id(task_id) is not None:
+                self.task_manager.delete_task(task_id)
+        
+        if updated or deleted:
+            print(f"↻ Reloaded {len(updated) + len(deleted)} task(s) changed by another process.")
+    
+    def apply_external_changes(self):
+        """Apply edits other programs made to the store"""
+        # Unsaved changes would look like external edits and be undone
+        if self.writer is not None and self.writer.pending():
+            return
+        
+        diff = self.watcher.poll()
+        if not diff:
+            return
+        
+        for task in diff.added:
+            self.next_id = max(self.next_id, task.task_id + 1)
+        print(f"↻ Applied external changes: {diff}.")
+    
+    def check_deadlines(self):
+        """Report tasks that became due soon or overdue since the last check"""
+        events = self.task_manager.deadline_scheduler.tick()
+        for kind, label in (("overdue", "now overdue"), ("due_soon", "due soon")):
+            tasks = [task for event, task in events if event == kind]
+            if not tasks:
+                continue
+            print(f"\n⚠ {len(tasks)} task(s) {label}:")
+            for task in tasks[:5]:
+                print(f"  {task}")
+            if len(tasks) > 5:
+                print(f"  ... and {len(tasks) - 5} more")
+    
     def display_menu(self):
         """Display main menu"""
         print("\n" + "="*50)
@@ -44,11 +212,16 @@ class TaskApp:
         print("7. Edit Task")
         print("8. Delete Task")
         print("9. Sort Tasks by Due Date")
+        print("10. Search Tasks")
+        print("11. Summary Dashboard")
         print("0. Exit")
         print("="*50)
     
     def add_task(self):
         """Add a new task"""
+        from task import Task
+        from validator import Validator
+        
         print("\n--- Add New Task ---")
         
         title = input("Enter task title: ").strip()
@@ -74,24 +247,23 @@ class TaskApp:
             else:
                 print("✗ Invalid date format! Please use YYYY-MM-DD.")
         
-        # Create and add task
-        task = Task(self.next_id, title, description, priority, due_date)
+        # Create and add task; shared storage hands out IDs across processes
+        reserve_id = getattr(self.file_handler, "reserve_id", None)
+        task_id = reserve_id() if reserve_id is not None else self.next_id
+        task = Task(task_id, title, description, priority, due_date)
         self.task_manager.add_task(task)
-        self.next_id += 1
+        self.next_id = max(self.next_id, task_id + 1)
         
         print(f"✓ Task added successfully! (ID: {task.task_id})")
-        self.save_tasks()
+        self.save_tasks([task.task_id])
     
     def view_all_tasks(self):
         """Display all tasks"""
-        tasks = self.task_manager.get_all_tasks()
-        
-        if not tasks:
+        if not self.task_manager.count_view("all"):
             print("\n📭 No tasks found!")
             return
         
-        print(f"\n--- All Tasks ({len(tasks)} total) ---")
-        self.display_tasks(tasks)
+        self.page_tasks("All Tasks", "all")
     
     def view_tasks_by_status(self):
         """Display tasks filtered by status"""
@@ -109,14 +281,11 @@ class TaskApp:
             print("✗ Invalid choice!")
             return
         
-        tasks = self.task_manager.filter_by_status(status)
-        
-        if not tasks:
+        if not self.task_manager.count_view("status", status):
             print(f"\n📭 No {status} tasks found!")
             return
         
-        print(f"\n--- {status} Tasks ({len(tasks)} total) ---")
-        self.display_tasks(tasks)
+        self.page_tasks(f"{status} Tasks", "status", status)
     
     def view_tasks_by_priority(self):
         """Display tasks filtered by priority"""
@@ -137,60 +306,56 @@ class TaskApp:
             print("✗ Invalid choice!")
             return
         
-        tasks = self.task_manager.filter_by_priority(priority)
-        
-        if not tasks:
+        if not self.task_manager.count_view("priority", priority):
             print(f"\n📭 No {priority} priority tasks found!")
             return
         
-        print(f"\n--- {priority} Priority Tasks ({len(tasks)} total) ---")
-        self.display_tasks(tasks)
+        self.page_tasks(f"{priority} Priority Tasks", "priority", priority)
     
     def mark_task_complete(self):
-        """Mark a task as complete"""
+        """Mark one or more tasks as complete"""
+        self.set_status("Complete", "complete")
+    
+    def mark_task_incomplete(self):
+        """Mark one or more tasks as incomplete"""
+        self.set_status("Pending", "incomplete")
+    
+    def set_status(self, status, label):
+        """Set the status of the task IDs the user enters, saving once"""
+        from batch import BatchError
+        
         self.view_all_tasks()
         
-        if not self.task_manager.get_all_tasks():
+        if self.task_manager.is_empty():
             return
         
         try:
-            task_id = int(input("\nEnter task ID to mark as complete: ").strip())
-            task = self.task_manager.get_task_by_id(task_id)
-            
-            if task:
-                task.mark_complete()
-                print(f"✓ Task {task_id} marked as complete!")
-                self.save_tasks()
-            else:
-                print(f"✗ Task with ID {task_id} not found!")
+            task_ids = parse_ids(input(f"\nEnter task ID(s) to mark as {label} (e.g. 3 or 1,4,10-14): "))
         except ValueError:
-            print("✗ Invalid ID! Please enter a number.")
-    
-    def mark_task_incomplete(self):
-        """Mark a task as incomplete"""
-        self.view_all_tasks()
-        
-        if not self.task_manager.get_all_tasks():
+            print("✗ Invalid ID! Please enter numbers or ranges.")
             return
         
         try:
-            task_id = int(input("\nEnter task ID to mark as incomplete: ").strip())
-            task = self.task_manager.get_task_by_id(task_id)
-            
-            if task:
-                task.mark_incomplete()
-                print(f"✓ Task {task_id} marked as incomplete!")
-                self.save_tasks()
-            else:
-                print(f"✗ Task with ID {task_id} not found!")
-        except ValueError:
-            print("✗ Invalid ID! Please enter a number.")
+            with self.task_manager.batch() as batch:
+                batch.set_status(status, task_ids)
+        except BatchError as e:
+            print(f"✗ {e}")
+            return
+        
+        if len(task_ids) == 1:
+            print(f"✓ Task {task_ids[0]} marked as {label}!")
+        else:
+            print(f"✓ {len(task_ids)} tasks marked as {label}!")
+        if batch.changed:
+            self.save_tasks(sorted(batch.changed))
     
     def edit_task(self):
         """Edit an existing task"""
+        from validator import Validator
+        
         self.view_all_tasks()
         
-        if not self.task_manager.get_all_tasks():
+        if self.task_manager.is_empty():
             return
         
         try:
@@ -237,72 +402,215 @@ class TaskApp:
                     print("✗ Invalid date format!")
             
             print(f"✓ Task {task_id} updated successfully!")
-            self.save_tasks()
+            self.save_tasks([task_id])
             
         except ValueError:
             print("✗ Invalid ID! Please enter a number.")
     
     def delete_task(self):
-        """Delete a task"""
+        """Delete one or more tasks"""
+        from batch import BatchError
+        
         self.view_all_tasks()
         
-        if not self.task_manager.get_all_tasks():
+        if self.task_manager.is_empty():
             return
         
         try:
-            task_id = int(input("\nEnter task ID to delete: ").strip())
-            
-            # Confirm deletion
-            confirm = input(f"Are you sure you want to delete task {task_id}? (y/n): ").strip().lower()
-            
-            if confirm == 'y':
-                self.task_manager.delete_task(task_id)
-                print(f"✓ Task {task_id} deleted successfully!")
-                self.save_tasks()
-            else:
-                print("✗ Deletion cancelled.")
-                
-        except ValueError as e:
+            task_ids = parse_ids(input("\nEnter task ID(s) to delete (e.g. 3 or 1,4,10-14): "))
+        except ValueError:
+            print("✗ Invalid ID! Please enter numbers or ranges.")
+            return
+        
+        # Confirm deletion
+        which = f"task {task_ids[0]}" if len(task_ids) == 1 else f"{len(task_ids)} tasks"
+        confirm = input(f"Are you sure you want to delete {which}? (y/n): ").strip().lower()
+        if confirm != 'y':
+            print("✗ Deletion cancelled.")
+            return
+        
+        try:
+            with self.task_manager.batch() as batch:
+                batch.delete(task_ids)
+        except BatchError as e:
             print(f"✗ Error: {e}")
-        except Exception as e:
-            print(f"✗ Invalid input: {e}")
+            return
+        
+        if len(task_ids) == 1:
+            print(f"✓ Task {task_ids[0]} deleted successfully!")
+        else:
+            print(f"✓ {len(task_ids)} tasks deleted successfully!")
+        self.save_tasks(sorted(batch.changed))
     
     def sort_tasks_by_due_date(self):
         """Display tasks sorted by due date"""
-        tasks = self.task_manager.sort_by_due_date()
+        if not self.task_manager.count_view("due_date"):
+            print("\n📭 No tasks found!")
+            return
+        
+        self.page_tasks("Tasks Sorted by Due Date", "due_date")
+    
+    def search_tasks(self):
+        """Display tasks matching search words"""
+        print("\n--- Search Tasks ---")
+        query = input("Enter search words (end a word with * to match a prefix): ").strip()
+        if not query:
+            print("✗ Search cannot be empty!")
+            return
+        
+        tasks = self.task_manager.search(query)
         
         if not tasks:
-            print("\n📭 No tasks found!")
+            print(f"\n📭 No tasks match '{query}'!")
+        else:
+            print(f"\n--- Search Results for '{query}' ({len(tasks)} total) ---")
+            self.display_tasks(tasks)
+        
+        self.search_archive(query)
+    
+    def search_archive(self, query):
+        """Offer to search archived tasks, which are not loaded"""
+        from archive import TaskArchive
+        
+        archive = TaskArchive.for_store(self.file_handler)
+        if not os.path.exists(archive.filename):
+            return
+        if input("\nSearch archived tasks too? (y/n): ").strip().lower() != 'y':
             return
         
-        print(f"\n--- Tasks Sorted by Due Date ({len(tasks)} total) ---")
+        tasks = archive.search(query)
+        if not tasks:
+            print(f"\n📭 No archived tasks match '{query}'!")
+            return
+        print(f"\n--- Archived Results for '{query}' ({len(tasks)} total) ---")
         self.display_tasks(tasks)
+        print("Restore with: python main.py restore ID [ID ...]")
     
-    def display_tasks(self, tasks):
-        """Display tasks in a formatted table"""
-        if not tasks:
-            print("📭 No tasks to display.")
+    def show_summary(self):
+        """Display task counts by status, priority and due week"""
+        summary = self.task_manager.summary()
+        print(f"\n--- Summary ({summary['total']} task(s)) ---")
+        if not summary["total"]:
+            print("📭 No tasks found!")
             return
         
-        # Header
-        print("\n" + "-"*100)
-        print(f"{'ID':<5} {'Title':<25} {'Priority':<10} {'Due Date':<12} {'Status':<10}")
-        print("-"*100)
+        print(f"{'':<10}" + "".join(f"{priority:>8}" for priority in summary["by_priority"]) + f"{'Total':>8}")
+        for status, counts in summary["by_status_priority"].items():
+            print(f"{status:<10}" + "".join(f"{count:>8}" for count in counts.values())
+                  + f"{summary['by_status'][status]:>8}")
+        print(f"{'Total':<10}" + "".join(f"{count:>8}" for count in summary["by_priority"].values())
+              + f"{summary['total']:>8}")
+        
+        if summary["overdue"]:
+            print(f"\n⚠ {summary['overdue']} task(s) overdue")
+        else:
+            print("\n✓ Nothing overdue")
+        print("\nDue per week:")
+        for monday, count in summary["due_weeks"]:
+            print(f"  Week of {monday}: {count}")
+    
+    def page_tasks(self, heading, view, value=None):
+        """Display a task view one page at a time with next/prev/jump navigation"""
+        total = self.task_manager.count_view(view, value)
+        pages = max(1, (total + PAGE_SIZE - 1) // PAGE_SIZE)
+        page = 0
         
-        # Tasks
+        while True:
+            # Only the rows of the current page are fetched and formatted
+            tasks = self.task_manager.page(view, value, page * PAGE_SIZE, PAGE_SIZE)
+            position = f" - Page {page + 1} of {pages}" if pages > 1 else ""
+            sys.stdout.write(f"\n--- {heading} ({total} total){position} ---\n" + self.format_tasks(tasks))
+            sys.stdout.flush()
+            
+            if pages == 1:
+                return
+            
+            choice = input("[n]ext, [p]revious, [j]ump to page, Enter to finish: ").strip().lower()
+            if not choice:
+                return
+            if choice in ("n", "next"):
+                if page + 1 < pages:
+                    page += 1
+                else:
+                    print("✗ Already on the last page.")
+            elif choice in ("p", "prev", "previous"):
+                if page > 0:
+                    page -= 1
+                else:
+                    print("✗ Already on the first page.")
+            elif choice.startswith("j"):
+                number = choice[1:].strip() or input(f"Page number (1-{pages}): ").strip()
+                if number.isdigit() and 1 <= int(number) <= pages:
+                    page = int(number) - 1
+                else:
+                    print(f"✗ Invalid page! Please enter a number between 1-{pages}.")
+            else:
+                print("✗ Invalid choice!")
+    
+    def format_tasks(self, tasks):
+        """Format tasks as a table in a single string"""
+        lines = [
+            "",
+            "-"*100,
+            f"{'ID':<5} {'Title':<25} {'Priority':<10} {'Due Date':<12} {'Status':<10}",
+            "-"*100,
+        ]
         for task in tasks:
             status_symbol = "✓" if task.status == "Complete" else "○"
-            print(f"{task.task_id:<5} {task.title[:24]:<25} {task.priority:<10} {task.due_date:<12} {status_symbol} {task.status:<10}")
+            lines.append(f"{task.task_id:<5} {task.title[:24]:<25} {task.priority:<10} {task.due_date:<12} {status_symbol} {task.status:<10}")
+        lines.append("-"*100)
+        return "\n".join(lines) + "\n"
+    
+    def display_tasks(self, tasks):
+        """Display tasks in a formatted table"""
+        if not tasks:
+            print("📭 No tasks to display.")
+            return
         
-        print("-"*100)
+        # One buffered write instead of a print per row
+        sys.stdout.write(self.format_tasks(tasks))
+        sys.stdout.flush()
     
     def run(self):
         """Main application loop"""
         print("\n🎯 Welcome to Task Manager!")
         
+        try:
+            self.menu_loop()
+        finally:
+            self.close_writer()
+    
+    def report_write_errors(self):
+        """Show saves that failed on the background writer"""
+        if self.writer is not None:
+            for message in self.writer.pop_errors():
+                print(f"✗ {message}")
+    
+    def close_writer(self):
+        """Write any pending changes before exiting"""
+        if self.writer is None:
+            return
+        saved = self.writer.close()
+        # Errors of earlier writes may still be queued even if this one worked
+        self.report_write_errors()
+        if saved:
+            return
+        # Last chance: save everything from this thread; a conflict is
+        # refreshed and the tasks that did not clash are saved again
+        self.writer = None
+        self.save_tasks()
+    
+    def menu_loop(self):
+        """Show the menu and run choices until the user exits"""
         while True:
+            # Until a fast start finishes loading there is nothing to refresh
+            if self.loaded.is_set():
+                self.report_write_errors()
+                self.refresh_tasks()
+                self.check_deadlines()
             self.display_menu()
-            choice = input("\nEnter your choice (0-9): ").strip()
+            choice = input("\nEnter your choice (0-11): ").strip()
+            self.wait_until_loaded()
             
             if choice == "1":
                 self.add_task()
@@ -322,21 +630,48 @@ class TaskApp:
                 self.delete_task()
             elif choice == "9":
                 self.sort_tasks_by_due_date()
+            elif choice == "10":
+                self.search_tasks()
+            elif choice == "11":
+                self.show_summary()
             elif choice == "0":
+                if self.stats_file:
+                    import instrumentation
+                    instrumentation.dump(self.stats_file)
+                    print(f"✓ Statistics written to {self.stats_file}.")
                 print("\n👋 Thank you for using Task Manager!")
                 print("✓ All tasks saved. Goodbye!")
                 break
             else:
-                print("\n✗ Invalid choice! Please enter a number between 0-9.")
+                print("\n✗ Invalid choice! Please enter a number between 0-11.")
             
             input("\nPress Enter to continue...")
 
 
-def main():
+def main(argv=None):
     """Entry point of the application"""
-    app = TaskApp()
+    args = sys.argv[1:] if argv is None else argv
+    if args and args[0] == "serve":
+        import server
+        return server.main(args[1:])
+    if args:
+        # Any arguments select the non-interactive bulk import/export mode
+        import bulk_cli
+        return bulk_cli.main(args)
+    
+    # TASK_MANAGER_STATS=stats.json (or stats.prom) turns on instrumentation;
+    # TASK_MANAGER_SAVE_MODE=async saves on a background thread;
+    # TASK_MANAGER_STORAGE=shared lets several processes use one store;
+    # TASK_MANAGER_WATCH=1 applies edits other programs make to the file;
+    # TASK_MANAGER_FAST_START=1 shows the menu while tasks load
+    app = TaskApp(storage=os.environ.get("TASK_MANAGER_STORAGE", "json"),
+                  stats_file=os.environ.get("TASK_MANAGER_STATS"),
+                  save_mode=os.environ.get("TASK_MANAGER_SAVE_MODE", "sync"),
+                  watch=os.environ.get("TASK_MANAGER_WATCH") == "1",
+                  fast_start=os.environ.get("TASK_MANAGER_FAST_START") == "1")
     app.run()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
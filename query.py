@@ -0,0 +1,350 @@
+import heapq
+from datetime import date
+from itertools import islice
+from task import PRIORITIES, PRIORITY_CODES, date_to_ordinal
+
+# Orderings a query can ask for; a leading "-" reverses one
+ORDERS = ("due_date", "-due_date", "priority", "-priority", "title", "task_id", "relevance")
+
+def _values(value):
+    """Normalize an equality predicate to a tuple of accepted values"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return (value,)
+    return tuple(dict.fromkeys(value))
+
+def _ordinal(date_string):
+    if date_string is None:
+        return None
+    ordinal = date_to_ordinal(date_string)
+    if ordinal is None:
+        raise ValueError(f"Invalid date: {date_string}")
+    return ordinal
+
+def _priority_rank(task):
+    return PRIORITY_CODES.get(task.priority, len(PRIORITIES))
+
+class Query:
+    """A conjunction of task predicates with an optional ordering and limit"""
+    
+    def __init__(self, status=None, priority=None, due_from=None, due_to=None, text=None,
+                 order_by=None, limit=None):
+        """
+        Args:
+            status: Status, or several statuses any of which may match
+            priority: Priority, or several priorities any of which may match
+            due_from: Earliest due date YYYY-MM-DD to include
+            due_to: Latest due date YYYY-MM-DD to include
+            text: Words the title or description must contain (see TaskManager.search)
+            order_by: One of ORDERS, or None for no particular order
+            limit: Maximum number of tasks to return, or None for all
+        """
+        if order_by is not None and order_by not in ORDERS:
+            raise ValueError(f"Unknown order: {order_by}")
+        if limit is not None and limit < 0:
+            raise ValueError("Limit cannot be negative")
+        self.status = _values(status)
+        self.priority = _values(priority)
+        self.due_from = _ordinal(due_from)
+        self.due_to = _ordinal(due_to)
+        self.text = text
+        self.order_by = order_by
+        self.limit = limit
+    
+    def _replace(self, **changes):
+        query = Query.__new__(Query)
+        query.__dict__.update(self.__dict__, **changes)
+        return query
+    
+    def where_status(self, *statuses):
+        """Get a copy that also requires one of the statuses"""
+        return self & Query(status=statuses)
+    
+    def where_priority(self, *priorities):
+        """Get a copy that also requires one of the priorities"""
+        return self & Query(priority=priorities)
+    
+    def due_between(self, start=None, end=None):
+        """Get a copy that also requires a due date in [start, end]"""
+        return self & Query(due_from=start, due_to=end)
+    
+    def matching(self, text):
+        """Get a copy that also requires the words of text"""
+        return self & Query(text=text)
+    
+    def order(self, order_by):
+        """Get a copy with a different ordering"""
+        if order_by is not None and order_by not in ORDERS:
+            raise ValueError(f"Unknown order: {order_by}")
+        return self._replace(order_by=order_by)
+    
+    def top(self, limit):
+        """Get a copy returning at most limit tasks"""
+        if limit is not None and limit < 0:
+            raise ValueError("Limit cannot be negative")
+        return self._replace(limit=limit)
+    
+    def __and__(self, other):
+        """Combine two queries; every predicate of both must hold"""
+        def both(mine, theirs):
+            if mine is None or theirs is None:
+                return theirs if mine is None else mine
+            return tuple(value for value in mine if value in theirs)
+        
+        def bound(mine, theirs, pick):
+            if mine is None or theirs is None:
+                return theirs if mine is None else mine
+            return pick(mine, theirs)
+        
+        texts = [text for text in (self.text, other.text) if text]
+        return self._replace(
+            status=both(self.status, other.status),
+            priority=both(self.priority, other.priority),
+            due_from=bound(self.due_from, other.due_from, max),
+            due_to=bound(self.due_to, other.due_to, min),
+            text=" ".join(texts) if texts else None,
+            order_by=other.order_by or self.order_by,
+            limit=other.limit if other.limit is not None else self.limit,
+        )
+    
+    def describe(self):
+        """Render the query as a one-line readable string"""
+        parts = []
+        for field in ("status", "priority"):
+            values = getattr(self, field)
+            if values is not None:
+                parts.append(f"{field} = {values[0]!r}" if len(values) == 1 else f"{field} in {values!r}")
+        if self.due_from is not None or self.due_to is not None:
+            parts.append(f"due_date in {_format_range(self.due_from, self.due_to)}")
+        if self.text is not None:
+            parts.append(f"text matches {self.text!r}")
+        text = " AND ".join(parts) if parts else "all tasks"
+        if self.order_by:
+            text += f" ORDER BY {self.order_by}"
+        if self.limit is not None:
+            text += f" LIMIT {self.limit}"
+        return text
+
+def _format_range(start, end):
+    low = "..." if start is None else date.fromordinal(start).isoformat()
+    high = "..." if end is None else date.fromordinal(end).isoformat()
+    return f"[{low}, {high}]"
+
+class AccessPath:
+    """One way of producing candidate tasks, with its estimated row count"""
+    
+    def __init__(self, name, estimate, source, covers=(), ordered=False, detail=""):
+        self.name = name
+        self.estimate = estimate
+        # Callable returning an iterable of candidate tasks
+        self.source = source
+        # Predicates the path already guarantees, so they need no re-check
+        self.covers = covers
+        # True when candidates come out in the query's order
+        self.ordered = ordered
+        self.detail = detail
+        # Rows expected to be read before the query is answered
+        self.cost = estimate
+
+class QueryPlan:
+    """The access path and remaining work chosen for a query"""
+    
+    def __init__(self, manager, query):
+        self.manager = manager
+        self.query = query
+        self.terms = None if query.text is None else manager.text_index.parse_query(query.text)
+        self.scores = None
+        self.candidates = self._access_paths()
+        self.access = min(self.candidates, key=lambda path: (path.cost, not path.ordered))
+        self.filters = [name for name in self._predicates() if name not in self.access.covers]
+    
+    def _predicates(self):
+        query = self.query
+        names = []
+        if query.status is not None:
+            names.append("status")
+        if query.priority is not None:
+            names.append("priority")
+        if query.due_from is not None or query.due_to is not None:
+            names.append("due_date")
+        if query.text is not None:
+            names.append("text")
+        return names
+    
+    def _due_bounds(self):
+        # Tasks without a valid date are filed under 0 and never match a range
+        start = self.query.due_from
+        return (1 if start is None else max(start, 1)), self.query.due_to
+    
+    def _access_paths(self):
+        manager = self.manager
+        query = self.query
+        total = len(manager.tasks)
+        paths = [AccessPath("full scan", total, lambda: manager.tasks.values())]
+        
+        # Per-predicate row counts, used to guess how selective the rest is
+        counts = {}
+        for field, index in (("status", manager.status_index), ("priority", manager.priority_index)):
+            values = getattr(query, field)
+            if values is None:
+                continue
+            counts[field] = sum(index.count(value) for value in values)
+            paths.append(AccessPath(
+                f"{field} index", counts[field],
+                lambda index=index, values=values: (task for value in values
+                                                    for task in index.buckets.get(value, {}).values()),
+                covers=(field,), detail=f"lookup of {', '.join(map(repr, values))}"))
+        
+        if "due_date" in self._predicates():
+            start, end = self._due_bounds()
+            counts["due_date"] = manager.due_date_index.count_range(start, end)
+            paths.append(AccessPath(
+                "due_date index", counts["due_date"],
+                lambda: manager.due_date_index.iter_range(start, end),
+                covers=("due_date",), detail=f"range scan of {_format_range(start, end)}"))
+        
+        if self.terms is not None:
+            counts["text"] = manager.text_index.estimate(self.terms)
+            paths.append(AccessPath(
+                "text index", counts["text"], self._text_candidates,
+                covers=("text",), detail=f"postings of {query.text!r}"))
+        
+        if query.order_by in ("due_date", "-due_date"):
+            paths.append(self._ordered_due_path(total, counts))
+        
+        if query.order_by == "relevance":
+            if self.terms is None:
+                raise ValueError("Ordering by relevance needs a text predicate")
+            # Only the text index knows the scores
+            paths = [path for path in paths if path.name == "text index"]
+        if any(values == () for values in (query.status, query.priority)):
+            paths = [AccessPath("empty result", 0, tuple, covers=tuple(counts),
+                                detail="the predicates contradict each other")]
+        return paths
+    
+    def _ordered_due_path(self, total, counts):
+        """Walk the due date index in query order, stopping at the limit"""
+        query = self.query
+        reverse = query.order_by == "-due_date"
+        if "due_date" in counts:
+            start, end = self._due_bounds()
+            scanned = counts["due_date"]
+            covers = ("due_date",)
+        else:
+            start = end = None
+            scanned = total
+            covers = ()
+        
+        # Assume the other predicates are independent of each other and of the date
+        selectivity = 1.0
+        for field, count in counts.items():
+            if field != "due_date":
+                selectivity *= count / total if total else 0.0
+        path = AccessPath(
+            "due_date index", scanned,
+            lambda: self.manager.due_date_index.iter_range(start, end, reverse=reverse),
+            covers=covers, ordered=True,
+            detail=f"{'reverse ' if reverse else ''}ordered scan of {_format_range(start, end)}")
+        if query.limit is not None:
+            path.cost = scanned if selectivity == 0 else min(scanned, query.limit / selectivity)
+        return path
+    
+    def _text_candidates(self):
+        self.scores = self.manager.text_index.scores(self.terms)
+        tasks = self.manager.tasks
+        return (tasks[task_id] for task_id in self.scores)
+    
+    def _checks(self):
+        query = self.query
+        checks = []
+        for name in self.filters:
+            if name == "status":
+                statuses = set(query.status)
+                checks.append(lambda task: task.status in statuses)
+            elif name == "priority":
+                priorities = set(query.priority)
+                checks.append(lambda task: task.priority in priorities)
+            elif name == "due_date":
+                start, end = self._due_bounds()
+                high = float("inf") if end is None else end
+                checks.append(lambda task: start <= task.due_ordinal <= high)
+            elif name == "text":
+                text_index, terms = self.manager.text_index, self.terms
+                checks.append(lambda task: text_index.matches(task, terms))
+        return checks
+    
+    def _sort_key(self):
+        order_by = self.query.order_by
+        if order_by == "due_date":
+            return lambda task: (task.due_ordinal, task.task_id)
+        if order_by == "-due_date":
+            return lambda task: (-task.due_ordinal, -task.task_id)
+        if order_by == "priority":
+            return lambda task: (_priority_rank(task), task.task_id)
+        if order_by == "-priority":
+            return lambda task: (-_priority_rank(task), task.task_id)
+        if order_by == "title":
+            return lambda task: (str(task.title).lower(), task.task_id)
+        if order_by == "task_id":
+            return lambda task: task.task_id
+        scores = self.scores
+        return lambda task: (-scores[task.task_id], task.task_id)
+    
+    def execute(self):
+        """
+        Run the plan
+        Returns:
+            List of matching tasks in the query's order
+        """
+        query = self.query
+        if query.limit == 0:
+            return []
+        
+        candidates = self.access.source()
+        checks = self._checks()
+        if checks:
+            candidates = (task for task in candidates if all(check(task) for check in checks))
+        
+        if self.access.ordered or not query.order_by:
+            return list(islice(candidates, query.limit))
+        if query.limit is None:
+            return sorted(candidates, key=self._sort_key())
+        # A bounded heap keeps only the best limit tasks seen so far
+        return heapq.nsmallest(query.limit, candidates, key=self._sort_key())
+    
+    def explain(self):
+        """
+        Describe the chosen plan and the alternatives it was picked over
+        Returns:
+            Multi-line string
+        """
+        query = self.query
+        access = self.access
+        lines = [f"Query: {query.describe()}"]
+        line = f"Access: {access.name}"
+        if access.detail:
+            line += f", {access.detail}"
+        line += f" (~{access.estimate} of {len(self.manager.tasks)} tasks"
+        if access.cost < access.estimate:
+            line += f", ~{round(access.cost)} expected to be read"
+        line += ")"
+        lines.append(line)
+        
+        if self.filters:
+            lines.append(f"Filter: {', '.join(self.filters)} checked on each candidate")
+        if not query.order_by:
+            lines.append("Order: none" + (f", stop after {query.limit}" if query.limit is not None else ""))
+        elif access.ordered:
+            lines.append(f"Order: from the index, stop after {query.limit}" if query.limit is not None
+                         else "Order: from the index")
+        elif query.limit is None:
+            lines.append(f"Order: full sort by {query.order_by}")
+        else:
+            lines.append(f"Order: top {query.limit} by {query.order_by} with a bounded heap")
+        
+        others = [f"{path.name}{' (ordered)' if path.ordered else ''} ~{round(path.cost)}"
+                  for path in self.candidates if path is not access]
+        if others:
+            lines.append(f"Rejected: {'; '.join(others)}")
+        return "\n".join(lines)
@@ -0,0 +1,387 @@
+"""
+HTTP/JSON server exposing a TaskManager, built on asyncio.
+
+Run from the repository root:
+    python main.py serve --port 8080 --storage sqlite
+
+Endpoints:
+    GET    /tasks           list tasks; optional query parameters status,
+                            priority (repeatable), due_from, due_to, q,
+                            order_by, limit and offset (see Query)
+    GET    /tasks/ID        one task
+    POST   /tasks           create a task from a JSON object
+    PATCH  /tasks/ID        change some fields of a task
+    DELETE /tasks/ID        delete a task
+    GET    /explain         the query plan for the same parameters as /tasks
+    GET    /summary         counts by status and priority, overdue and per due week
+
+Write requests are answered once the background writer has saved them.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+import instrumentation
+from background_writer import BackgroundWriter
+from query import Query
+from storage import STORAGE_BACKENDS, backend_class, open_storage
+from task import Task
+from task_manager import TaskManager
+from validator import VALID_STATUSES, Validator
+
+# Results with more tasks than this are sent in chunks of this many
+STREAM_BATCH = 500
+MAX_BODY_SIZE = 1024 * 1024
+# Seconds an idle keep-alive connection stays open
+KEEP_ALIVE_TIMEOUT = 15
+# Seconds a write request waits for its save
+SAVE_TIMEOUT = 30
+EDITABLE_FIELDS = ("title", "description", "priority", "due_date", "status")
+
+class HTTPError(Exception):
+    """Error answered with an HTTP status and a JSON error message"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class TaskServer:
+    """Serves TaskManager CRUD, filters and sorted views over HTTP/JSON"""
+
+    def __init__(self, storage="json", filename=None):
+        self.file_handler = open_storage(storage, filename)
+        backend = self.file_handler if getattr(self.file_handler, "supports_pushdown", False) else None
+        self.task_manager = TaskManager(backend)
+        self.task_manager.tasks = self.file_handler.load_tasks()
+        stored_next_id = getattr(self.file_handler, "next_id", None)
+        self.next_id = stored_next_id or max(self.task_manager.tasks, default=0) + 1
+        # Saves run on the writer thread, so the event loop never waits on disk
+        self.writer = BackgroundWriter(self.file_handler, self.task_manager)
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """Start listening; port 0 picks a free port"""
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        """Write pending changes and stop the writer"""
+        return self.writer.close(SAVE_TIMEOUT)
+
+    async def handle_connection(self, reader, writer):
+        """Answer requests on one connection until it closes or idles out"""
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self.send(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                    {"error": "Request headers too large"}, False)
+                    return
+
+                body = None
+                try:
+                    method, target, version, headers = self.parse_head(head)
+                    keep_alive = self.wants_keep_alive(version, headers)
+                    body = await self.read_body(reader, headers)
+                    status, payload = await self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                    # An unread body would be taken for the next request
+                    if body is None:
+                        keep_alive = False
+                except asyncio.IncompleteReadError:
+                    return
+                except Exception as e:
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Unexpected error: {e}"}
+
+                if isinstance(payload, list) and len(payload) > STREAM_BATCH:
+                    await self.send_stream(writer, payload, keep_alive)
+                else:
+                    await self.send(writer, status, payload, keep_alive)
+        finally:
+            writer.close()
+
+    @staticmethod
+    def parse_head(head):
+        """Split a request head into method, target, version and headers"""
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split(" ")
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        return parts[0], parts[1], parts[2], headers
+
+    @staticmethod
+    def wants_keep_alive(version, headers):
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    @staticmethod
+    async def read_body(reader, headers):
+        if "transfer-encoding" in headers:
+            raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "Chunked request bodies are not supported")
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_BODY_SIZE:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        return await reader.readexactly(length) if length > 0 else b""
+
+    async def dispatch(self, method, target, body):
+        """
+        Route one request
+        Returns:
+            (HTTPStatus, payload) where payload is JSON data, or None for no body
+        """
+        self.refresh()
+        url = urlsplit(target)
+        params = parse_qs(url.query)
+        segments = [segment for segment in url.path.split("/") if segment]
+
+        if segments == ["tasks"]:
+            if method == "GET":
+                return HTTPStatus.OK, self.list_tasks(params)
+            if method == "POST":
+                return HTTPStatus.CREATED, await self.create_task(self.parse_json(body))
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on /tasks")
+
+        if len(segments) == 2 and segments[0] == "tasks":
+            task = self.find_task(segments[1])
+            if method == "GET":
+                return HTTPStatus.OK, self.file_handler.task_to_dict(task)
+            if method in ("PATCH", "PUT"):
+                return HTTPStatus.OK, await self.update_task(task, self.parse_json(body))
+            if method == "DELETE":
+                self.task_manager.delete_task(task.task_id)
+                await self.save([task.task_id])
+                return HTTPStatus.NO_CONTENT, None
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on /tasks/ID")
+
+        if segments == ["explain"] and method == "GET":
+            return HTTPStatus.OK, {"plan": self.task_manager.explain(self.build_query(params)[0])}
+
+        if segments == ["summary"] and method == "GET":
+            return HTTPStatus.OK, self.task_manager.summary()
+
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No such resource: {url.path}")
+
+    @staticmethod
+    def parse_json(body):
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}")
+        if not isinstance(data, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Expected a JSON object")
+        return data
+
+    def find_task(self, segment):
+        try:
+            task_id = int(segment)
+        except ValueError:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Task with ID {segment} not found")
+        task = self.task_manager.get_task_by_id(task_id)
+        if task is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Task with ID {task_id} not found")
+        return task
+
+    @staticmethod
+    def build_query(params):
+        """
+        Turn URL query parameters into a Query
+        Returns:
+            (Query, offset)
+        """
+        def single(name, convert=str):
+            values = params.get(name)
+            if not values:
+                return None
+            try:
+                return convert(values[-1])
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid {name}: {values[-1]}")
+
+        offset = single("offset", int) or 0
+        limit = single("limit", int)
+        if offset < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Offset cannot be negative")
+        try:
+            query = Query(status=params.get("status"), priority=params.get("priority"),
+                          due_from=single("due_from"), due_to=single("due_to"), text=single("q"),
+                          order_by=single("order_by"),
+                          limit=None if limit is None else limit + offset)
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+        return query, offset
+
+    def list_tasks(self, params):
+        query, offset = self.build_query(params)
+        try:
+            tasks = self.task_manager.query(query)
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+        return tasks[offset:] if offset else tasks
+
+    @staticmethod
+    def check_fields(data, required):
+        """Validate the task fields of a request body"""
+        unknown = [field for field in data if field not in EDITABLE_FIELDS]
+        if unknown:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unknown field(s): {', '.join(unknown)}")
+        for field in required:
+            if field not in data:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"Missing field: {field}")
+        if "title" in data and (not isinstance(data["title"], str) or not data["title"].strip()):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Title cannot be empty")
+        if "description" in data and not isinstance(data["description"], str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Description must be a string")
+        # Type checks first: the validators hash their input, and a list
+        # or object would fail there with a server error
+        if "priority" in data and (not isinstance(data["priority"], str)
+                                   or not Validator.validate_priority(data["priority"])):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid priority! Use High, Medium, or Low.")
+        if "due_date" in data and (not isinstance(data["due_date"], str)
+                                   or not Validator.validate_date(data["due_date"])):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid date format! Use YYYY-MM-DD.")
+        if "status" in data and (not isinstance(data["status"], str) or data["status"] not in VALID_STATUSES):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid status! Use Pending or Complete.")
+
+    async def create_task(self, data):
+        self.check_fields(data, ("title", "priority", "due_date"))
+        reserve_id = getattr(self.file_handler, "reserve_id", None)
+        if reserve_id is not None:
+            task_id = await asyncio.get_running_loop().run_in_executor(None, reserve_id)
+        else:
+            task_id = self.next_id
+        self.next_id = max(self.next_id, task_id + 1)
+
+        task = Task(task_id, data["title"].strip(), data.get("description", ""),
+                    data["priority"], data["due_date"])
+        if "status" in data:
+            task.status = data["status"]
+        self.task_manager.add_task(task)
+        await self.save([task_id])
+        return self.file_handler.task_to_dict(task)
+
+    async def update_task(self, task, data):
+        self.check_fields(data, ())
+        for field in EDITABLE_FIELDS:
+            if field in data:
+                setattr(task, field, data[field].strip() if field == "title" else data[field])
+        await self.save([task.task_id])
+        return self.file_handler.task_to_dict(task)
+
+    async def save(self, task_ids):
+        """Queue changed tasks for the writer and wait for them to be saved"""
+        self.writer.mark_dirty(task_ids)
+        saved = await asyncio.get_running_loop().run_in_executor(None, self.writer.flush, SAVE_TIMEOUT)
+        if not saved:
+            errors = self.writer.pop_errors()
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, errors[-1] if errors else "Timed out saving tasks")
+
+    def refresh(self):
+        """Pull in tasks other processes saved to a shared store"""
+        read_changes = getattr(self.file_handler, "read_changes", None)
+        if read_changes is None:
+            return
+        updated, deleted = read_changes()
+        for task in updated:
+            self.task_manager.add_task(task)
+        for task_id in deleted:
+            if self.task_manager.get_task_by_id(task_id) is not None:
+                self.task_manager.delete_task(task_id)
+
+    @staticmethod
+    def response_head(status, headers, keep_alive):
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        lines.extend(f"{name}: {value}" for name, value in headers)
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    def encode(self, payload):
+        if isinstance(payload, list):
+            payload = [self.file_handler.task_to_dict(task) for task in payload]
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+    async def send(self, writer, status, payload, keep_alive):
+        """Send a whole response with a Content-Length"""
+        body = b"" if payload is None else self.encode(payload)
+        headers = []
+        if status != HTTPStatus.NO_CONTENT:
+            headers.append(("Content-Length", len(body)))
+        if payload is not None:
+            headers.append(("Content-Type", "application/json"))
+        writer.write(self.response_head(status, headers, keep_alive) + body)
+        await writer.drain()
+
+    async def send_stream(self, writer, tasks, keep_alive):
+        """Send a task list as a JSON array in chunks, batch by batch"""
+        headers = [("Content-Type", "application/json"), ("Transfer-Encoding", "chunked")]
+        writer.write(self.response_head(HTTPStatus.OK, headers, keep_alive))
+        task_to_dict = self.file_handler.task_to_dict
+        for start in range(0, len(tasks), STREAM_BATCH):
+            items = ",".join(json.dumps(task_to_dict(task), ensure_ascii=False)
+                             for task in tasks[start:start + STREAM_BATCH])
+            chunk = ("[" if start == 0 else ",") + items
+            if start + STREAM_BATCH >= len(tasks):
+                chunk += "]"
+            data = chunk.encode("utf-8")
+            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+            # Let slow clients apply back-pressure instead of buffering everything
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py serve", description="Serve tasks over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on; 0 picks a free one")
+    parser.add_argument("--storage", choices=sorted(STORAGE_BACKENDS), default="json",
+                        help="storage backend (default: json)")
+    parser.add_argument("--data", help="task store file (default: the backend's default)")
+    parser.add_argument("--stats", help="record operation timings and write them to this file on exit")
+    return parser
+
+async def serve(task_server, host, port):
+    server = await task_server.start(host, port)
+    address = server.sockets[0].getsockname()
+    print(f"✓ Serving {len(task_server.task_manager.tasks)} task(s) on http://{address[0]}:{address[1]}",
+          flush=True)
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    """Entry point for the HTTP server"""
+    args = build_parser().parse_args(argv)
+    if args.stats:
+        # Backends are imported on demand: load the handler class first so
+        # its methods are wrapped too, and the initial load is timed
+        backend_class(args.storage)
+        instrumentation.enable()
+    task_server = TaskServer(args.storage, args.data)
+    try:
+        asyncio.run(serve(task_server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        saved = task_server.close()
+        if args.stats:
+            instrumentation.dump(args.stats)
+    if not saved:
+        print("✗ Error saving tasks. Recent changes may be lost.")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+import json
+import os
+import sys
+import instrumentation
+from file_handler import FileHandler
+
+MANIFEST = "manifest.json"
+LAYOUTS = ("month", "id")
+UNDATED = "undated"
+
+class ShardedFileHandler(FileHandler):
+    """Stores tasks in a directory of JSON shards listed in a manifest"""
+
+    def __init__(self, filename="tasks_shards", layout="month", id_range=1000):
+        """
+        Args:
+            filename: Directory holding the shards and manifest.json
+            layout: "month" to shard by due month, "id" to shard by ID range;
+                an existing manifest overrides both layout and id_range
+            id_range: Task IDs per shard for the "id" layout
+        """
+        super().__init__(filename)
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown shard layout: {layout}")
+        self.layout = layout
+        self.id_range = id_range
+        self.manifest_filename = os.path.join(filename, MANIFEST)
+        # shard key -> {"file": name, "count": tasks}, as in the manifest
+        self.manifest = {}
+        # shard key -> IDs of the tasks in it, for shards held in memory
+        self.members = {}
+        # task ID -> shard key it was last written to
+        self.shard_of = {}
+        # Tasks read from shards that were not loaded, kept to rewrite them
+        self._stored = {}
+        # Shards still to be rewritten, kept until a save succeeds
+        self._dirty = set()
+        self.next_id = None
+        self._read_manifest()
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_filename, 'r') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        self.layout = data["layout"]
+        self.id_range = data.get("id_range", self.id_range)
+        self.manifest = data["shards"]
+        self.next_id = data.get("next_id")
+
+    def _write_manifest(self):
+        data = {
+            "layout": self.layout,
+            "id_range": self.id_range,
+            "next_id": self.next_id,
+            "shards": dict(sorted(self.manifest.items())),
+        }
+        self._write_json(self.manifest_filename, data)
+
+    def _write_json(self, path, data):
+        # Temp file and rename, so a crash leaves either the old or new shard
+        temp_filename = path + ".tmp"
+        with open(temp_filename, 'w') as file:
+            json.dump(data, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+            instrumentation.count_bytes("bytes_written", file.tell())
+        os.replace(temp_filename, path)
+
+    def shard_key(self, task):
+        """Get the shard a task belongs in"""
+        if self.layout == "id":
+            return f"ids-{task.task_id // self.id_range * self.id_range:010d}"
+        return task.due_date[:7] if task.due_ordinal else UNDATED
+
+    def _shard_path(self, key):
+        return os.path.join(self.filename, self.manifest[key]["file"])
+
+    def select_shards(self, start=None, end=None):
+        """
+        Get the shard keys covering a range
+        Args:
+            start: First month "YYYY-MM" (or lowest task ID for the "id"
+                layout) to include, or None for no lower bound
+            end: Last month (or highest task ID) to include, or None
+        Returns:
+            Sorted list of shard keys; undated tasks are only included when
+            neither bound is given
+        """
+        keys = []
+        for key in sorted(self.manifest):
+            if self.layout == "id":
+                low = int(key[4:])
+                high = low + self.id_range - 1
+                if (start is None or high >= start) and (end is None or low <= end):
+                    keys.append(key)
+            elif key == UNDATED:
+                if start is None and end is None:
+                    keys.append(key)
+            elif (start is None or key >= start) and (end is None or key <= end):
+                keys.append(key)
+        return keys
+
+    def _read_shard(self, key, progress=None, validate=False):
+        path = self._shard_path(key)
+        with open(path, 'r') as file:
+            tasks = list(self.iter_tasks(file, progress=progress, validate=validate))
+        instrumentation.count_bytes("bytes_read", os.path.getsize(path))
+        return tasks
+
+    def _write_shard(self, key, tasks):
+        """
+        Rewrite one shard
+        Returns:
+            Path of a shard file left empty, to delete once the manifest
+            no longer lists it, or None
+        """
+        if not tasks:
+            self.members.pop(key, None)
+            if key not in self.manifest:
+                return None
+            path = self._shard_path(key)
+            del self.manifest[key]
+            return path
+        self.manifest[key] = {"file": key + ".json", "count": len(tasks)}
+        with instrumentation.timed("ShardedFileHandler.write_shard.serialize"):
+            self._write_json(self._shard_path(key), [self.task_to_dict(task) for task in tasks])
+        return None
+
+    def save_tasks(self, tasks_dict):
+        """
+        Rewrite every shard holding the given tasks
+        Args:
+            tasks_dict: Dictionary of tasks {task_id: Task object}
+        Shards that were never loaded are left alone unless a task moved
+        into them, so a partial load followed by a full save loses nothing.
+        """
+        return self._save(tasks_dict, list(tasks_dict), full=True)
+
+    def save_changes(self, tasks_dict, task_ids):
+        """
+        Rewrite only the shards that hold, or used to hold, changed tasks
+        Args:
+            tasks_dict: Dictionary of tasks {task_id: Task object}
+            task_ids: IDs of tasks that were added, edited or deleted
+        Returns:
+            True on success, False otherwise
+        """
+        return self._save(tasks_dict, task_ids, full=False)
+
+    def _save(self, tasks_dict, task_ids, full):
+        try:
+            os.makedirs(self.filename, exist_ok=True)
+            dirty = self._dirty
+            if full:
+                # Every shard held in memory is rewritten from tasks_dict
+                dirty.update(self.members)
+                for task_id in list(self.shard_of):
+                    if task_id not in tasks_dict and task_id not in self._stored:
+                        self.members[self.shard_of.pop(task_id)].discard(task_id)
+
+            for task_id in task_ids:
+                old_key = self.shard_of.pop(task_id, None)
+                if old_key is not None:
+                    self.members[old_key].discard(task_id)
+                    dirty.add(old_key)
+                task = tasks_dict.get(task_id)
+                if task is not None:
+                    key = self.shard_key(task)
+                    if key not in self.members:
+                        self._take_over(key, tasks_dict)
+                    self.members[key].add(task_id)
+                    self.shard_of[task_id] = key
+                    dirty.add(key)
+
+            emptied = []
+            for key in sorted(dirty):
+                path = self._write_shard(key, [tasks_dict.get(task_id) or self._stored[task_id]
+                                               for task_id in sorted(self.members.get(key, ()))])
+                if path is not None:
+                    emptied.append(path)
+
+            highest = max((task_id for task_id in tasks_dict if isinstance(task_id, int)), default=0)
+            self.next_id = max(self.next_id or 1, highest + 1)
+            # The manifest is written last, so it never lists a missing shard
+            self._write_manifest()
+            for path in emptied:
+                os.remove(path)
+            dirty.clear()
+            return True
+        except Exception as e:
+            print(f"Error saving tasks: {e}")
+            return False
+
+    def _take_over(self, key, tasks_dict):
+        """Start tracking a shard in memory, keeping tasks already on disk"""
+        self.members[key] = set()
+        if key not in self.manifest:
+            return
+        # The shard was not loaded: its stored tasks stay as they are
+        for task in self._read_shard(key):
+            if task.task_id in tasks_dict:
+                continue
+            self._stored[task.task_id] = task
+            self.members[key].add(task.task_id)
+            self.shard_of[task.task_id] = key
+
+    def load_tasks(self, progress=None, validate=False, shards=None):
+        """
+        Load tasks from every shard, or only from selected ones
+        Args:
+            progress: Optional callable(tasks_loaded, chars_read) per shard
+            validate: Collect record problems in validation_errors
+            shards: Shard keys to read (see select_shards), or None for all
+        Returns:
+            Dictionary of tasks {task_id: Task object}
+        """
+        self.validation_errors = []
+        self.load_error = None
+        self.members = {}
+        self.shard_of = {}
+        self._stored = {}
+        self._dirty = set()
+        self._read_manifest()
+        keys = sorted(self.manifest) if shards is None else [key for key in shards if key in self.manifest]
+        tasks_dict = {}
+        try:
+            for key in keys:
+                tasks = self._read_shard(key, progress=progress, validate=validate)
+                self.members[key] = {task.task_id for task in tasks}
+                for task in tasks:
+                    tasks_dict[task.task_id] = task
+                    self.shard_of[task.task_id] = key
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error reading {self.filename}: {e}. Starting fresh.")
+            self.load_error = str(e)
+            self.members = {}
+            self.shard_of = {}
+            return {}
+
+        if self.validation_errors:
+            print(f"⚠ {len(self.validation_errors)} problem(s) found in {self.filename}.")
+        if self.next_id is None and tasks_dict:
+            self.next_id = max(tasks_dict) + 1
+        return tasks_dict
+
+def split_json(json_filename, directory, layout="month", id_range=1000):
+    """
+    Convert a tasks.json file into a sharded directory
+    Returns:
+        Number of tasks written
+    Raises:
+        ValueError if the directory already holds a sharded store, OSError
+        if tasks.json cannot be read, json.JSONDecodeError if it is corrupted
+    """
+    if os.path.exists(os.path.join(directory, MANIFEST)):
+        raise ValueError(f"{directory} already holds a sharded store")
+    # Read strictly: a missing or corrupt source must not become an empty store
+    with open(json_filename, 'r') as file:
+        tasks_dict = {task.task_id: task for task in FileHandler(json_filename).iter_tasks(file)}
+    handler = ShardedFileHandler(directory, layout=layout, id_range=id_range)
+    if not handler.save_tasks(tasks_dict):
+        raise RuntimeError(f"Could not write {directory}")
+    return len(tasks_dict)
+
+def merge_shards(directory, json_filename):
+    """
+    Convert a sharded directory back to the single tasks.json layout
+    Returns:
+        Number of tasks written
+    Raises:
+        ValueError if the directory holds no sharded store, RuntimeError
+        if a shard cannot be read; tasks.json is left alone in both cases
+    """
+    if not os.path.exists(os.path.join(directory, MANIFEST)):
+        raise ValueError(f"{directory} does not hold a sharded store")
+    handler = ShardedFileHandler(directory)
+    tasks_dict = handler.load_tasks()
+    # A shard that failed to load empties the result instead of raising
+    if handler.manifest and not handler.members:
+        raise RuntimeError(f"Could not read the shards of {directory}")
+    # Shards are read in key order; the single file keeps tasks in ID order
+    tasks_dict = dict(sorted(tasks_dict.items()))
+    if not FileHandler(json_filename).save_tasks(tasks_dict):
+        raise RuntimeError(f"Could not write {json_filename}")
+    return len(tasks_dict)
+
+def main(argv=None):
+    """Convert between tasks.json and a sharded directory"""
+    args = sys.argv[1:] if argv is None else argv
+    layout = "month"
+    if len(args) == 4 and args[0] == "split" and args[3] in ("--by-month", "--by-id"):
+        layout = "month" if args.pop() == "--by-month" else "id"
+    if len(args) != 3 or args[0] not in ("split", "merge"):
+        print("Usage: python sharded_handler.py split TASKS_JSON DIRECTORY [--by-month|--by-id]")
+        print("       python sharded_handler.py merge DIRECTORY TASKS_JSON")
+        return 1
+    command, source, destination = args
+    try:
+        if command == "split":
+            count = split_json(source, destination, layout=layout)
+        else:
+            count = merge_shards(source, destination)
+    except (OSError, ValueError, RuntimeError) as e:
+        # json.JSONDecodeError is a ValueError
+        print(f"✗ {e}")
+        return 1
+    print(f"✓ Converted {count} task(s) from {source} to {destination}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
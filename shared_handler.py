@@ -0,0 +1,271 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+import instrumentation
+from file_handler import ConflictError
+from journal_handler import JournalFileHandler
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory locks on this platform; a single process is still safe
+    fcntl = None
+
+class SharedJournalFileHandler(JournalFileHandler):
+    """Journaled storage that several processes can use at the same time"""
+
+    def __init__(self, filename="tasks.json", compact_every=1000):
+        super().__init__(filename, compact_every)
+        self.lock_filename = filename + ".lock"
+        # Latest stored version of each task read from disk so far
+        self.versions = {}
+        # Version of each task the caller holds
+        self.seen = {}
+        # Lowest ID no process has used or reserved
+        self.next_id = 1
+        # (inode, mtime, size) of the snapshot the log offset belongs to
+        self._signature = None
+        self._log_offset = 0
+        # task_id -> Task, or None when deleted, read but not yet handed out
+        self._pending = {}
+        # Versions collected while a full load runs
+        self._loading = None
+        # A background writer thread may save while the UI refreshes
+        self._state_lock = threading.RLock()
+
+    @contextmanager
+    def _locked(self, exclusive):
+        """Hold the advisory lock shared by every process using the store"""
+        with open(self.lock_filename, 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _snapshot_signature(self):
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _log_size(self):
+        try:
+            return os.path.getsize(self.log_filename)
+        except FileNotFoundError:
+            return 0
+
+    def dict_to_task(self, task_dict):
+        task = super().dict_to_task(task_dict)
+        if self._loading is not None:
+            self._loading[task.task_id] = task_dict.get("version", 1)
+        return task
+
+    def apply_record(self, tasks_dict, record):
+        """Apply a log record, tracking versions and reserved IDs"""
+        if record["op"] == "reserve":
+            self.next_id = max(self.next_id, record["task_id"] + 1)
+            return
+        super().apply_record(tasks_dict, record)
+        if record["op"] == "put":
+            self.next_id = max(self.next_id, record["task"]["task_id"] + 1)
+        elif self._loading is not None:
+            self._loading.pop(record["task_id"], None)
+
+    def _load_all(self, progress=None, validate=False):
+        """Read the snapshot and whole log; the caller holds the lock"""
+        self._loading = {}
+        self.next_id = 1
+        try:
+            tasks_dict = super().load_tasks(progress, validate)
+            versions = self._loading
+        finally:
+            self._loading = None
+        self.next_id = max(self.next_id, max(tasks_dict, default=0) + 1)
+        self.versions = versions
+        self._signature = self._snapshot_signature()
+        self._log_offset = self._log_size()
+        return tasks_dict
+
+    def load_tasks(self, progress=None, validate=False):
+        """
+        Load every task and remember the version of each
+        Args:
+            progress: See JournalFileHandler.load_tasks
+            validate: See JournalFileHandler.load_tasks
+        Returns:
+            Dictionary of tasks {task_id: Task object}
+        """
+        with self._state_lock, self._locked(False):
+            tasks_dict = self._load_all(progress, validate)
+            self.seen = dict(self.versions)
+            self._pending = {}
+            return tasks_dict
+
+    def _unchanged(self):
+        """Cheap check, two stat calls, that nobody wrote since we last read"""
+        return self._snapshot_signature() == self._signature and self._log_size() == self._log_offset
+
+    def _catch_up(self):
+        """Read what other processes wrote; the caller holds the lock"""
+        if self._unchanged():
+            return
+        if self._snapshot_signature() != self._signature or self._log_size() < self._log_offset:
+            # Someone compacted the log: compare a full load with what we hold
+            known = set(self.versions)
+            tasks_dict = self._load_all()
+            for task_id in known | set(self.versions):
+                if task_id not in self.versions:
+                    self._pending[task_id] = None
+                elif self.versions[task_id] != self.seen.get(task_id):
+                    self._pending[task_id] = tasks_dict[task_id]
+            return
+
+        with open(self.log_filename, 'rb') as file:
+            file.seek(self._log_offset)
+            data = file.read()
+        instrumentation.count_bytes("bytes_read", len(data))
+        for line in data.splitlines(keepends=True):
+            # A torn tail left by a crashed writer is dropped by the next writer
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            self._log_offset += len(line)
+            self.log_records += 1
+            if record["op"] == "put":
+                task = super().dict_to_task(record["task"])
+                self.versions[task.task_id] = record["task"].get("version", 1)
+                self._pending[task.task_id] = task
+                self.next_id = max(self.next_id, task.task_id + 1)
+            elif record["op"] == "del":
+                self.versions.pop(record["task_id"], None)
+                self._pending[record["task_id"]] = None
+            elif record["op"] == "reserve":
+                self.next_id = max(self.next_id, record["task_id"] + 1)
+
+    def read_changes(self):
+        """
+        Pick up changes other processes saved since the last load or call
+        Returns:
+            (updated tasks, deleted task IDs); both empty when nothing
+            changed, which costs two stat calls
+        """
+        with self._state_lock:
+            if not self._pending and self._unchanged():
+                return [], []
+            if not self._unchanged():
+                with self._locked(False):
+                    self._catch_up()
+            pending, self._pending = self._pending, {}
+
+            updated = []
+            deleted = []
+            for task_id, task in pending.items():
+                if task is None:
+                    if task_id in self.seen:
+                        deleted.append(task_id)
+                    self.seen.pop(task_id, None)
+                else:
+                    updated.append(task)
+                    self.seen[task_id] = self.versions[task_id]
+            return updated, deleted
+
+    def _append(self, records):
+        """Append log records; the caller holds the write lock and has caught up"""
+        if self._log_size() > self._log_offset:
+            # Only a torn record can follow what was read under the lock
+            with open(self.log_filename, 'r+b') as file:
+                file.truncate(self._log_offset)
+        data = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records).encode("utf-8")
+        with instrumentation.timed("SharedJournalFileHandler.append.fsync"):
+            with open(self.log_filename, 'ab') as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+        instrumentation.count_bytes("bytes_written", len(data))
+        self._log_offset += len(data)
+        self.log_records += len(records)
+
+    def reserve_id(self):
+        """
+        Claim a task ID no other process will hand out
+        Returns:
+            The reserved ID
+        """
+        with self._state_lock, self._locked(True):
+            self._catch_up()
+            task_id = self.next_id
+            self._append([{"op": "reserve", "task_id": task_id}])
+            self.next_id = task_id + 1
+            return task_id
+
+    def save_changes(self, tasks_dict, task_ids):
+        """
+        Append changed tasks unless another process changed them first
+        Args:
+            tasks_dict: Dictionary of tasks {task_id: Task object}
+            task_ids: IDs of tasks that were added, edited or deleted
+        Returns:
+            True on success, False if the log could not be written
+        Raises:
+            ConflictError naming the tasks whose stored version moved on
+            since they were read; nothing is written in that case
+        """
+        with self._state_lock:
+            try:
+                with self._locked(True):
+                    self._catch_up()
+                    conflicts = [task_id for task_id in task_ids
+                                 if self.versions.get(task_id, 0) != self.seen.get(task_id, 0)]
+                    if conflicts:
+                        raise ConflictError(conflicts)
+
+                    records = []
+                    for task_id in task_ids:
+                        task = tasks_dict.get(task_id)
+                        version = self.versions.get(task_id, 0) + 1
+                        if task is not None:
+                            records.append({"op": "put", "task": dict(self.task_to_dict(task), version=version)})
+                            self.versions[task_id] = self.seen[task_id] = version
+                            self.next_id = max(self.next_id, task_id + 1)
+                        elif task_id in self.versions:
+                            records.append({"op": "del", "task_id": task_id})
+                            del self.versions[task_id]
+                            del self.seen[task_id]
+                    if records:
+                        self._append(records)
+                    if self.log_records >= self.compact_every:
+                        self._compact()
+                return True
+            except (OSError, ValueError) as e:
+                print(f"Error saving tasks: {e}")
+                return False
+
+    def save_tasks(self, tasks_dict):
+        """
+        Save every task held and delete those no longer held
+        Args:
+            tasks_dict: Dictionary of tasks {task_id: Task object}
+        Raises:
+            ConflictError as for save_changes
+        """
+        with self._state_lock:
+            return self.save_changes(tasks_dict, sorted(set(tasks_dict) | set(self.seen)))
+
+    def _compact(self):
+        """Fold the log into a new snapshot; the caller holds the write lock"""
+        tasks_dict = self._load_all()
+        next_id = self.next_id
+        self.replace_snapshot([dict(self.task_to_dict(task), version=self.versions[task_id])
+                               for task_id, task in tasks_dict.items()])
+        self._signature = self._snapshot_signature()
+        self._log_offset = 0
+        # Keep reserved IDs reserved after the log is emptied
+        self._append([{"op": "reserve", "task_id": next_id - 1}])
@@ -0,0 +1,60 @@
+from collections.abc import Mapping
+from task import Task
+
+class TaskSnapshot(Mapping):
+    """
+    Read-only view of a TaskManager's tasks as they were at one moment
+
+    Taking a snapshot copies nothing. The manager copies its task
+    dictionary only on the first add or delete while a snapshot still
+    shares it, and keeps the old version of a task only when one of
+    its fields is edited. Writers carry on while a reader walks the
+    view, e.g. to save or export it. The view is a Mapping
+    {task_id: Task}, so it can be passed wherever a tasks dictionary is
+    read. Close it, or use it in a with block, once done, so later
+    writes stop paying for it.
+    """
+
+    def __init__(self, task_manager, tasks):
+        self.task_manager = task_manager
+        # Dictionary the manager no longer changes while this view is open
+        self._tasks = tasks
+        # task_id -> copy of a task as it was before an edit
+        self._before = {}
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        """Stop tracking changes for this view"""
+        if not self.closed:
+            self.closed = True
+            self.task_manager.release_snapshot(self)
+
+    def preserve(self, task):
+        """Keep a task as it is, right before its first edit since the snapshot"""
+        task_id = task.task_id
+        if task_id in self._before or self._tasks.get(task_id) is not task:
+            return
+        # The copy is not managed, so this does not notify anyone
+        copy = Task(task_id, task.title, task.description, task.priority, task.due_date)
+        copy.status = task.status
+        self._before[task_id] = copy
+
+    def __getitem__(self, task_id):
+        task = self._before.get(task_id)
+        return task if task is not None else self._tasks[task_id]
+
+    def __iter__(self):
+        return iter(self._tasks)
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __contains__(self, task_id):
+        return task_id in self._tasks
@@ -0,0 +1,214 @@
+import sqlite3
+import sys
+import instrumentation
+from file_handler import FileHandler
+from validator import Validator
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id INTEGER PRIMARY KEY,
+    title TEXT,
+    description TEXT,
+    priority TEXT,
+    due_date TEXT,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date);
+"""
+
+COLUMNS = ("task_id", "title", "description", "priority", "due_date", "status")
+
+UPSERT = (
+    "INSERT INTO tasks (task_id, title, description, priority, due_date, status) "
+    "VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (task_id) DO UPDATE SET title = excluded.title, "
+    "description = excluded.description, priority = excluded.priority, "
+    "due_date = excluded.due_date, status = excluded.status"
+)
+
+# Columns TaskManager may push an equality filter down to
+FILTER_COLUMNS = ("status", "priority", "due_date")
+
+class SQLiteFileHandler(FileHandler):
+    """Handles saving and loading tasks in an SQLite database"""
+
+    # Lets TaskManager run its filters as SQL queries
+    supports_pushdown = True
+
+    def __init__(self, filename="tasks.db"):
+        super().__init__(filename)
+        self.connection = None
+
+    def connect(self):
+        """Open the database and create the schema on first use"""
+        if self.connection is None:
+            # A background writer may use the connection from another thread
+            self.connection = sqlite3.connect(self.filename, check_same_thread=False)
+            self.connection.executescript(SCHEMA)
+        return self.connection
+
+    def data_version(self):
+        """Get a number that changes whenever another connection commits"""
+        return self.connect().execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        """Close the database connection"""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def save_tasks(self, tasks_dict):
+        """
+        Replace every stored task in a single transaction
+        Args:
+            tasks_dict: Dictionary of tasks {task_id: Task object}
+        """
+        try:
+            connection = self.connect()
+            with instrumentation.timed("SQLiteFileHandler.save_tasks.transaction"):
+                with connection:
+                    connection.execute("DELETE FROM tasks")
+                    connection.executemany(UPSERT, (self.task_to_row(task) for task in tasks_dict.values()))
+            return True
+        except Exception as e:
+            print(f"Error saving tasks: {e}")
+            return False
+
+    def save_changes(self, tasks_dict, task_ids):
+        """
+        Upsert or delete only the rows of the changed tasks
+        Args:
+            tasks_dict: Dictionary of tasks {task_id: Task object}
+            task_ids: IDs of tasks that were added, edited or deleted
+        Returns:
+            True on success, False otherwise
+        """
+        try:
+            connection = self.connect()
+            with instrumentation.timed("SQLiteFileHandler.save_changes.transaction"):
+                with connection:
+                    for task_id in task_ids:
+                        task = tasks_dict.get(task_id)
+                        if task is None:
+                            connection.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+                        else:
+                            connection.execute(UPSERT, self.task_to_row(task))
+            return True
+        except Exception as e:
+            print(f"Error saving tasks: {e}")
+            return False
+
+    def load_tasks(self, progress=None, validate=False):
+        """
+        Load every task from the database
+        Args:
+            progress: Optional callable(tasks_loaded, rows_total) called
+                once loading finishes
+            validate: Check every row and collect problems in
+                validation_errors; rows that cannot be turned into a Task
+                are skipped
+        Returns:
+            Dictionary of tasks {task_id: Task object}
+        """
+        self.validation_errors = []
+        self.load_error = None
+        try:
+            cursor = self.connect().execute(f"SELECT {', '.join(COLUMNS)} FROM tasks ORDER BY task_id")
+            tasks_dict = {}
+            for row_number, row in enumerate(cursor):
+                record = dict(zip(COLUMNS, row))
+                if validate:
+                    self.validation_errors.extend(Validator.validate_record(record, row_number))
+                    try:
+                        task = self.dict_to_task(record)
+                    except (KeyError, TypeError):
+                        continue
+                else:
+                    task = self.dict_to_task(record)
+                tasks_dict[task.task_id] = task
+
+            if self.validation_errors:
+                print(f"⚠ {len(self.validation_errors)} problem(s) found in {self.filename}.")
+
+            if progress is not None:
+                progress(len(tasks_dict), len(tasks_dict))
+            return tasks_dict
+
+        except sqlite3.DatabaseError as e:
+            print(f"Error reading {self.filename}. File may be corrupted. Starting fresh.")
+            self.load_error = str(e)
+            self.close()
+            return {}
+
+        except Exception as e:
+            print(f"Unexpected error loading tasks: {e}")
+            self.load_error = str(e)
+            return {}
+
+    def filter_ids(self, column, value):
+        """
+        Get the IDs of stored tasks whose column equals value
+        Args:
+            column: One of FILTER_COLUMNS
+            value: Value to match
+        Returns:
+            List of task IDs
+        """
+        if column not in FILTER_COLUMNS:
+            raise ValueError(f"Cannot filter on column {column}")
+        cursor = self.connect().execute(f"SELECT task_id FROM tasks WHERE {column} = ?", (value,))
+        return [row[0] for row in cursor]
+
+    def task_to_row(self, task):
+        """Convert Task object to a row tuple in COLUMNS order"""
+        return (task.task_id, task.title, task.description, task.priority, task.due_date, task.status)
+
+def migrate_json(json_filename, db_filename, overwrite=False):
+    """
+    Import an existing tasks.json file into an SQLite database
+    Args:
+        overwrite: Replace the tasks of a database that already has some
+    Returns:
+        Number of tasks imported
+    Raises:
+        OSError if the JSON file cannot be read, json.JSONDecodeError if
+        it is corrupted, FileExistsError if the database already holds
+        tasks and overwrite is False
+    """
+    source = FileHandler(json_filename)
+    # Read strictly: a missing or corrupt source must not become an empty import
+    with open(json_filename, 'r') as file:
+        tasks_dict = {task.task_id: task for task in source.iter_tasks(file)}
+    handler = SQLiteFileHandler(db_filename)
+    try:
+        if not overwrite:
+            count = handler.connect().execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+            if count:
+                raise FileExistsError(f"{db_filename} already holds {count} task(s); use --overwrite to replace them")
+        if not handler.save_tasks(tasks_dict):
+            raise RuntimeError(f"Could not write {db_filename}")
+    finally:
+        handler.close()
+    return len(tasks_dict)
+
+def main(argv=None):
+    """Import tasks.json into an SQLite database"""
+    args = list(sys.argv[1:] if argv is None else argv)
+    overwrite = "--overwrite" in args
+    if overwrite:
+        args.remove("--overwrite")
+    if len(args) != 2:
+        print("Usage: python sqlite_handler.py TASKS_JSON TASKS_DB [--overwrite]")
+        return 1
+    try:
+        count = migrate_json(args[0], args[1], overwrite=overwrite)
+    except (OSError, ValueError, RuntimeError, sqlite3.DatabaseError) as e:
+        print(f"✗ Could not import {args[0]}: {e}")
+        return 1
+    print(f"✓ Imported {count} task(s) from {args[0]} into {args[1]}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+from importlib import import_module
+from itertools import count
+
+# Storage backends selectable by name, e.g. TaskApp(storage="sqlite"), as
+# (module, class); only the backend opened is imported, so starting on JSON
+# does not pay for sqlite3, mmap and the rest
+STORAGE_BACKENDS = {
+    "json": ("file_handler", "FileHandler"),
+    "journal": ("journal_handler", "JournalFileHandler"),
+    "binary": ("binary_handler", "BinaryFileHandler"),
+    "sqlite": ("sqlite_handler", "SQLiteFileHandler"),
+    "sharded": ("sharded_handler", "ShardedFileHandler"),
+    "shared": ("shared_handler", "SharedJournalFileHandler"),
+}
+
+def backend_class(storage):
+    """
+    Import and get the handler class of a storage backend
+    Args:
+        storage: Name of a backend in STORAGE_BACKENDS
+    """
+    if storage not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {storage}")
+    module, name = STORAGE_BACKENDS[storage]
+    return getattr(import_module(module), name)
+
+def open_storage(storage="json", filename=None):
+    """
+    Create the file handler for a storage backend
+    Args:
+        storage: Name of a backend in STORAGE_BACKENDS
+        filename: File to use, or None for the backend's default
+    Returns:
+        FileHandler instance
+    """
+    # Each backend has its own default file name (tasks.json, tasks.db, ...)
+    handler_class = backend_class(storage)
+    return handler_class(filename) if filename else handler_class()
+
+def id_allocator(file_handler, taken):
+    """
+    Get a function handing out IDs for new tasks in a loaded store
+    Args:
+        file_handler: Handler of the store; its reserve_id is used when it
+            has one, so no other process hands out the same ID
+        taken: Collection of IDs already in use
+    Returns:
+        Callable returning a new ID on each call
+    """
+    reserve_id = getattr(file_handler, "reserve_id", None)
+    if reserve_id is None:
+        # The stored next_id also skips IDs of tasks deleted since
+        ids = count(max(getattr(file_handler, "next_id", None) or 1, max(taken, default=0) + 1))
+        return lambda: next(ids)
+
+    def allocate():
+        task_id = reserve_id()
+        while task_id in taken:
+            task_id = reserve_id()
+        return task_id
+    return allocate
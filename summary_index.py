@@ -0,0 +1,126 @@
+from datetime import date
+from task import date_to_ordinal
+
+class SummaryIndex:
+    """Counts tasks by status and priority, by due week and overdue"""
+
+    def __init__(self, today=None):
+        """
+        Args:
+            today: Callable returning today's date ordinal, for tests
+        """
+        self.today = today if today is not None else lambda: date.today().toordinal()
+        self.clear()
+
+    def clear(self):
+        """Drop every count"""
+        # (status, priority) -> tasks
+        self.counts = {}
+        # Monday ordinal of the due week -> tasks; 0 for tasks without a date
+        self.weeks = {}
+        # Due ordinal -> tasks not yet complete, to move the overdue count
+        # forward day by day instead of scanning the tasks
+        self.open_by_day = {}
+        self.total = 0
+        self._overdue = 0
+        self._as_of = self.today()
+
+    @staticmethod
+    def week_of(ordinal):
+        """Get the ordinal of the Monday starting the week of a date ordinal"""
+        # Ordinal 1 (0001-01-01) was a Monday
+        return ordinal - (ordinal - 1) % 7 if ordinal else 0
+
+    def _count(self, status, priority, due, delta):
+        key = (status, priority)
+        count = self.counts.get(key, 0) + delta
+        if count:
+            self.counts[key] = count
+        else:
+            self.counts.pop(key, None)
+
+        week = self.week_of(due)
+        count = self.weeks.get(week, 0) + delta
+        if count:
+            self.weeks[week] = count
+        else:
+            self.weeks.pop(week, None)
+
+        if due and status != "Complete":
+            count = self.open_by_day.get(due, 0) + delta
+            if count:
+                self.open_by_day[due] = count
+            else:
+                self.open_by_day.pop(due, None)
+            if due < self._as_of:
+                self._overdue += delta
+        self.total += delta
+
+    def add(self, task):
+        """Count a task under its current fields"""
+        self._count(task.status, task.priority, task.due_ordinal, 1)
+
+    def remove(self, task, value=None):
+        """Stop counting a task under its current fields"""
+        self._count(task.status, task.priority, task.due_ordinal, -1)
+
+    def update(self, task, field, old_value):
+        """Move a task's counts after one of its fields changed"""
+        if field not in ("status", "priority", "due_date"):
+            return
+        status, priority, due = task.status, task.priority, task.due_ordinal
+        if field == "status":
+            status = old_value
+        elif field == "priority":
+            priority = old_value
+        else:
+            due = date_to_ordinal(old_value) or 0
+        self._count(status, priority, due, -1)
+        self.add(task)
+
+    def rebuild(self, tasks):
+        """Count every task in a collection from scratch"""
+        self.clear()
+        for task in tasks:
+            self.add(task)
+
+    def count(self, status=None, priority=None):
+        """Count the tasks with a status and/or priority, None matching any"""
+        if status is not None and priority is not None:
+            return self.counts.get((status, priority), 0)
+        return sum(count for (task_status, task_priority), count in self.counts.items()
+                   if status in (None, task_status) and priority in (None, task_priority))
+
+    def overdue(self):
+        """Count the tasks not complete whose due date has passed"""
+        today = self.today()
+        if today != self._as_of:
+            if self._as_of < today <= self._as_of + len(self.open_by_day):
+                # Usually a day or so has passed: add the days in between
+                self._overdue += sum(self.open_by_day.get(day, 0) for day in range(self._as_of, today))
+            else:
+                self._overdue = sum(count for day, count in self.open_by_day.items() if day < today)
+            self._as_of = today
+        return self._overdue
+
+    def due_in_week(self, ordinal):
+        """Count the tasks due in the week holding a date ordinal"""
+        return self.weeks.get(self.week_of(ordinal), 0)
+
+    def check(self, tasks):
+        """
+        Compare the counts against the tasks they were built from
+        Args:
+            tasks: Dictionary of tasks {task_id: Task object}
+        Returns:
+            List of problem descriptions, empty when consistent
+        """
+        expected = SummaryIndex(self.today)
+        expected.rebuild(tasks.values())
+        problems = []
+        for name in ("counts", "weeks", "open_by_day", "total"):
+            if getattr(self, name) != getattr(expected, name):
+                problems.append(f"summary {name} do not match the tasks")
+        if self.overdue() != expected.overdue():
+            problems.append("summary overdue count does not match the tasks")
+        return problems
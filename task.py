@@ -1,13 +1,121 @@
+from datetime import date
+
+# Priority and status are stored as small integer codes into these tables
+PRIORITIES = ("High", "Medium", "Low")
+STATUSES = ("Pending", "Complete")
+PRIORITY_CODES = {name: code for code, name in enumerate(PRIORITIES)}
+STATUS_CODES = {name: code for code, name in enumerate(STATUSES)}
+
+def date_to_ordinal(date_string):
+    """
+    Convert a YYYY-MM-DD string to a proleptic Gregorian ordinal
+    Returns:
+        The ordinal, or None if the string is not a valid YYYY-MM-DD date
+    """
+    if type(date_string) is not str or len(date_string) != 10:
+        return None
+    try:
+        day = date.fromisoformat(date_string)
+    except ValueError:
+        return None
+    # fromisoformat also accepts other ISO layouts; only keep exact round trips
+    return day.toordinal() if day.isoformat() == date_string else None
+
 class Task:
     """Represents a single task"""
     
+    # Slots plus coded fields keep each task small when millions are loaded
+    __slots__ = ("_manager", "task_id", "_title", "_description", "_priority", "_due", "_status")
+    
     def __init__(self, task_id, title, description, priority, due_date):
+        # Set by TaskManager so it can keep its indexes up to date
+        self._manager = None
         self.task_id = task_id
-        self.title = title
-        self.description = description
-        self.priority = priority
-        self.due_date = due_date
-        self.status = "Pending"
+        self._title = title
+        self._description = description
+        self._priority = PRIORITY_CODES.get(priority, priority)
+        self._due = self._encode_date(due_date)
+        self._status = 0
+    
+    @staticmethod
+    def _encode_date(due_date):
+        # Values that are not valid dates are kept verbatim
+        ordinal = date_to_ordinal(due_date)
+        return due_date if ordinal is None else ordinal
+    
+    @property
+    def title(self):
+        return self._title
+    
+    @title.setter
+    def title(self, value):
+        old = self._title
+        self._changing(old, value)
+        self._title = value
+        self._notify("title", old, value)
+    
+    @property
+    def description(self):
+        return self._description
+    
+    @description.setter
+    def description(self, value):
+        old = self._description
+        self._changing(old, value)
+        self._description = value
+        self._notify("description", old, value)
+    
+    @property
+    def priority(self):
+        code = self._priority
+        return PRIORITIES[code] if type(code) is int else code
+    
+    @priority.setter
+    def priority(self, value):
+        old = self.priority
+        self._changing(old, value)
+        self._priority = PRIORITY_CODES.get(value, value)
+        self._notify("priority", old, value)
+    
+    @property
+    def due_date(self):
+        due = self._due
+        return date.fromordinal(due).isoformat() if type(due) is int else due
+    
+    @due_date.setter
+    def due_date(self, value):
+        old = self.due_date
+        self._changing(old, value)
+        self._due = self._encode_date(value)
+        self._notify("due_date", old, value)
+    
+    @property
+    def due_ordinal(self):
+        """Due date as an ordinal, or 0 when it is not a valid date"""
+        due = self._due
+        return due if type(due) is int else 0
+    
+    @property
+    def status(self):
+        code = self._status
+        return STATUSES[code] if type(code) is int else code
+    
+    @status.setter
+    def status(self, value):
+        old = self.status
+        self._changing(old, value)
+        self._status = STATUS_CODES.get(value, value)
+        self._notify("status", old, value)
+    
+    def _changing(self, old, new):
+        """Tell the owning manager that a field is about to change"""
+        if self._manager is not None and old != new:
+            self._manager.task_changing(self)
+    
+    def _notify(self, field, old, new):
+        """Tell the owning manager that an indexed field changed"""
+        if self._manager is not None and old != new:
+            self._manager.task_changed(self, field, old)
     
     def mark_complete(self):
         """Mark the task as complete"""
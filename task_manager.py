@@ -1,18 +1,138 @@
+import threading
+from datetime import date
+from itertools import islice
+from batch import Batch
+from deadline_scheduler import DeadlineScheduler
+from indexes import HashIndex, SortedIndex
+from query import Query, QueryPlan
+from snapshot import TaskSnapshot
+from summary_index import SummaryIndex
+from task import PRIORITIES, STATUSES, date_to_ordinal
+from text_index import TextIndex
+
 class TaskManager:
     """Manages a collection of tasks"""
     
-    def __init__(self):
+    def __init__(self, backend=None):
+        # Storage backend that can answer filters itself (see supports_pushdown)
+        self.backend = backend
+        # Bumped on every change; the backend only answers filters while it
+        # holds the version in memory, i.e. nothing is waiting to be saved
+        self.version = 0
+        self.stored_version = 0
+        self.status_index = HashIndex("status")
+        self.priority_index = HashIndex("priority")
+        self.due_date_index = SortedIndex("due_date", key=lambda task: task.due_ordinal)
+        self.text_index = TextIndex()
+        self.summary_index = SummaryIndex()
+        self.deadline_scheduler = DeadlineScheduler()
+        self.indexes = [self.status_index, self.priority_index, self.due_date_index, self.text_index,
+                        self.summary_index, self.deadline_scheduler]
+        # Open snapshot views, and a lock so one is never taken halfway
+        # through an add or delete on another thread
+        self._snapshots = []
+        self._snapshot_lock = threading.Lock()
         self.tasks = {}
     
+    @property
+    def tasks(self):
+        return self._tasks
+    
+    @tasks.setter
+    def tasks(self, tasks_dict):
+        """Replace the whole collection and rebuild the indexes"""
+        with self._snapshot_lock:
+            self._tasks = tasks_dict
+        # A whole collection is set right after loading it from the store
+        self.version += 1
+        self.stored_version = self.version
+        for task in tasks_dict.values():
+            task._manager = self
+        for index in self.indexes:
+            index.rebuild(tasks_dict.values())
+    
+    def _attach(self, task):
+        task._manager = self
+        for index in self.indexes:
+            index.add(task)
+    
+    def _detach(self, task):
+        task._manager = None
+        for index in self.indexes:
+            index.remove(task)
+    
+    def task_changing(self, task):
+        """Called by a managed Task right before one of its fields changes"""
+        # Before the write, so a snapshot never sees the new value
+        for snapshot in tuple(self._snapshots):
+            snapshot.preserve(task)
+    
+    def task_changed(self, task, field, old_value):
+        """Called by a managed Task after one of its indexed fields changed"""
+        self.version += 1
+        for index in self.indexes:
+            index.update(task, field, old_value)
+    
+    def _writable_tasks(self):
+        """Get the task dictionary to change, copying it if a snapshot shares it"""
+        tasks = self._tasks
+        for snapshot in self._snapshots:
+            if snapshot._tasks is tasks:
+                tasks = self._tasks = dict(tasks)
+                break
+        return tasks
+    
     def add_task(self, task):
         """Add a task to the manager"""
-        self.tasks[task.task_id] = task
+        with self._snapshot_lock:
+            tasks = self._writable_tasks()
+            existing = tasks.get(task.task_id)
+            tasks[task.task_id] = task
+            self.version += 1
+        if existing is not None:
+            self._detach(existing)
+        self._attach(task)
     
     def delete_task(self, task_id):
         """Delete a task by ID"""
-        if task_id not in self.tasks:
-            raise ValueError(f"Task with ID {task_id} not found")
-        del self.tasks[task_id]
+        with self._snapshot_lock:
+            if task_id not in self._tasks:
+                raise ValueError(f"Task with ID {task_id} not found")
+            task = self._writable_tasks().pop(task_id)
+            self.version += 1
+        self._detach(task)
+    
+    def snapshot(self):
+        """
+        Get a consistent view of the tasks without copying them
+        Returns:
+            TaskSnapshot; close it when done
+        """
+        with self._snapshot_lock:
+            snapshot = TaskSnapshot(self, self._tasks)
+            self._snapshots.append(snapshot)
+        return snapshot
+    
+    def release_snapshot(self, snapshot):
+        """Stop keeping old versions of tasks for a closed snapshot"""
+        # Matched by identity: a Mapping compares equal by content
+        with self._snapshot_lock:
+            self._snapshots = [other for other in self._snapshots if other is not snapshot]
+    
+    def __len__(self):
+        return len(self._tasks)
+    
+    def is_empty(self):
+        """Check in O(1) whether there are no tasks"""
+        return not self._tasks
+    
+    def batch(self):
+        """
+        Start a transaction of bulk changes
+        Returns:
+            Batch; use it in a with block so an error undoes every change
+        """
+        return Batch(self)
     
     def get_task_by_id(self, task_id):
         """Get a task by its ID"""
@@ -24,13 +144,164 @@ class TaskManager:
     
     def filter_by_status(self, status):
         """Filter tasks by status"""
-        return [task for task in self.tasks.values() if task.status == status]
+        if self._can_push_down():
+            return self._pushed_down("status", status)
+        return self.status_index.lookup(status)
     
     def filter_by_priority(self, priority):
         """Filter tasks by priority"""
-        return [task for task in self.tasks.values() if task.priority == priority]
+        if self._can_push_down():
+            return self._pushed_down("priority", priority)
+        return self.priority_index.lookup(priority)
+    
+    def mark_stored(self, version):
+        """Record that the tasks as of a version have been saved to the backend"""
+        if version > self.stored_version:
+            self.stored_version = version
+    
+    def _can_push_down(self):
+        # Unsaved changes would make the backend's answer stale
+        return getattr(self.backend, "supports_pushdown", False) and self.stored_version == self.version
+    
+    def _pushed_down(self, column, value):
+        """Run an equality filter in the backend and map IDs back to tasks"""
+        tasks = self.tasks
+        return [tasks[task_id] for task_id in self.backend.filter_ids(column, value) if task_id in tasks]
     
     def sort_by_due_date(self):
         """Sort tasks by due date"""
-        return sorted(self.tasks.values(), key=lambda task: task.due_date)
-
+        return list(self.due_date_index.iter_range())
+    
+    def due_between(self, start, end):
+        """Get tasks due from start to end (inclusive), soonest first"""
+        return list(self.due_date_index.iter_range(self._date_key(start), self._date_key(end)))
+    
+    def next_due(self, k, start=None):
+        """
+        Get the k soonest tasks due on or after start
+        Args:
+            k: Maximum number of tasks to return
+            start: Date string YYYY-MM-DD, defaults to today
+        """
+        start_key = date.today().toordinal() if start is None else self._date_key(start)
+        return list(islice(self.due_date_index.iter_range(start_key), k))
+    
+    @staticmethod
+    def _date_key(date_string):
+        ordinal = date_to_ordinal(date_string)
+        if ordinal is None:
+            raise ValueError(f"Invalid date: {date_string}")
+        return ordinal
+    
+    def count_view(self, view="all", value=None):
+        """
+        Count the tasks in a view without building it
+        Args:
+            view: "all", "status", "priority" or "due_date"
+            value: Status or priority to match for filtered views
+        """
+        if view in ("all", "due_date"):
+            return len(self.tasks)
+        if view == "status":
+            return self.status_index.count(value)
+        if view == "priority":
+            return self.priority_index.count(value)
+        raise ValueError(f"Unknown view: {view}")
+    
+    def page(self, view="all", value=None, offset=0, limit=20):
+        """
+        Get one page of a view, touching only the tasks on that page
+        Args:
+            view: "all", "status", "priority" or "due_date"
+            value: Status or priority to match for filtered views
+            offset: Position of the first task on the page
+            limit: Page size
+        Returns:
+            List of at most limit tasks
+        """
+        if view == "due_date":
+            return self.due_date_index.slice(offset, limit)
+        if view == "all":
+            tasks = self.tasks.values()
+        elif view == "status":
+            tasks = self.status_index.buckets.get(value, {}).values()
+        elif view == "priority":
+            tasks = self.priority_index.buckets.get(value, {}).values()
+        else:
+            raise ValueError(f"Unknown view: {view}")
+        return list(islice(tasks, offset, offset + limit))
+    
+    def search(self, query, limit=None):
+        """
+        Search titles and descriptions for every word of a query
+        Args:
+            query: Words to match; end a word with * to match it as a prefix
+            limit: Maximum number of results, or None for all
+        Returns:
+            Matching tasks, best matches first
+        """
+        return self.text_index.search(query, limit)
+    
+    def plan(self, query=None, **criteria):
+        """
+        Choose how to answer a query without running it
+        Args:
+            query: Query object, or None to build one from criteria
+            criteria: Keyword arguments of Query
+        Returns:
+            QueryPlan
+        """
+        return QueryPlan(self, Query(**criteria) if query is None else query)
+    
+    def query(self, query=None, **criteria):
+        """
+        Get the tasks matching every predicate of a query
+        Args:
+            query: Query object, or None to build one from criteria, e.g.
+                query(status="Pending", priority="High", due_from="2025-11-15",
+                      due_to="2025-11-21", order_by="due_date", limit=10)
+        Returns:
+            List of tasks in the query's order
+        """
+        return self.plan(query, **criteria).execute()
+    
+    def explain(self, query=None, **criteria):
+        """Describe the plan chosen for a query"""
+        return self.plan(query, **criteria).explain()
+    
+    def summary(self, weeks=4):
+        """
+        Get dashboard counts kept up to date on every change
+        Args:
+            weeks: Number of due weeks to count, starting with this one
+        Returns:
+            Dictionary with "total", "overdue", "by_status", "by_priority",
+            "by_status_priority" {status: {priority: count}} and "due_weeks",
+            a list of (Monday YYYY-MM-DD, count) pairs
+        """
+        index = self.summary_index
+        this_week = index.week_of(index.today())
+        return {
+            "total": index.total,
+            "overdue": index.overdue(),
+            "by_status": {status: index.count(status=status) for status in STATUSES},
+            "by_priority": {priority: index.count(priority=priority) for priority in PRIORITIES},
+            "by_status_priority": {status: {priority: index.count(status, priority) for priority in PRIORITIES}
+                                   for status in STATUSES},
+            "due_weeks": [(date.fromordinal(this_week + 7 * week).isoformat(),
+                           index.due_in_week(this_week + 7 * week)) for week in range(weeks)],
+        }
+    
+    def check_indexes(self):
+        """
+        Verify every index agrees with the stored tasks
+        Returns:
+            List of problem descriptions, empty when consistent
+        """
+        problems = []
+        for index in self.indexes:
+            problems.extend(index.check(self.tasks))
+        for task_id, task in self.tasks.items():
+            if task._manager is not self:
+                problems.append(f"task {task_id} is not attached to this manager")
+        return problems
@@ -0,0 +1,108 @@
+import unittest
+import os
+import tempfile
+from unittest.mock import patch
+from archive import TaskArchive
+from bulk_cli import main
+from file_handler import FileHandler
+from task import Task
+from task_manager import TaskManager
+
+class TestTaskArchive(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a store with old and new, complete and pending tasks"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = os.path.join(self.temp_dir.name, "tasks.json")
+        self.handler = FileHandler(self.store)
+        tasks = {}
+        for task_id, title, due, status in [
+            (1, "Old report", "2025-01-10", "Complete"),
+            (2, "Old invoice", "2025-02-10", "Complete"),
+            (3, "Old but open", "2025-01-15", "Pending"),
+            (4, "Recent report", "2025-11-10", "Complete"),
+        ]:
+            tasks[task_id] = Task(task_id, title, "Quarterly numbers", "Medium", due)
+            tasks[task_id].status = status
+        self.handler.save_tasks(tasks)
+        self.task_manager = TaskManager()
+        with patch('builtins.print'):
+            self.task_manager.tasks = self.handler.load_tasks()
+        self.archive = TaskArchive.for_store(self.handler)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def stored_ids(self):
+        with patch('builtins.print'):
+            return sorted(self.handler.load_tasks())
+
+    def test_archive_moves_old_complete_tasks(self):
+        """Test only complete tasks due before the cutoff leave the store"""
+        archived = self.archive.archive_completed(self.task_manager, self.handler, "2025-06-01")
+        self.assertEqual(sorted(archived), [1, 2])
+        self.assertEqual(self.stored_ids(), [3, 4])
+        self.assertTrue(self.archive.filename.endswith("tasks_archive.jsonl.gz"))
+        self.assertEqual(self.archive.count(), 2)
+        self.assertEqual(self.task_manager.check_indexes(), [])
+
+    def test_search_streams_the_archive(self):
+        """Test archived tasks are searchable by word and prefix"""
+        self.archive.archive_completed(self.task_manager, self.handler, "2025-06-01")
+        self.assertEqual([task.task_id for task in self.archive.search("report")], [1])
+        self.assertEqual([task.task_id for task in self.archive.search("quarter* inv*")], [2])
+        self.assertEqual(self.archive.search("recent"), [])
+        self.assertEqual(len(self.archive.search("old", limit=1)), 1)
+
+    def test_restore(self):
+        """Test restored tasks return to the store and leave the archive"""
+        self.archive.archive_completed(self.task_manager, self.handler, "2025-06-01")
+        # ID 2 was handed out again while archived
+        self.task_manager.add_task(Task(2, "Reused ID", "", "Low", "2025-12-01"))
+
+        restored = self.archive.restore(self.task_manager, self.handler, [1, 2])
+
+        self.assertEqual([task.title for task in restored], ["Old report", "Old invoice"])
+        self.assertEqual(restored[1].task_id, 5)
+        self.assertEqual(self.stored_ids(), [1, 2, 3, 4, 5])
+        self.assertEqual(self.archive.count(), 0)
+        with self.assertRaises(ValueError):
+            self.archive.restore(self.task_manager, self.handler, [1])
+
+    def test_restore_takes_new_ids_from_the_store(self):
+        """Test a reused ID is replaced by one the store hands out"""
+        self.archive.archive_completed(self.task_manager, self.handler, "2025-06-01")
+        self.task_manager.add_task(Task(2, "Reused ID", "", "Low", "2025-12-01"))
+        # IDs up to 8 were used by tasks deleted since
+        self.handler.next_id = 9
+        self.assertEqual(self.archive.restore(self.task_manager, self.handler, [2])[0].task_id, 9)
+
+        self.archive.archive_completed(self.task_manager, self.handler, "2025-06-01")
+        self.task_manager.add_task(Task(1, "Reused ID", "", "Low", "2025-12-01"))
+        self.handler.reserve_id = iter([2, 12]).__next__
+        self.assertEqual(self.archive.restore(self.task_manager, self.handler, [1])[0].task_id, 12)
+
+    def test_interrupted_append_keeps_earlier_tasks(self):
+        """Test a truncated last gzip member does not hide earlier tasks"""
+        self.archive.append([self.task_manager.tasks[1]])
+        self.archive.append([self.task_manager.tasks[2]] * 100)
+        with open(self.archive.filename, 'r+b') as file:
+            file.truncate(os.path.getsize(self.archive.filename) - 10)
+        task_ids = [task.task_id for task in self.archive.iter_tasks()]
+        self.assertEqual(task_ids[0], 1)
+        self.assertLess(len(task_ids), 101)
+
+    def test_cli(self):
+        """Test the archive, search-archive and restore commands"""
+        with patch('builtins.print') as mock_print:
+            self.assertEqual(main(["--data", self.store, "archive", "--before", "2025-06-01"]), 0)
+            self.assertEqual(main(["--data", self.store, "search-archive", "invoice"]), 0)
+            self.assertEqual(main(["--data", self.store, "restore", "2"]), 0)
+            self.assertEqual(main(["--data", self.store, "archive", "--before", "never"]), 1)
+        output = "\n".join(str(call.args[0]) for call in mock_print.call_args_list if call.args)
+        self.assertIn("Archived 2 task(s)", output)
+        self.assertIn("Old invoice", output)
+        self.assertEqual(self.stored_ids(), [2, 3, 4])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import os
+import json
+import tempfile
+from background_writer import BackgroundWriter
+from file_handler import ConflictError, FileHandler
+from task import Task
+from task_manager import TaskManager
+
+class CountingFileHandler(FileHandler):
+    """File handler that records each write and can be made to fail"""
+    
+    def __init__(self, filename):
+        super().__init__(filename)
+        self.writes = []
+        self.failures_left = 0
+        self.conflicts = []
+    
+    def save_tasks(self, tasks_dict):
+        return self.save_changes(tasks_dict, None)
+    
+    def save_changes(self, tasks_dict, task_ids):
+        if self.failures_left:
+            self.failures_left -= 1
+            raise OSError("disk full")
+        if self.conflicts:
+            conflicts, self.conflicts = self.conflicts, []
+            raise ConflictError(conflicts)
+        self.writes.append(task_ids)
+        return super().save_tasks(tasks_dict)
+
+class TestBackgroundWriter(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, "tasks.json")
+        self.handler = CountingFileHandler(self.filename)
+        self.manager = TaskManager()
+        self.writer = BackgroundWriter(self.handler, self.manager, delay=0.2, retry_delay=0.01)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.writer.close(timeout=5)
+        self.temp_dir.cleanup()
+    
+    def load_titles(self):
+        with open(self.filename) as file:
+            return sorted(record["title"] for record in json.load(file))
+    
+    def test_burst_is_coalesced(self):
+        """Test that many changes in quick succession become one write"""
+        for task_id in range(1, 51):
+            self.manager.add_task(Task(task_id, f"Task {task_id}", "", "High", "2025-11-15"))
+            self.writer.mark_dirty([task_id])
+        
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertEqual(self.handler.writes, [list(range(1, 51))])
+        self.assertEqual(len(self.load_titles()), 50)
+    
+    def test_full_save_and_atomic_write(self):
+        """Test that a full save replaces the file without leaving a temp file"""
+        self.manager.add_task(Task(1, "Only", "", "Low", "2025-11-15"))
+        self.writer.mark_dirty([1])
+        self.writer.mark_dirty()
+        
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertEqual(self.handler.writes, [None])
+        self.assertTrue(self.handler.atomic)
+        self.assertEqual(self.load_titles(), ["Only"])
+        self.assertFalse(os.path.exists(self.filename + ".tmp"))
+    
+    def test_failure_is_reported_and_retried(self):
+        """Test that a failed write is reported and its changes written later"""
+        self.handler.failures_left = 1
+        self.manager.add_task(Task(1, "Retry me", "", "Medium", "2025-11-15"))
+        self.writer.mark_dirty([1])
+        
+        self.assertFalse(self.writer.flush(timeout=5))
+        errors = self.writer.pop_errors()
+        self.assertEqual(len(errors), 1)
+        self.assertIn("disk full", errors[0])
+        self.assertEqual(self.writer.pop_errors(), [])
+        
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertEqual(self.handler.writes, [[1]])
+        self.assertEqual(self.load_titles(), ["Retry me"])
+    
+    def test_conflict_is_reported_and_dropped(self):
+        """Test that flush reports a conflict and the other tasks are still written"""
+        self.handler.conflicts = [1]
+        self.manager.add_task(Task(1, "Clash", "", "Medium", "2025-11-15"))
+        self.manager.add_task(Task(2, "No clash", "", "Low", "2025-11-15"))
+        self.writer.mark_dirty([1, 2])
+        
+        self.assertFalse(self.writer.flush(timeout=5))
+        self.assertIn("discarded", self.writer.pop_errors()[0])
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertEqual(self.handler.writes, [[2]])
+    
+    def test_close_flushes_pending_changes(self):
+        """Test that closing writes changes still waiting for the delay"""
+        self.manager.add_task(Task(1, "Last", "", "High", "2025-11-15"))
+        self.writer.mark_dirty([1])
+        
+        self.assertTrue(self.writer.close(timeout=5))
+        self.assertFalse(self.writer.pending())
+        self.assertEqual(self.load_titles(), ["Last"])
+
+if __name__ == '__main__':
+    unittest.main()
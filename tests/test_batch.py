@@ -0,0 +1,81 @@
+import unittest
+import os
+import tempfile
+from unittest.mock import patch
+from batch import BatchError
+from file_handler import FileHandler
+from task import Task
+from task_manager import TaskManager
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a task manager with five tasks"""
+        self.task_manager = TaskManager()
+        self.task_manager.tasks = {
+            task_id: Task(task_id, f"Task {task_id}", "", "High" if task_id % 2 else "Low",
+                          f"2025-11-{10 + task_id}")
+            for task_id in range(1, 6)
+        }
+
+    def test_bulk_changes(self):
+        """Test bulk status, priority, add and delete record changed IDs"""
+        with self.task_manager.batch() as batch:
+            self.assertEqual(batch.set_status("Complete", [1, 2]), 2)
+            self.assertEqual(batch.set_priority("Medium", priority="Low"), 2)
+            batch.add_tasks([Task(6, "Added", "", "Low", "2025-12-01")])
+            batch.delete(due_from="2025-11-15")
+
+        self.assertEqual(batch.changed, {1, 2, 4, 5, 6})
+        self.assertEqual(sorted(self.task_manager.tasks), [1, 2, 3, 4])
+        self.assertEqual(self.task_manager.count_view("status", "Complete"), 2)
+        self.assertEqual(self.task_manager.count_view("priority", "Medium"), 2)
+        self.assertEqual(self.task_manager.check_indexes(), [])
+
+    def test_invalid_change_rolls_back(self):
+        """Test a failing step undoes every earlier change of the batch"""
+        replaced = self.task_manager.tasks[3]
+        with self.assertRaises(BatchError) as context:
+            with self.task_manager.batch() as batch:
+                batch.set_status("Complete", [1, 2])
+                batch.delete([4])
+                batch.add_tasks([Task(3, "Replacement", "", "Low", "2025-12-01")])
+                batch.set_priority("Low", [5, 99])
+        self.assertIn("99", str(context.exception))
+
+        self.assertEqual(sorted(self.task_manager.tasks), [1, 2, 3, 4, 5])
+        self.assertIs(self.task_manager.tasks[3], replaced)
+        self.assertEqual(self.task_manager.count_view("status", "Complete"), 0)
+        self.assertEqual(batch.changed, set())
+        self.assertEqual(self.task_manager.check_indexes(), [])
+
+    def test_invalid_tasks_are_not_added(self):
+        """Test add_tasks validates every task before adding any"""
+        with self.assertRaises(BatchError) as context:
+            with self.task_manager.batch() as batch:
+                batch.add_tasks([Task(6, "Good", "", "Low", "2025-12-01"),
+                                 Task(7, "", "", "Urgent", "soon")])
+        self.assertEqual(len(context.exception.errors), 3)
+        self.assertNotIn(6, self.task_manager.tasks)
+
+    def test_selection_is_required(self):
+        """Test a bulk change without IDs or filter is refused"""
+        with self.assertRaises(ValueError):
+            self.task_manager.batch().delete()
+        self.assertEqual(len(self.task_manager.tasks), 5)
+
+    def test_batch_is_saved_with_one_write(self):
+        """Test the changed IDs persist with a single save"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            handler = FileHandler(os.path.join(temp_dir, "tasks.json"))
+            with self.task_manager.batch() as batch:
+                batch.set_status("Complete", status="Pending")
+            with patch.object(handler, 'save_tasks', wraps=handler.save_tasks) as mock_save:
+                self.assertTrue(handler.save_changes(self.task_manager.tasks, sorted(batch.changed)))
+            mock_save.assert_called_once()
+            with patch('builtins.print'):
+                stored = handler.load_tasks()
+            self.assertEqual({task.status for task in stored.values()}, {"Complete"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import os
+import json
+import tempfile
+from unittest.mock import patch
+from binary_handler import BinaryFileHandler, BinarySnapshot, json_to_binary, binary_to_json
+from task import Task
+
+class TestBinaryFileHandler(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a handler writing into a temporary directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, "tasks.bin")
+        self.handler = BinaryFileHandler(self.filename)
+        self.tasks = {
+            5: Task(5, "Task 5", "Déscription ✓", "High", "2025-11-15"),
+            2: Task(2, "Task 2", "", "Low", "2025-11-20")
+        }
+        self.tasks[2].mark_complete()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        """Test saved tasks load back unchanged"""
+        self.assertTrue(self.handler.save_tasks(self.tasks))
+        loaded = BinaryFileHandler(self.filename).load_tasks()
+
+        self.assertEqual(list(loaded.keys()), [5, 2])
+        self.assertEqual(loaded[5].description, "Déscription ✓")
+        self.assertEqual(loaded[2].status, "Complete")
+
+    def test_header_gives_count_and_next_id(self):
+        """Test the header is readable without decoding records"""
+        self.handler.save_tasks(self.tasks)
+        with BinarySnapshot(self.filename) as snapshot:
+            self.assertEqual(len(snapshot), 2)
+            self.assertEqual(snapshot.next_id, 6)
+            self.assertEqual(snapshot.get(2).title, "Task 2")
+            self.assertIsNone(snapshot.get(3))
+
+    def test_json_conversion_is_lossless(self):
+        """Test converting tasks.json to binary and back preserves every record"""
+        rows = [
+            {"task_id": 3, "title": "A", "description": None, "priority": "Urgent",
+             "due_date": "not a date", "status": "Pending"},
+            {"task_id": 1, "title": "B", "description": "x", "priority": "Low",
+             "due_date": "2025-01-01", "status": "Complete"}
+        ]
+        source = os.path.join(self.temp_dir.name, "tasks.json")
+        result = os.path.join(self.temp_dir.name, "round_trip.json")
+        with open(source, 'w') as file:
+            json.dump(rows, file)
+
+        json_to_binary(source, self.filename)
+        binary_to_json(self.filename, result)
+
+        with open(result) as file:
+            self.assertEqual(json.load(file), rows)
+
+    def test_validated_load_reports_bad_rows(self):
+        """Test validate=True collects problems like the JSON handler does"""
+        self.tasks[2].priority = "Urgent"
+        self.handler.save_tasks(self.tasks)
+        with patch('builtins.print'):
+            loaded = self.handler.load_tasks(validate=True)
+        self.assertEqual(len(loaded), 2)
+        self.assertEqual([(row, field) for row, field, _ in self.handler.validation_errors], [(1, "priority")])
+
+    def test_load_corrupted_file(self):
+        """Test a file with the wrong header loads as empty"""
+        with open(self.filename, 'wb') as file:
+            file.write(b"[]")
+        self.assertEqual(self.handler.load_tasks(), {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import os
+import json
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+from bulk_cli import main, parse_chunk, read_chunks
+from file_handler import FileHandler
+from shared_handler import SharedJournalFileHandler
+
+CSV_TEXT = (
+    "title,description,priority,due_date,status\n"
+    "Write report,\"Multi-line\nnotes\",High,2025-11-15,Pending\n"
+    "Review,,Low,2025-11-20,Complete\n"
+    "Broken,Bad date,Medium,2025-13-01,Pending\n"
+    "Plan,,Medium,2025-12-01,\n"
+)
+
+class TestBulkCli(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary directory for input, output and the store"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = os.path.join(self.temp_dir.name, "tasks.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+
+    def run_cli(self, *args):
+        with redirect_stdout(StringIO()) as output:
+            code = main(["--data", self.store, *args])
+        return code, output.getvalue()
+
+    def test_stats_time_lazily_imported_backends(self):
+        """Test --stats wraps a backend that is only imported when opened"""
+        stats_file = self.path("stats.json")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        # A fresh interpreter, where sqlite_handler is not imported yet
+        subprocess.run([sys.executable, "bulk_cli.py", "--storage", "sqlite", "--data", self.path("tasks.db"),
+                        "--stats", stats_file, "export", self.path("out.jsonl")],
+                       cwd=root, check=True, capture_output=True)
+        with open(stats_file) as file:
+            operations = json.load(file)["operations"]
+        self.assertIn("SQLiteFileHandler.load_tasks", operations)
+
+    def test_read_chunks_keeps_quoted_newlines_together(self):
+        """Test chunk boundaries never split a quoted CSV field"""
+        lines = StringIO(CSV_TEXT).readlines()[1:]
+        chunks = list(read_chunks(lines, "csv", 1))
+        self.assertEqual([first_row for first_row, _ in chunks], [0, 1, 2, 3])
+        self.assertEqual(len(chunks[0][1]), 2)
+
+    def test_parse_chunk_reports_bad_rows(self):
+        """Test invalid rows are reported with their row number"""
+        header = ["title", "description", "priority", "due_date", "status"]
+        records, errors = parse_chunk("csv", header, 0, StringIO(CSV_TEXT).readlines()[1:])
+        self.assertEqual([record["title"] for record in records], ["Write report", "Review", "Plan"])
+        self.assertEqual(errors[0][:2], (3, "due_date"))
+        self.assertEqual(records[2]["status"], "Pending")
+
+    def test_import_csv_with_process_pool(self):
+        """Test a CSV import assigns IDs and saves once"""
+        with open(self.path("in.csv"), 'w', newline='') as file:
+            file.write(CSV_TEXT)
+
+        code, output = self.run_cli("import", self.path("in.csv"), "--workers", "2", "--chunk-size", "1")
+
+        self.assertEqual(code, 1)
+        self.assertIn("Imported 3 task(s)", output)
+        self.assertIn("rows/s", output)
+        tasks = FileHandler(self.store).load_tasks()
+        self.assertEqual(sorted(tasks.keys()), [1, 2, 3])
+        self.assertEqual(tasks[1].description, "Multi-line\nnotes")
+
+    def test_import_takes_ids_from_the_store(self):
+        """Test new rows skip IDs another process reserved on a shared store"""
+        with open(self.path("in.jsonl"), 'w') as file:
+            file.write(json.dumps({"title": "Imported", "priority": "Low", "due_date": "2025-11-15"}) + "\n")
+        reserved = SharedJournalFileHandler(self.store).reserve_id()
+
+        code, _ = self.run_cli("--storage", "shared", "import", self.path("in.jsonl"), "--workers", "1")
+
+        self.assertEqual(code, 0)
+        with redirect_stdout(StringIO()):
+            tasks = SharedJournalFileHandler(self.store).load_tasks()
+        self.assertEqual(len(tasks), 1)
+        self.assertNotIn(reserved, tasks)
+
+    def test_import_refuses_unreadable_store(self):
+        """Test an import never writes over a store that failed to load"""
+        with open(self.path("in.csv"), 'w', newline='') as file:
+            file.write(CSV_TEXT)
+        with open(self.store, 'w') as file:
+            file.write('[{"task_id": 1,')
+
+        code, output = self.run_cli("import", self.path("in.csv"), "--workers", "1")
+
+        self.assertEqual(code, 1)
+        self.assertIn("nothing imported", output)
+        with open(self.store) as file:
+            self.assertEqual(file.read(), '[{"task_id": 1,')
+
+    def test_export_and_reimport_jsonl(self):
+        """Test exported JSON Lines import back into an empty store"""
+        with open(self.path("in.csv"), 'w', newline='') as file:
+            file.write(CSV_TEXT)
+        self.run_cli("import", self.path("in.csv"), "--workers", "1")
+        code, _ = self.run_cli("export", self.path("out.jsonl"))
+        self.assertEqual(code, 0)
+
+        with open(self.path("out.jsonl")) as file:
+            exported = [json.loads(line) for line in file]
+        self.assertEqual([row["task_id"] for row in exported], [1, 2, 3])
+
+        os.remove(self.store)
+        code, _ = self.run_cli("import", self.path("out.jsonl"), "--workers", "1")
+        self.assertEqual(code, 0)
+        tasks = FileHandler(self.store).load_tasks()
+        self.assertEqual(tasks[2].status, "Complete")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from datetime import date
+from task import Task
+from task_manager import TaskManager
+
+def day(text):
+    return date.fromisoformat(text).toordinal()
+
+class TestDeadlineScheduler(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a task manager with tasks due on different days"""
+        self.manager = TaskManager()
+        self.scheduler = self.manager.deadline_scheduler
+        self.manager.tasks = {
+            1: Task(1, "Monday", "", "High", "2025-11-10"),
+            2: Task(2, "Wednesday", "", "High", "2025-11-12"),
+            3: Task(3, "Friday", "", "Low", "2025-11-14"),
+            4: Task(4, "No date", "", "Low", "someday"),
+        }
+        self.fired = []
+        self.scheduler.subscribe(lambda kind, task: self.fired.append((kind, task.task_id)))
+
+    def test_events_fire_as_days_pass(self):
+        """Test due_soon fires the day before and overdue the day after"""
+        self.assertEqual(self.scheduler.tick(day("2025-11-08")), [])
+        self.scheduler.tick(day("2025-11-09"))
+        self.scheduler.tick(day("2025-11-11"))
+        # Events of the same day fire in task ID order
+        self.assertEqual(self.fired, [("due_soon", 1), ("overdue", 1), ("due_soon", 2)])
+        self.assertEqual(self.scheduler.overdue, {1})
+        self.assertEqual(self.manager.check_indexes(), [])
+
+    def test_long_gap_reports_only_overdue(self):
+        """Test a task already past due is not also reported as due soon"""
+        events = self.scheduler.tick(day("2025-12-01"))
+        self.assertEqual([(kind, task.task_id) for kind, task in events],
+                         [("overdue", 1), ("overdue", 2), ("overdue", 3)])
+
+    def test_edits_reschedule(self):
+        """Test due-date edits, completion and deletion cancel stale events"""
+        self.manager.get_task_by_id(1).due_date = "2025-11-20"
+        self.manager.get_task_by_id(2).mark_complete()
+        self.manager.delete_task(3)
+        self.manager.add_task(Task(5, "Added", "", "Low", "2025-11-11"))
+
+        self.scheduler.tick(day("2025-11-15"))
+        self.assertEqual(self.fired, [("overdue", 5)])
+        self.assertEqual(self.scheduler.next_event()[1:], ("due_soon", self.manager.get_task_by_id(1)))
+        self.assertEqual(self.manager.check_indexes(), [])
+
+        # Reopening or moving an overdue task schedules it again
+        self.manager.get_task_by_id(5).due_date = "2025-11-30"
+        self.assertEqual(self.scheduler.overdue, set())
+        self.assertEqual(self.manager.check_indexes(), [])
+
+    def test_reopened_task_fires_once(self):
+        """Test entries left from before a task was completed stay stale"""
+        task = self.manager.get_task_by_id(2)
+        task.mark_complete()
+        task.mark_incomplete()
+        self.assertEqual(self.manager.check_indexes(), [])
+
+        self.scheduler.tick(day("2025-11-11"))
+        self.assertEqual(self.fired, [("overdue", 1), ("due_soon", 2)])
+        self.assertEqual(self.manager.check_indexes(), [])
+
+    def test_stale_entries_are_compacted(self):
+        """Test repeated edits do not grow the heap without bound"""
+        task = self.manager.get_task_by_id(1)
+        for offset in range(1000):
+            task.due_date = date.fromordinal(day("2025-12-01") + offset % 30).isoformat()
+        self.assertLess(len(self.scheduler.heap), 100)
+        self.assertEqual(self.manager.check_indexes(), [])
+
+if __name__ == "__main__":
+    unittest.main()
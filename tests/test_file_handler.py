@@ -1,7 +1,10 @@
 import unittest
 from unittest.mock import mock_open, patch, MagicMock
+import io
+import os
 import json
-from file_handler import FileHandler
+import tempfile
+from file_handler import FileHandler, iter_json_array
 from task import Task
 
 class TestFileHandler(unittest.TestCase):
@@ -89,6 +92,52 @@ class TestFileHandler(unittest.TestCase):
         self.assertEqual(task.task_id, 1)
         self.assertEqual(task.title, "Test")
         self.assertEqual(task.status, "Pending")
+    
+    def test_iter_json_array_across_small_chunks(self):
+        """Test records split over many reads are parsed intact"""
+        records = [{"id": i, "text": "é" * i, "n": 12345.5} for i in range(20)]
+        parsed = [value for value, _ in iter_json_array(io.StringIO(json.dumps(records, indent=4)), chunk_size=7)]
+        self.assertEqual(parsed, records)
+    
+    def test_iter_json_array_rejects_bad_input(self):
+        """Test truncated or non-array content raises JSONDecodeError"""
+        for text in ['', '{"a": 1}', '[{"a": 1}, {"b"', '[1 2]', '[1,']:
+            with self.assertRaises(json.JSONDecodeError):
+                list(iter_json_array(io.StringIO(text), chunk_size=4))
+        self.assertEqual(list(iter_json_array(io.StringIO(" [ ] "))), [])
+    
+    def test_load_tasks_streams_with_progress(self):
+        """Test a real file round trip reports progress when done"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            handler = FileHandler(os.path.join(temp_dir, "tasks.json"))
+            self.sample_tasks[2].mark_complete()
+            handler.save_tasks(self.sample_tasks)
+            
+            reports = []
+            tasks = handler.load_tasks(progress=lambda count, chars: reports.append(count))
+        
+        self.assertEqual(sorted(tasks.keys()), [1, 2])
+        self.assertEqual(tasks[2].status, "Complete")
+        self.assertEqual(reports[-1], 2)
+    
+    def test_load_tasks_with_validation(self):
+        """Test validated loads report bad rows and skip incomplete ones"""
+        rows = [
+            {"task_id": 1, "title": "Good", "description": "", "priority": "High",
+             "due_date": "2025-11-15", "status": "Pending"},
+            {"task_id": 2, "title": "Bad date", "description": "", "priority": "High",
+             "due_date": "2025-13-01", "status": "Pending"},
+            {"task_id": 3, "title": "Incomplete"}
+        ]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            handler = FileHandler(os.path.join(temp_dir, "tasks.json"))
+            with open(handler.filename, 'w') as file:
+                json.dump(rows, file)
+            tasks = handler.load_tasks(validate=True)
+        
+        self.assertEqual(sorted(tasks.keys()), [1, 2])
+        self.assertEqual([(row, field) for row, field, _ in handler.validation_errors][0], (1, "due_date"))
+        self.assertEqual({row for row, _, _ in handler.validation_errors}, {1, 2})
 
 if __name__ == '__main__':
     unittest.main()
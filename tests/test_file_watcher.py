@@ -0,0 +1,192 @@
+import unittest
+import os
+import tempfile
+from unittest.mock import patch
+from file_handler import FileHandler
+from file_watcher import FileWatcher
+from journal_handler import JournalFileHandler
+from sharded_handler import ShardedFileHandler
+from shared_handler import SharedJournalFileHandler
+from sqlite_handler import SQLiteFileHandler
+from task import Task
+from task_manager import TaskManager
+
+class TestFileWatcher(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a temporary store location"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, "tasks.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def start(self, handler_class):
+        """Save three tasks, then load them as a running app would"""
+        tasks = {task_id: Task(task_id, f"Task {task_id}", "", "Medium", "2025-11-15")
+                 for task_id in (1, 2, 3)}
+        handler_class(self.filename).save_tasks(tasks)
+        self.handler = handler_class(self.filename)
+        self.task_manager = TaskManager()
+        with patch('builtins.print'):
+            self.task_manager.tasks = self.handler.load_tasks()
+        self.watcher = FileWatcher(self.handler, self.task_manager)
+        # A second handler stands in for the ops script editing the store
+        self.other = handler_class(self.filename)
+        with patch('builtins.print'):
+            return self.other.load_tasks()
+
+    def bump_mtime(self, *filenames):
+        # Edits within one clock tick would otherwise look unchanged
+        for filename in filenames:
+            stat = os.stat(filename)
+            os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_no_change_costs_no_read(self):
+        """Test polling an unchanged store does not open it"""
+        self.start(FileHandler)
+        with patch('builtins.open') as mock_open:
+            self.assertIsNone(self.watcher.poll())
+        mock_open.assert_not_called()
+
+    def test_json_edits_are_applied_as_diff(self):
+        """Test added, changed and removed records are applied by task_id"""
+        tasks = self.start(FileHandler)
+        unchanged = self.task_manager.tasks[1]
+        tasks[2].status = "Completed"
+        del tasks[3]
+        tasks[4] = Task(4, "Added by a script", "", "High", "2025-12-01")
+        self.other.save_tasks(tasks)
+        self.bump_mtime(self.filename)
+
+        diff = self.watcher.poll()
+
+        self.assertEqual([task.task_id for task in diff.added], [4])
+        self.assertEqual([task.task_id for task in diff.changed], [2])
+        self.assertEqual(diff.removed, [3])
+        # Untouched records are not rebuilt
+        self.assertIs(self.task_manager.tasks[1], unchanged)
+        self.assertEqual(self.task_manager.filter_by_status("Completed")[0].task_id, 2)
+        self.assertEqual(self.task_manager.check_indexes(), [])
+        self.assertIsNone(self.watcher.poll())
+
+    def test_own_save_is_not_diffed(self):
+        """Test a save of our own is acknowledged instead of read back"""
+        self.start(FileHandler)
+        self.task_manager.get_task_by_id(1).title = "Edited here"
+        self.handler.save_tasks(self.task_manager.tasks)
+        self.bump_mtime(self.filename)
+        self.watcher.saved()
+        self.assertFalse(self.watcher.changed())
+
+    def test_half_written_file_is_retried(self):
+        """Test an unreadable file leaves the tasks alone until it is whole"""
+        tasks = self.start(FileHandler)
+        with open(self.filename, 'w') as file:
+            file.write('[{"task_id": 1')
+        self.bump_mtime(self.filename)
+        self.assertIsNone(self.watcher.poll())
+        self.assertEqual(len(self.task_manager.tasks), 3)
+
+        del tasks[1]
+        self.other.save_tasks(tasks)
+        self.bump_mtime(self.filename)
+        self.assertEqual(self.watcher.poll().removed, [1])
+
+    def test_journal_reads_only_log_tail(self):
+        """Test appended journal records are applied without a full load"""
+        tasks = self.start(JournalFileHandler)
+        tasks[2].priority = "High"
+        del tasks[3]
+        self.other.save_changes(tasks, [2, 3])
+        self.bump_mtime(self.other.log_filename)
+
+        with patch.object(type(self.handler), 'load_tasks') as mock_load:
+            diff = self.watcher.poll()
+        mock_load.assert_not_called()
+        self.assertEqual([task.task_id for task in diff.changed], [2])
+        self.assertEqual(diff.removed, [3])
+        self.assertEqual(self.task_manager.filter_by_priority("High")[0].task_id, 2)
+
+        # A compaction rewrites the snapshot and falls back to a full diff
+        tasks[5] = Task(5, "After compaction", "", "Low", "")
+        self.other.save_tasks(tasks)
+        self.bump_mtime(self.filename)
+        diff = self.watcher.poll()
+        self.assertEqual([task.task_id for task in diff.added], [5])
+        self.assertEqual(diff.changed, [])
+
+    def test_shared_store_uses_read_changes(self):
+        """Test the shared store hands over only other processes' writes"""
+        tasks = self.start(SharedJournalFileHandler)
+        task_id = self.other.reserve_id()
+        tasks[task_id] = Task(task_id, "From another process", "", "Low", "")
+        self.other.save_changes(tasks, [task_id])
+
+        diff = self.watcher.poll()
+        self.assertEqual([task.task_id for task in diff.added], [task_id])
+        self.assertIn(task_id, self.task_manager.tasks)
+
+    def test_other_formats_fall_back_to_full_compare(self):
+        """Test formats without a cheaper path still apply only the diff"""
+        tasks = self.start(SQLiteFileHandler)
+        tasks[1].title = "Renamed"
+        self.other.save_changes(tasks, [1])
+        self.bump_mtime(self.filename)
+
+        diff = self.watcher.poll()
+        self.assertEqual([task.task_id for task in diff.changed], [1])
+        self.assertEqual(self.task_manager.get_task_by_id(1).title, "Renamed")
+
+    def test_own_sqlite_save_is_not_diffed(self):
+        """Test our own commits do not count as changes to an SQLite store"""
+        self.start(SQLiteFileHandler)
+        self.task_manager.get_task_by_id(1).title = "Renamed here"
+        self.handler.save_changes(self.task_manager.tasks, [1])
+        self.assertFalse(self.watcher.changed())
+
+        self.other.save_changes({2: Task(2, "Renamed there", "", "Low", "")}, [2])
+        self.assertTrue(self.watcher.changed())
+
+    def test_own_sharded_save_is_not_diffed(self):
+        """Test a save of our own into an unchanged store skips the reload"""
+        self.start(ShardedFileHandler)
+        self.task_manager.get_task_by_id(1).title = "Renamed here"
+        self.watcher.saving()
+        self.handler.save_changes(self.task_manager.tasks, [1])
+        self.watcher.saved()
+
+        with patch.object(type(self.handler), 'load_tasks') as mock_load:
+            self.assertIsNone(self.watcher.poll())
+        mock_load.assert_not_called()
+
+    def test_full_compare_leaves_the_live_handler_alone(self):
+        """Test diffing a store keeps the bookkeeping of the handler that saves"""
+        tasks = self.start(ShardedFileHandler)
+        self.handler._dirty.add("2025-11")
+        members = dict(self.handler.members)
+        tasks[1].title = "Renamed elsewhere"
+        self.other.save_changes(tasks, [1])
+        self.bump_mtime(self.handler.manifest_filename)
+
+        diff = self.watcher.poll()
+        self.assertEqual([task.task_id for task in diff.changed], [1])
+        self.assertEqual(self.handler._dirty, {"2025-11"})
+        self.assertEqual(self.handler.members, members)
+
+    def test_unreadable_store_is_retried(self):
+        """Test a store that loads as empty is not applied as every task removed"""
+        self.start(ShardedFileHandler)
+        for name in os.listdir(self.filename):
+            if name != "manifest.json":
+                with open(os.path.join(self.filename, name), 'w') as file:
+                    file.write("[{")
+        self.bump_mtime(self.handler.manifest_filename)
+
+        with patch('builtins.print'):
+            self.assertIsNone(self.watcher.poll())
+        self.assertEqual(len(self.task_manager.tasks), 3)
+        self.assertTrue(self.watcher.changed())
+
+if __name__ == "__main__":
+    unittest.main()
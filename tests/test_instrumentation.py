@@ -0,0 +1,115 @@
+import unittest
+import os
+import json
+import tempfile
+from unittest.mock import patch
+import instrumentation
+from file_handler import FileHandler
+from journal_handler import JournalFileHandler
+from task import Task
+from task_manager import TaskManager
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        """Start every test with empty statistics"""
+        instrumentation.stats.reset()
+        self.original_add_task = TaskManager.add_task
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.stats.reset()
+
+    def test_disabled_leaves_methods_untouched(self):
+        """Test nothing is wrapped or recorded until enabled"""
+        manager = TaskManager()
+        manager.add_task(Task(1, "Task 1", "Desc", "High", "2025-11-15"))
+        self.assertIs(TaskManager.add_task, self.original_add_task)
+        self.assertEqual(instrumentation.stats.snapshot(), {"operations": {}, "counters": {}})
+
+    def test_enable_records_calls_and_disable_restores(self):
+        """Test method calls are counted and the originals come back"""
+        instrumentation.enable()
+        manager = TaskManager()
+        manager.add_task(Task(1, "Task 1", "Desc", "High", "2025-11-15"))
+        manager.add_task(Task(2, "Task 2", "Desc", "Low", "2025-11-16"))
+        manager.filter_by_priority("High")
+
+        operations = instrumentation.stats.snapshot()["operations"]
+        self.assertEqual(operations["TaskManager.add_task"]["count"], 2)
+        self.assertEqual(sum(operations["TaskManager.add_task"]["buckets"].values()), 2)
+        self.assertEqual(operations["TaskManager.filter_by_priority"]["count"], 1)
+
+        instrumentation.disable()
+        self.assertIs(TaskManager.add_task, self.original_add_task)
+
+    def test_file_io_phases_and_bytes(self):
+        """Test handlers report serialize/fsync phases and byte counts"""
+        instrumentation.enable()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            handler = JournalFileHandler(os.path.join(temp_dir, "tasks.json"))
+            tasks = {1: Task(1, "Task 1", "Desc", "High", "2025-11-15")}
+            handler.save_tasks(tasks)
+            handler.save_changes(tasks, [1])
+            handler.load_tasks()
+            log_size = os.path.getsize(handler.log_filename)
+            snapshot_size = os.path.getsize(handler.filename)
+
+        snapshot = instrumentation.stats.snapshot()
+        for name in ("JournalFileHandler.save_changes", "JournalFileHandler.save_changes.serialize",
+                     "JournalFileHandler.save_changes.fsync", "JournalFileHandler.save_tasks.serialize",
+                     "JournalFileHandler.save_tasks.write", "JournalFileHandler.load_tasks",
+                     "FileHandler.load_tasks"):
+            self.assertIn(name, snapshot["operations"])
+        self.assertEqual(snapshot["counters"]["bytes_written"], snapshot_size + log_size)
+        self.assertEqual(snapshot["counters"]["bytes_read"], snapshot_size + log_size)
+
+    def test_json_save_phases(self):
+        """Test a JSON save times serializing apart from writing and syncing"""
+        instrumentation.enable()
+        tasks = {1: Task(1, "Task 1", "Desc", "High", "2025-11-15")}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            handler = FileHandler(os.path.join(temp_dir, "tasks.json"))
+            self.assertTrue(handler.save_tasks(tasks))
+            handler.atomic = True
+            self.assertTrue(handler.save_tasks(tasks))
+            self.assertEqual(len(handler.load_tasks()), 1)
+
+        operations = instrumentation.stats.snapshot()["operations"]
+        self.assertEqual(operations["FileHandler.save_tasks.serialize"]["count"], 2)
+        self.assertEqual(operations["FileHandler.save_tasks.write"]["count"], 2)
+        self.assertEqual(operations["FileHandler.save_tasks.fsync"]["count"], 1)
+
+    def test_disabled_save_writes_straight_to_file(self):
+        """Test saves build no in-memory copy of the document when disabled"""
+        tasks = {1: Task(1, "Task 1", "Desc", "High", "2025-11-15")}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            handlers = [FileHandler(os.path.join(temp_dir, "tasks.json")),
+                        JournalFileHandler(os.path.join(temp_dir, "journal.json"))]
+            with patch('json.dumps') as mock_dumps:
+                for handler in handlers:
+                    self.assertTrue(handler.save_tasks(tasks))
+            mock_dumps.assert_not_called()
+            self.assertEqual([len(handler.load_tasks()) for handler in handlers], [1, 1])
+
+    def test_dump_formats(self):
+        """Test statistics can be written as JSON and Prometheus text"""
+        instrumentation.stats.observe("TaskManager.add_task", 0.002)
+        instrumentation.stats.increment("bytes_written", 10)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            json_file = os.path.join(temp_dir, "stats.json")
+            prom_file = os.path.join(temp_dir, "stats.prom")
+            instrumentation.dump(json_file)
+            instrumentation.dump(prom_file)
+            with open(json_file) as file:
+                data = json.load(file)
+            with open(prom_file) as file:
+                text = file.read()
+
+        self.assertEqual(data["operations"]["TaskManager.add_task"]["count"], 1)
+        self.assertIn('taskmanager_operation_seconds_bucket{operation="TaskManager.add_task",le="0.001"} 0', text)
+        self.assertIn('taskmanager_operation_seconds_bucket{operation="TaskManager.add_task",le="0.005"} 1', text)
+        self.assertIn("taskmanager_bytes_written_total 10", text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import os
+import json
+import tempfile
+from journal_handler import JournalFileHandler
+from task import Task
+
+class TestJournalFileHandler(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a handler writing into a temporary directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, "tasks.json")
+        self.handler = JournalFileHandler(self.filename, compact_every=100)
+        self.tasks = {
+            1: Task(1, "Task 1", "Description 1", "High", "2025-11-15"),
+            2: Task(2, "Task 2", "Description 2", "Low", "2025-11-20")
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_changes_appends_one_record_per_task(self):
+        """Test each change is appended to the log, not the snapshot"""
+        self.handler.save_tasks(self.tasks)
+        self.tasks[1].mark_complete()
+        self.handler.save_changes(self.tasks, [1])
+
+        with open(self.handler.log_filename) as file:
+            lines = file.readlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["task"]["status"], "Complete")
+
+        # Snapshot is untouched
+        with open(self.filename) as file:
+            self.assertEqual(json.load(file)[0]["status"], "Pending")
+
+    def test_load_replays_log_over_snapshot(self):
+        """Test puts and deletes in the log are applied on load"""
+        self.handler.save_tasks(self.tasks)
+        self.tasks[3] = Task(3, "Task 3", "Description 3", "Medium", "2025-12-01")
+        self.handler.save_changes(self.tasks, [3])
+        del self.tasks[1]
+        self.handler.save_changes(self.tasks, [1])
+
+        loaded = JournalFileHandler(self.filename).load_tasks()
+        self.assertEqual(sorted(loaded.keys()), [2, 3])
+        self.assertEqual(loaded[3].title, "Task 3")
+
+    def test_load_ignores_torn_tail(self):
+        """Test a partially written last record is discarded"""
+        self.handler.save_tasks(self.tasks)
+        self.tasks[2].mark_complete()
+        self.handler.save_changes(self.tasks, [2])
+        with open(self.handler.log_filename, 'a') as file:
+            file.write('{"op":"del","task_')
+
+        handler = JournalFileHandler(self.filename)
+        loaded = handler.load_tasks()
+        self.assertEqual(len(loaded), 2)
+        self.assertEqual(loaded[2].status, "Complete")
+        self.assertEqual(handler.log_records, 1)
+
+        # New appends start on a clean line
+        handler.save_changes(loaded, [1])
+        self.assertEqual(len(JournalFileHandler(self.filename).load_tasks()), 2)
+
+    def test_compaction_after_threshold(self):
+        """Test the log is folded into the snapshot once it grows too long"""
+        handler = JournalFileHandler(self.filename, compact_every=2)
+        handler.save_tasks(self.tasks)
+        handler.save_changes(self.tasks, [1])
+        handler.save_changes(self.tasks, [2])
+
+        self.assertEqual(handler.log_records, 0)
+        self.assertEqual(os.path.getsize(handler.log_filename), 0)
+        self.assertEqual(len(JournalFileHandler(self.filename).load_tasks()), 2)
+
+if __name__ == '__main__':
+    unittest.main()
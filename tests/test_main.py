@@ -0,0 +1,108 @@
+import unittest
+import os
+import tempfile
+import threading
+from unittest.mock import patch
+from file_handler import FileHandler
+from main import TaskApp, parse_ids
+from storage import STORAGE_BACKENDS, backend_class
+from task import Task
+
+class TestTaskApp(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a JSON store with two tasks"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, "tasks.json")
+        FileHandler(self.filename).save_tasks({
+            1: Task(1, "First", "", "High", "2025-11-15"),
+            2: Task(2, "Second", "", "Low", "2025-11-16"),
+        })
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_fast_start_loads_in_background(self):
+        """Test the app is usable before loading ends and waits for it"""
+        release = threading.Event()
+        original = FileHandler.load_tasks
+
+        def slow_load(handler, *args, **kwargs):
+            release.wait(5)
+            return original(handler, *args, **kwargs)
+
+        with patch.object(FileHandler, 'load_tasks', slow_load), patch('builtins.print'):
+            app = TaskApp(self.filename, fast_start=True)
+            self.assertFalse(app.loaded.is_set())
+            release.set()
+            app.wait_until_loaded()
+        self.assertEqual(len(app.task_manager.tasks), 2)
+        self.assertEqual(app.next_id, 3)
+
+    def test_failed_background_load_is_raised(self):
+        """Test an error on the loader thread reaches the menu"""
+        with patch('builtins.print'):
+            app = TaskApp(self.filename, storage="unknown", fast_start=True)
+        with self.assertRaises(ValueError):
+            app.wait_until_loaded()
+
+    def test_conflict_keeps_the_rest_of_the_save(self):
+        """Test tasks saved alongside a conflicting one still reach the store"""
+        shared = os.path.join(self.temp_dir.name, "shared.json")
+        with patch('builtins.print'):
+            first = TaskApp(shared, storage="shared")
+            first.task_manager.tasks = {1: Task(1, "First", "", "High", "2025-11-15"),
+                                        2: Task(2, "Second", "", "Low", "2025-11-16")}
+            first.save_tasks()
+            second = TaskApp(shared, storage="shared")
+            second.task_manager.get_task_by_id(1).title = "Renamed elsewhere"
+            second.save_tasks([1])
+
+            for task_id in (1, 2):
+                first.task_manager.get_task_by_id(task_id).mark_complete()
+            first.save_tasks([1, 2])
+            stored = backend_class("shared")(shared).load_tasks()
+
+        self.assertEqual(first.task_manager.get_task_by_id(1).title, "Renamed elsewhere")
+        self.assertEqual(first.task_manager.get_task_by_id(1).status, "Pending")
+        self.assertEqual(stored[1].status, "Pending")
+        self.assertEqual(stored[2].status, "Complete")
+
+    def test_conflict_on_exit_is_reported(self):
+        """Test a conflict in the last async save is reported, not raised"""
+        shared = os.path.join(self.temp_dir.name, "shared.json")
+        with patch('builtins.print'):
+            backend_class("shared")(shared).save_tasks({1: Task(1, "First", "", "High", "2025-11-15"),
+                                                       2: Task(2, "Second", "", "Low", "2025-11-16")})
+            first = TaskApp(shared, storage="shared", save_mode="async")
+            second = TaskApp(shared, storage="shared")
+            second.task_manager.get_task_by_id(1).title = "Renamed elsewhere"
+            second.save_tasks([1])
+
+        for task_id in (1, 2):
+            first.task_manager.get_task_by_id(task_id).mark_complete()
+        first.save_tasks([1, 2])
+        with patch('builtins.print') as mock_print:
+            first.close_writer()
+            stored = backend_class("shared")(shared).load_tasks()
+        printed = " ".join(str(call.args[0]) for call in mock_print.call_args_list)
+        self.assertIn("discarded", printed)
+        self.assertEqual(stored[1].title, "Renamed elsewhere")
+        self.assertEqual(stored[2].status, "Complete")
+
+    def test_parse_ids(self):
+        """Test single IDs, lists and ranges"""
+        self.assertEqual(parse_ids("3"), [3])
+        self.assertEqual(parse_ids("1, 4 10-12"), [1, 4, 10, 11, 12])
+        with self.assertRaises(ValueError):
+            parse_ids("two")
+        with self.assertRaises(ValueError):
+            parse_ids(" ")
+
+    def test_every_backend_can_be_imported(self):
+        """Test the lazily imported storage registry names real classes"""
+        for storage in STORAGE_BACKENDS:
+            self.assertTrue(issubclass(backend_class(storage), FileHandler))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from query import Query
+from task import Task
+from task_manager import TaskManager
+
+class TestQuery(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.manager = TaskManager()
+        tasks = {}
+        for task_id in range(1, 201):
+            priority = ("High", "Medium", "Low")[task_id % 3]
+            due_date = f"2025-11-{task_id % 28 + 1:02d}"
+            title = "Write report" if task_id % 5 == 0 else f"Chore {task_id}"
+            tasks[task_id] = Task(task_id, title, "", priority, due_date)
+            if task_id % 2:
+                tasks[task_id].mark_complete()
+        self.manager.tasks = tasks
+    
+    def brute_force(self, predicate):
+        return [task for task in self.manager.get_all_tasks() if predicate(task)]
+    
+    def test_conjunction_with_top_k(self):
+        """Test combined predicates return the soonest matches in order"""
+        result = self.manager.query(status="Pending", priority="High",
+                                    due_from="2025-11-05", due_to="2025-11-20",
+                                    order_by="due_date", limit=5)
+        expected = sorted(self.brute_force(
+            lambda task: task.status == "Pending" and task.priority == "High"
+            and "2025-11-05" <= task.due_date <= "2025-11-20"),
+            key=lambda task: (task.due_date, task.task_id))[:5]
+        self.assertEqual([task.task_id for task in result], [task.task_id for task in expected])
+    
+    def test_composed_queries(self):
+        """Test building a query from chained and combined parts"""
+        query = Query().where_status("Pending").matching("report") & Query(priority=("High", "Low"))
+        result = self.manager.query(query.order("task_id").top(3))
+        expected = self.brute_force(
+            lambda task: task.status == "Pending" and task.title == "Write report"
+            and task.priority in ("High", "Low"))[:3]
+        self.assertEqual(result, expected)
+        self.assertEqual(self.manager.query(Query(status="Pending") & Query(status="Complete")), [])
+    
+    def test_orderings(self):
+        """Test descending and priority orderings against a full sort"""
+        result = self.manager.query(order_by="-due_date", limit=4)
+        expected = sorted(self.manager.get_all_tasks(),
+                          key=lambda task: (task.due_date, task.task_id), reverse=True)[:4]
+        self.assertEqual(result, expected)
+        
+        result = self.manager.query(status="Complete", order_by="priority", limit=10)
+        self.assertEqual({task.priority for task in result}, {"High"})
+    
+    def test_plan_uses_most_selective_path(self):
+        """Test the planner prefers the smallest index and an ordered scan for top-k"""
+        plan = self.manager.plan(status="Pending", due_from="2025-11-03", due_to="2025-11-03")
+        self.assertEqual(plan.access.name, "due_date index")
+        self.assertEqual(plan.filters, ["status"])
+        
+        plan = self.manager.plan(order_by="due_date", limit=10)
+        self.assertTrue(plan.access.ordered)
+        
+        plan = self.manager.plan(text="report", order_by="relevance", limit=3)
+        self.assertEqual(plan.access.name, "text index")
+    
+    def test_explain(self):
+        """Test explain names the access path, filters and ordering"""
+        text = self.manager.explain(status="Pending", priority="High", order_by="title", limit=3)
+        self.assertIn("Access: priority index", text)
+        self.assertIn("Filter: status", text)
+        self.assertIn("top 3 by title with a bounded heap", text)
+    
+    def test_invalid_queries(self):
+        """Test bad dates, orders and relevance without text raise ValueError"""
+        with self.assertRaises(ValueError):
+            Query(due_from="2025-13-01")
+        with self.assertRaises(ValueError):
+            Query(order_by="color")
+        with self.assertRaises(ValueError):
+            self.manager.query(order_by="relevance")
+
+if __name__ == '__main__':
+    unittest.main()
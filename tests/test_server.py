@@ -0,0 +1,132 @@
+import unittest
+import asyncio
+import json
+import os
+import tempfile
+from unittest.mock import patch
+from file_handler import FileHandler
+from server import STREAM_BATCH, TaskServer
+from task import Task
+
+class TestTaskServer(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up a server on a temporary JSON store"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, "tasks.json")
+        FileHandler(self.filename).save_tasks({
+            1: Task(1, "Existing", "Desc", "High", "2025-11-15"),
+        })
+        self.server = TaskServer("json", self.filename)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.server.close()
+        self.temp_dir.cleanup()
+    
+    def run_requests(self, requests):
+        """Send (method, path, body) requests over one connection"""
+        async def exchange():
+            server = await self.server.start("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = []
+            for method, path, body in requests:
+                data = b"" if body is None else json.dumps(body).encode("utf-8")
+                writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(data)}\r\n\r\n"
+                             .encode("latin-1") + data)
+                await writer.drain()
+                responses.append(await self.read_response(reader))
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return responses
+        return asyncio.run(exchange())
+    
+    @staticmethod
+    async def read_response(reader):
+        head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        status = int(head[0].split(" ")[1])
+        headers = dict(line.lower().split(": ", 1) for line in head[1:] if line)
+        if headers.get("transfer-encoding") == "chunked":
+            body = b""
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).strip(), 16)
+                body += (await reader.readexactly(size + 2))[:-2]
+                if size == 0:
+                    break
+        else:
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+        return status, headers, json.loads(body) if body else None
+    
+    def test_crud_on_one_connection(self):
+        """Test create, read, update and delete over a kept-alive connection"""
+        new_task = {"title": "Created", "priority": "Low", "due_date": "2025-12-01"}
+        responses = self.run_requests([
+            ("POST", "/tasks", new_task),
+            ("GET", "/tasks/2", None),
+            ("PATCH", "/tasks/2", {"status": "Complete"}),
+            ("DELETE", "/tasks/1", None),
+            ("GET", "/tasks/1", None),
+        ])
+        self.assertEqual([status for status, _, _ in responses], [201, 200, 200, 204, 404])
+        self.assertEqual(responses[0][2]["task_id"], 2)
+        self.assertEqual(responses[2][2]["status"], "Complete")
+        self.assertEqual(responses[0][1]["connection"], "keep-alive")
+        
+        # Write requests are only answered once saved
+        with patch('builtins.print'):
+            stored = FileHandler(self.filename).load_tasks()
+        self.assertEqual(list(stored), [2])
+        self.assertEqual(stored[2].status, "Complete")
+    
+    def test_filtered_sorted_view(self):
+        """Test query parameters select, order and page tasks"""
+        responses = self.run_requests([
+            ("POST", "/tasks", {"title": "Soon", "priority": "High", "due_date": "2025-11-01"}),
+            ("GET", "/tasks?priority=High&order_by=due_date&limit=1", None),
+            ("GET", "/tasks?priority=High&order_by=due_date&offset=1", None),
+            ("GET", "/explain?priority=High", None),
+        ])
+        self.assertEqual([task["title"] for task in responses[1][2]], ["Soon"])
+        self.assertEqual([task["title"] for task in responses[2][2]], ["Existing"])
+        self.assertIn("Access:", responses[3][2]["plan"])
+    
+    def test_summary(self):
+        """Test the summary endpoint returns the maintained counts"""
+        status, _, body = self.run_requests([
+            ("POST", "/tasks", {"title": "Low one", "priority": "Low", "due_date": "2025-11-20"}),
+            ("GET", "/summary", None),
+        ])[1]
+        self.assertEqual(status, 200)
+        self.assertEqual(body["total"], 2)
+        self.assertEqual(body["by_status_priority"]["Pending"]["Low"], 1)
+    
+    def test_large_results_are_streamed(self):
+        """Test lists longer than a batch are sent with chunked encoding"""
+        count = STREAM_BATCH * 2 + 7
+        for task_id in range(2, count + 1):
+            self.server.task_manager.add_task(Task(task_id, f"Task {task_id}", "", "Low", "2025-11-20"))
+        status, headers, body = self.run_requests([("GET", "/tasks?order_by=task_id", None)])[0]
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["transfer-encoding"], "chunked")
+        self.assertEqual([task["task_id"] for task in body], list(range(1, count + 1)))
+    
+    def test_invalid_requests(self):
+        """Test bad input is answered with JSON errors"""
+        responses = self.run_requests([
+            ("POST", "/tasks", {"title": "No date", "priority": "High"}),
+            ("PATCH", "/tasks/1", {"priority": "Urgent"}),
+            ("PATCH", "/tasks/1", {"due_date": ["2025-11-15"]}),
+            ("PATCH", "/tasks/1", {"priority": {"level": "High"}}),
+            ("PATCH", "/tasks/1", {"status": ["Complete"]}),
+            ("GET", "/tasks?due_from=tomorrow", None),
+            ("GET", "/nowhere", None),
+            ("PUT", "/tasks", None),
+        ])
+        self.assertEqual([status for status, _, _ in responses], [400, 400, 400, 400, 400, 400, 404, 405])
+        self.assertTrue(all("error" in body for _, _, body in responses))
+        self.assertEqual(self.server.task_manager.get_task_by_id(1).priority, "High")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+import os
+import json
+import tempfile
+from unittest.mock import patch
+from file_handler import FileHandler
+from sharded_handler import ShardedFileHandler, main, split_json, merge_shards
+from task import Task
+
+class TestShardedFileHandler(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a sharded store in a temporary directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, "shards")
+        self.handler = ShardedFileHandler(self.directory)
+        self.tasks = {
+            1: Task(1, "November", "", "High", "2025-11-15"),
+            2: Task(2, "December", "", "Low", "2025-12-01"),
+            3: Task(3, "Also November", "", "Medium", "2025-11-30"),
+            4: Task(4, "Someday", "", "Low", "not a date"),
+        }
+        self.tasks[2].mark_complete()
+        self.assertTrue(self.handler.save_tasks(self.tasks))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_shard(self, name, directory=None):
+        with open(os.path.join(directory or self.directory, name)) as file:
+            return sorted(record["task_id"] for record in json.load(file))
+
+    def test_tasks_are_partitioned_by_month(self):
+        """Test each due month gets its own shard listed in the manifest"""
+        self.assertEqual(self.read_shard("2025-11.json"), [1, 3])
+        self.assertEqual(self.read_shard("2025-12.json"), [2])
+        self.assertEqual(self.read_shard("undated.json"), [4])
+        with open(os.path.join(self.directory, "manifest.json")) as file:
+            manifest = json.load(file)
+        self.assertEqual(manifest["next_id"], 5)
+        self.assertEqual(manifest["shards"]["2025-11"]["count"], 2)
+
+        loaded = ShardedFileHandler(self.directory).load_tasks()
+        self.assertEqual(sorted(loaded), [1, 2, 3, 4])
+        self.assertEqual(loaded[2].status, "Complete")
+
+    def test_save_changes_rewrites_only_affected_shards(self):
+        """Test moving a task rewrites its old and new shard only"""
+        path = os.path.join(self.directory, "undated.json")
+        os.utime(path, (0, 0))
+        self.tasks[1].due_date = "2025-12-24"
+        self.assertTrue(self.handler.save_changes(self.tasks, [1]))
+
+        self.assertEqual(os.path.getmtime(path), 0)
+        self.assertEqual(self.read_shard("2025-11.json"), [3])
+        self.assertEqual(self.read_shard("2025-12.json"), [1, 2])
+
+        del self.tasks[2]
+        del self.tasks[1]
+        self.assertTrue(self.handler.save_changes(self.tasks, [1, 2]))
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "2025-12.json")))
+        self.assertNotIn("2025-12", ShardedFileHandler(self.directory).manifest)
+
+    def test_partial_load_keeps_unloaded_shards(self):
+        """Test loading selected months and saving loses no other tasks"""
+        handler = ShardedFileHandler(self.directory)
+        self.assertEqual(handler.select_shards("2025-12"), ["2025-12"])
+        tasks = handler.load_tasks(shards=handler.select_shards("2025-12"))
+        self.assertEqual(list(tasks), [2])
+        self.assertEqual(handler.next_id, 5)
+
+        tasks[2].due_date = "2025-11-01"
+        self.assertTrue(handler.save_tasks(tasks))
+        self.assertEqual(self.read_shard("2025-11.json"), [1, 2, 3])
+        self.assertEqual(sorted(ShardedFileHandler(self.directory).load_tasks()), [1, 2, 3, 4])
+
+    def test_id_layout(self):
+        """Test sharding by ID range"""
+        directory = os.path.join(self.temp_dir.name, "by_id")
+        handler = ShardedFileHandler(directory, layout="id", id_range=2)
+        self.assertTrue(handler.save_tasks(self.tasks))
+        self.assertEqual(handler.select_shards(3, 3), ["ids-0000000002"])
+        self.assertEqual(self.read_shard("ids-0000000002.json", directory), [2, 3])
+        # The manifest remembers the layout
+        self.assertEqual(ShardedFileHandler(directory).layout, "id")
+
+    def test_split_and_merge(self):
+        """Test converting to and from the single-file layout"""
+        json_filename = os.path.join(self.temp_dir.name, "tasks.json")
+        FileHandler(json_filename).save_tasks(self.tasks)
+        directory = os.path.join(self.temp_dir.name, "split")
+        self.assertEqual(split_json(json_filename, directory), 4)
+        with self.assertRaises(ValueError):
+            split_json(json_filename, directory)
+
+        merged_filename = os.path.join(self.temp_dir.name, "merged.json")
+        self.assertEqual(merge_shards(directory, merged_filename), 4)
+        with open(json_filename) as original, open(merged_filename) as merged:
+            self.assertEqual(json.load(original), json.load(merged))
+
+    def test_split_refuses_unreadable_tasks_json(self):
+        """Test a missing or corrupted tasks.json writes no empty store"""
+        json_filename = os.path.join(self.temp_dir.name, "tasks.json")
+        directory = os.path.join(self.temp_dir.name, "split")
+        with patch('builtins.print'):
+            self.assertEqual(main(["split", json_filename, directory]), 1)
+        with open(json_filename, 'w') as file:
+            file.write('[{"task_id": 1,')
+        with self.assertRaises(json.JSONDecodeError):
+            split_json(json_filename, directory)
+        self.assertFalse(os.path.exists(os.path.join(directory, "manifest.json")))
+
+    def test_merge_keeps_tasks_json_without_a_store(self):
+        """Test merging a missing or unreadable store does not overwrite tasks.json"""
+        json_filename = os.path.join(self.temp_dir.name, "tasks.json")
+        FileHandler(json_filename).save_tasks(self.tasks)
+        missing = os.path.join(self.temp_dir.name, "missing")
+        with self.assertRaises(ValueError):
+            merge_shards(missing, json_filename)
+
+        directory = os.path.join(self.temp_dir.name, "split")
+        split_json(json_filename, directory)
+        shard = sorted(name for name in os.listdir(directory) if name != "manifest.json")[0]
+        with open(os.path.join(directory, shard), 'w') as file:
+            file.write("[{")
+        with patch('builtins.print'), self.assertRaises(RuntimeError):
+            merge_shards(directory, json_filename)
+        self.assertEqual(len(FileHandler(json_filename).load_tasks()), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import os
+import tempfile
+from unittest.mock import patch
+from file_handler import ConflictError
+from shared_handler import SharedJournalFileHandler
+from task import Task
+
+class TestSharedJournalFileHandler(unittest.TestCase):
+
+    def setUp(self):
+        """Set up two handlers standing in for two processes"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, "tasks.json")
+        self.first = SharedJournalFileHandler(self.filename, compact_every=10)
+        self.second = SharedJournalFileHandler(self.filename, compact_every=10)
+        with patch('builtins.print'):
+            self.first_tasks = self.first.load_tasks()
+            self.second_tasks = self.second.load_tasks()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def add(self, handler, tasks, title):
+        task_id = handler.reserve_id()
+        tasks[task_id] = Task(task_id, title, "", "High", "2025-11-15")
+        self.assertTrue(handler.save_changes(tasks, [task_id]))
+        return task_id
+
+    def pull(self, handler, tasks):
+        updated, deleted = handler.read_changes()
+        for task in updated:
+            tasks[task.task_id] = task
+        for task_id in deleted:
+            tasks.pop(task_id, None)
+        return updated, deleted
+
+    def test_reserved_ids_are_unique(self):
+        """Test both processes get distinct IDs"""
+        ids = {self.first.reserve_id(), self.second.reserve_id(), self.first.reserve_id()}
+        self.assertEqual(len(ids), 3)
+
+    def test_changes_are_picked_up_incrementally(self):
+        """Test one process sees another's saves without a full reload"""
+        task_id = self.add(self.first, self.first_tasks, "From first")
+        with patch.object(SharedJournalFileHandler, "_load_all") as full_load:
+            updated, deleted = self.pull(self.second, self.second_tasks)
+        full_load.assert_not_called()
+        self.assertEqual([task.title for task in updated], ["From first"])
+        self.assertEqual(deleted, [])
+
+        # Nothing new: answered from two stat calls
+        with patch.object(SharedJournalFileHandler, "_catch_up") as catch_up:
+            self.assertEqual(self.second.read_changes(), ([], []))
+        catch_up.assert_not_called()
+
+        del self.second_tasks[task_id]
+        self.assertTrue(self.second.save_changes(self.second_tasks, [task_id]))
+        self.assertEqual(self.pull(self.first, self.first_tasks), ([], [task_id]))
+
+    def test_conflicting_edit_is_rejected(self):
+        """Test saving a task another process changed first raises ConflictError"""
+        task_id = self.add(self.first, self.first_tasks, "Original")
+        self.pull(self.second, self.second_tasks)
+
+        self.first_tasks[task_id].title = "First edit"
+        self.assertTrue(self.first.save_changes(self.first_tasks, [task_id]))
+        self.second_tasks[task_id].title = "Second edit"
+        with self.assertRaises(ConflictError) as raised:
+            self.second.save_changes(self.second_tasks, [task_id])
+        self.assertEqual(raised.exception.task_ids, [task_id])
+
+        # After refreshing, the second process holds the winning version
+        self.pull(self.second, self.second_tasks)
+        self.assertEqual(self.second_tasks[task_id].title, "First edit")
+        self.second_tasks[task_id].title = "Second edit"
+        self.assertTrue(self.second.save_changes(self.second_tasks, [task_id]))
+        with patch('builtins.print'):
+            stored = SharedJournalFileHandler(self.filename).load_tasks()
+        self.assertEqual(stored[task_id].title, "Second edit")
+
+    def test_compaction_by_another_process(self):
+        """Test changes survive another process folding the log into a snapshot"""
+        task_id = self.add(self.first, self.first_tasks, "Edited often")
+        self.pull(self.second, self.second_tasks)
+        with patch('builtins.print'):
+            for number in range(12):
+                self.first_tasks[task_id].title = f"Edit {number}"
+                self.assertTrue(self.first.save_changes(self.first_tasks, [task_id]))
+        self.assertTrue(os.path.exists(self.filename))
+
+        self.pull(self.second, self.second_tasks)
+        self.assertEqual(self.second_tasks[task_id].title, "Edit 11")
+        self.assertGreater(self.second.reserve_id(), task_id)
+        self.second_tasks[task_id].title = "After compaction"
+        self.assertTrue(self.second.save_changes(self.second_tasks, [task_id]))
+
+if __name__ == '__main__':
+    unittest.main()
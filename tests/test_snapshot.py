@@ -0,0 +1,90 @@
+import unittest
+import threading
+from task import Task
+from task_manager import TaskManager
+
+class TestTaskSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a task manager with three tasks"""
+        self.manager = TaskManager()
+        for task_id in (1, 2, 3):
+            self.manager.add_task(Task(task_id, f"Task {task_id}", "", "High", "2025-11-15"))
+
+    def test_snapshot_ignores_later_writes(self):
+        """Test adds, deletes and edits after a snapshot are not seen in it"""
+        with self.manager.snapshot() as snapshot:
+            self.manager.add_task(Task(4, "Added", "", "Low", "2025-11-20"))
+            self.manager.delete_task(2)
+            self.manager.get_task_by_id(1).title = "Renamed"
+            self.manager.get_task_by_id(1).mark_complete()
+
+            self.assertEqual(sorted(snapshot), [1, 2, 3])
+            self.assertEqual(len(snapshot), 3)
+            self.assertEqual(snapshot[1].title, "Task 1")
+            self.assertEqual(snapshot[1].status, "Pending")
+            self.assertEqual([task.title for task in snapshot.values()], ["Task 1", "Task 2", "Task 3"])
+
+        self.assertEqual(sorted(self.manager.tasks), [1, 3, 4])
+        self.assertEqual(self.manager.get_task_by_id(1).title, "Renamed")
+        self.assertEqual(self.manager.check_indexes(), [])
+
+    def test_task_is_kept_before_the_write(self):
+        """Test a reader never sees an edited field before the task is kept"""
+        with self.manager.snapshot() as snapshot:
+            seen = []
+            keep = snapshot.preserve
+
+            def preserve(task):
+                seen.append(snapshot[1].title)
+                keep(task)
+
+            snapshot.preserve = preserve
+            self.manager.get_task_by_id(1).title = "Renamed"
+            self.assertEqual(seen, ["Task 1"])
+            self.assertEqual(snapshot[1].title, "Task 1")
+
+    def test_no_copy_without_writes(self):
+        """Test the store is only copied by the first write during a snapshot"""
+        tasks = self.manager.tasks
+        snapshot = self.manager.snapshot()
+        self.assertIs(self.manager.tasks, tasks)
+        self.manager.add_task(Task(4, "Added", "", "Low", "2025-11-20"))
+        copied = self.manager.tasks
+        self.assertIsNot(copied, tasks)
+        self.manager.add_task(Task(5, "Added", "", "Low", "2025-11-20"))
+        self.assertIs(self.manager.tasks, copied)
+
+        # Once closed, writes change the store in place again
+        snapshot.close()
+        self.manager.get_task_by_id(3).title = "Not kept"
+        self.assertNotIn(3, snapshot._before)
+        self.manager.delete_task(5)
+        self.assertIs(self.manager.tasks, copied)
+
+    def test_reader_thread_walks_while_writer_writes(self):
+        """Test a reader sees one consistent state while another thread writes"""
+        for task_id in range(4, 2000):
+            self.manager.add_task(Task(task_id, f"Task {task_id}", "", "High", "2025-11-15"))
+        expected = {task_id: task.title for task_id, task in self.manager.tasks.items()}
+        seen = {}
+        started = threading.Event()
+
+        def read():
+            with self.manager.snapshot() as snapshot:
+                started.set()
+                for task_id, task in snapshot.items():
+                    seen[task_id] = task.title
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        started.wait()
+        for task_id in range(1, 1000):
+            self.manager.get_task_by_id(task_id).title = "Edited"
+            self.manager.delete_task(task_id)
+            self.manager.add_task(Task(task_id + 5000, "New", "", "Low", "2025-11-16"))
+        reader.join()
+        self.assertEqual(seen, expected)
+
+if __name__ == "__main__":
+    unittest.main()
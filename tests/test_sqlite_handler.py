@@ -0,0 +1,126 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+from unittest.mock import patch
+from file_handler import FileHandler
+from sqlite_handler import SQLiteFileHandler, main, migrate_json
+from task import Task
+from task_manager import TaskManager
+
+class TestSQLiteFileHandler(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a handler on a database in a temporary directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, "tasks.db")
+        self.handler = SQLiteFileHandler(self.filename)
+        self.tasks = {
+            1: Task(1, "Task 1", "Description 1", "High", "2025-11-15"),
+            2: Task(2, "Task 2", "Description 2", "Low", "2025-11-20")
+        }
+
+    def tearDown(self):
+        self.handler.close()
+        self.temp_dir.cleanup()
+
+    def count_rows(self):
+        with sqlite3.connect(self.filename) as connection:
+            return connection.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def test_save_and_load(self):
+        """Test a full save loads back the same tasks"""
+        self.tasks[2].mark_complete()
+        self.assertTrue(self.handler.save_tasks(self.tasks))
+
+        loaded = SQLiteFileHandler(self.filename).load_tasks()
+        self.assertEqual(sorted(loaded.keys()), [1, 2])
+        self.assertEqual(loaded[2].status, "Complete")
+
+    def test_save_changes_upserts_and_deletes_rows(self):
+        """Test single-task changes touch only their own rows"""
+        self.handler.save_tasks(self.tasks)
+        self.tasks[1].title = "Renamed"
+        self.tasks[3] = Task(3, "Task 3", "Description 3", "Medium", "2025-12-01")
+        del self.tasks[2]
+
+        self.assertTrue(self.handler.save_changes(self.tasks, [1, 2, 3]))
+
+        loaded = self.handler.load_tasks()
+        self.assertEqual(sorted(loaded.keys()), [1, 3])
+        self.assertEqual(loaded[1].title, "Renamed")
+        self.assertEqual(self.count_rows(), 2)
+
+    def test_manager_filters_push_down(self):
+        """Test TaskManager filters are answered by SQL queries"""
+        self.handler.save_tasks(self.tasks)
+        manager = TaskManager(self.handler)
+        manager.tasks = self.handler.load_tasks()
+
+        self.assertEqual([task.task_id for task in manager.filter_by_priority("Low")], [2])
+        self.assertEqual(len(manager.filter_by_status("Pending")), 2)
+        with self.assertRaises(ValueError):
+            self.handler.filter_ids("title; DROP TABLE tasks", "x")
+
+    def test_manager_filters_see_unsaved_changes(self):
+        """Test filters answer from memory while changes are not yet saved"""
+        self.handler.save_tasks(self.tasks)
+        manager = TaskManager(self.handler)
+        manager.tasks = self.handler.load_tasks()
+
+        manager.get_task_by_id(2).mark_complete()
+        with patch.object(self.handler, "filter_ids") as filter_ids:
+            self.assertEqual([task.task_id for task in manager.filter_by_status("Complete")], [2])
+            self.assertEqual([task.task_id for task in manager.filter_by_status("Pending")], [1])
+        filter_ids.assert_not_called()
+
+        version = manager.version
+        self.handler.save_changes(manager.tasks, [2])
+        manager.mark_stored(version)
+        self.assertEqual([task.task_id for task in manager.filter_by_status("Complete")], [2])
+
+    def test_migrate_json(self):
+        """Test importing an existing tasks.json file"""
+        json_filename = os.path.join(self.temp_dir.name, "tasks.json")
+        FileHandler(json_filename).save_tasks(self.tasks)
+
+        self.assertEqual(migrate_json(json_filename, self.filename), 2)
+        self.assertEqual(self.count_rows(), 2)
+
+    def test_migrate_json_refuses_bad_source_and_full_database(self):
+        """Test a failed read or a non-empty database leaves the database alone"""
+        json_filename = os.path.join(self.temp_dir.name, "tasks.json")
+        self.handler.save_tasks(self.tasks)
+
+        with self.assertRaises(FileNotFoundError):
+            migrate_json(json_filename, self.filename)
+        with open(json_filename, 'w') as file:
+            file.write('[{"task_id": 1,')
+        with self.assertRaises(ValueError):
+            migrate_json(json_filename, self.filename, overwrite=True)
+        FileHandler(json_filename).save_tasks({3: Task(3, "Task 3", "Description 3", "Medium", "2025-12-01")})
+        with patch('builtins.print'):
+            self.assertEqual(main([json_filename, self.filename]), 1)
+        self.assertEqual(self.count_rows(), 2)
+
+        with patch('builtins.print'):
+            self.assertEqual(main([json_filename, self.filename, "--overwrite"]), 0)
+        self.assertEqual(self.count_rows(), 1)
+
+    def test_validated_load_reports_bad_rows(self):
+        """Test validate=True collects problems like the JSON handler does"""
+        self.tasks[2].due_date = "someday"
+        self.handler.save_tasks(self.tasks)
+        with patch('builtins.print'):
+            loaded = self.handler.load_tasks(validate=True)
+        self.assertEqual(len(loaded), 2)
+        self.assertEqual([(row, field) for row, field, _ in self.handler.validation_errors], [(1, "due_date")])
+
+    def test_load_corrupted_database(self):
+        """Test a file that is not a database loads as empty"""
+        with open(self.filename, 'w') as file:
+            file.write("not a database" * 100)
+        self.assertEqual(self.handler.load_tasks(), {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from datetime import date
+from task import Task
+from task_manager import TaskManager
+
+class TestSummaryIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a task manager whose clock the tests control"""
+        self.today = date(2025, 11, 12).toordinal()
+        self.task_manager = TaskManager()
+        self.task_manager.summary_index.today = lambda: self.today
+        self.task_manager.summary_index.clear()
+        self.task_manager.tasks = {
+            1: Task(1, "Late", "", "High", "2025-11-10"),
+            2: Task(2, "Today", "", "High", "2025-11-12"),
+            3: Task(3, "Next week", "", "Low", "2025-11-18"),
+            4: Task(4, "No date", "", "Medium", "someday"),
+        }
+        self.index = self.task_manager.summary_index
+
+    def test_counts_follow_changes(self):
+        """Test counts move with every add, edit and delete"""
+        self.assertEqual(self.index.count("Pending", "High"), 2)
+        self.task_manager.get_task_by_id(1).mark_complete()
+        self.task_manager.get_task_by_id(3).priority = "High"
+        self.task_manager.add_task(Task(5, "New", "", "Medium", "2025-11-13"))
+        self.task_manager.delete_task(2)
+
+        self.assertEqual(self.index.count("Complete", "High"), 1)
+        self.assertEqual(self.index.count("Pending", "High"), 1)
+        self.assertEqual(self.index.count(priority="Medium"), 2)
+        self.assertEqual(self.index.count(), 4)
+        self.assertEqual(self.task_manager.check_indexes(), [])
+
+    def test_overdue_count(self):
+        """Test overdue counts skip complete and undated tasks"""
+        self.assertEqual(self.index.overdue(), 1)
+        self.task_manager.get_task_by_id(1).mark_complete()
+        self.assertEqual(self.index.overdue(), 0)
+        self.task_manager.get_task_by_id(2).due_date = "2025-11-01"
+        self.assertEqual(self.index.overdue(), 1)
+
+    def test_overdue_moves_with_the_clock(self):
+        """Test passing days make tasks overdue without a rescan"""
+        self.today += 1
+        self.assertEqual(self.index.overdue(), 2)
+        self.today += 30
+        self.assertEqual(self.index.overdue(), 3)
+        self.today -= 31
+        self.assertEqual(self.index.overdue(), 1)
+        self.assertEqual(self.task_manager.check_indexes(), [])
+
+    def test_summary(self):
+        """Test the summary groups counts and due weeks"""
+        summary = self.task_manager.summary(weeks=2)
+        self.assertEqual(summary["total"], 4)
+        self.assertEqual(summary["overdue"], 1)
+        self.assertEqual(summary["by_status"], {"Pending": 4, "Complete": 0})
+        self.assertEqual(summary["by_priority"], {"High": 2, "Medium": 1, "Low": 1})
+        self.assertEqual(summary["due_weeks"], [("2025-11-10", 2), ("2025-11-17", 1)])
+
+if __name__ == "__main__":
+    unittest.main()
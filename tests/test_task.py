@@ -33,6 +33,33 @@ class TestTask(unittest.TestCase):
         task.mark_complete()
         task.mark_incomplete()
         self.assertEqual(task.status, "Pending")
+    
+    def test_task_has_no_instance_dict(self):
+        """Test tasks use slots rather than a per-instance dictionary"""
+        task = Task(1, "Test task", "Description", "Low", "2025-11-10")
+        self.assertFalse(hasattr(task, "__dict__"))
+        with self.assertRaises(AttributeError):
+            task.unknown_field = 1
+    
+    def test_fields_are_stored_as_codes(self):
+        """Test priority, status and due date are stored compactly"""
+        task = Task(1, "Test task", "Description", "Medium", "2025-11-10")
+        self.assertIsInstance(task._priority, int)
+        self.assertIsInstance(task._status, int)
+        self.assertEqual(task._due, datetime(2025, 11, 10).toordinal())
+        self.assertEqual(task.due_ordinal, task._due)
+        
+        task.due_date = "2026-01-31"
+        self.assertEqual(task.due_date, "2026-01-31")
+    
+    def test_unknown_values_round_trip(self):
+        """Test values outside the code tables are kept verbatim"""
+        task = Task(1, "Test task", "Description", "Urgent", "2025-02-30")
+        task.status = "Blocked"
+        self.assertEqual(task.priority, "Urgent")
+        self.assertEqual(task.due_date, "2025-02-30")
+        self.assertEqual(task.status, "Blocked")
+        self.assertEqual(task.due_ordinal, 0)
 
 if __name__ == '__main__':
     unittest.main()
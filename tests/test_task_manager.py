@@ -56,6 +56,128 @@ class TestTaskManager(unittest.TestCase):
         
         high_priority = self.manager.filter_by_priority("High")
         self.assertEqual(len(high_priority), 1)
+    
+    def test_status_index_follows_task_changes(self):
+        """Test filters see status changes made after adding"""
+        task = Task(1, "Task 1", "Desc", "High", "2025-11-15")
+        self.manager.add_task(task)
+        task.mark_complete()
+        
+        self.assertEqual(self.manager.filter_by_status("Complete"), [task])
+        self.assertEqual(self.manager.filter_by_status("Pending"), [])
+        
+        task.mark_incomplete()
+        self.assertEqual(self.manager.filter_by_status("Pending"), [task])
+        self.assertEqual(self.manager.check_indexes(), [])
+    
+    def test_priority_index_follows_edits(self):
+        """Test filters see priority edits and deletions"""
+        task1 = Task(1, "Task 1", "Desc", "High", "2025-11-15")
+        task2 = Task(2, "Task 2", "Desc", "High", "2025-11-16")
+        self.manager.add_task(task1)
+        self.manager.add_task(task2)
+        
+        task1.priority = "Low"
+        self.manager.delete_task(2)
+        
+        self.assertEqual(self.manager.filter_by_priority("High"), [])
+        self.assertEqual(self.manager.filter_by_priority("Low"), [task1])
+        self.assertEqual(self.manager.check_indexes(), [])
+        
+        # Deleted tasks no longer report to the manager
+        task2.priority = "Low"
+        self.assertEqual(self.manager.filter_by_priority("Low"), [task1])
+    
+    def test_replacing_tasks_rebuilds_indexes(self):
+        """Test assigning the tasks dictionary re-indexes everything"""
+        task1 = Task(1, "Task 1", "Desc", "High", "2025-11-15")
+        task2 = Task(2, "Task 2", "Desc", "Low", "2025-11-16")
+        task2.mark_complete()
+        self.manager.add_task(Task(9, "Old", "Desc", "High", "2025-11-15"))
+        
+        self.manager.tasks = {1: task1, 2: task2}
+        
+        self.assertEqual(self.manager.filter_by_priority("High"), [task1])
+        self.assertEqual(self.manager.filter_by_status("Complete"), [task2])
+        self.assertEqual(self.manager.check_indexes(), [])
+    
+    def test_check_indexes_reports_drift(self):
+        """Test the consistency checker notices bypassed updates"""
+        task = Task(1, "Task 1", "Desc", "High", "2025-11-15")
+        self.manager.add_task(task)
+        task._priority = "Low"
+        
+        self.assertNotEqual(self.manager.check_indexes(), [])
+    
+    def test_sort_by_due_date(self):
+        """Test tasks come back ordered by due date"""
+        self.manager.add_task(Task(1, "Task 1", "Desc", "High", "2025-11-20"))
+        self.manager.add_task(Task(2, "Task 2", "Desc", "Low", "2025-11-10"))
+        self.manager.add_task(Task(3, "Task 3", "Desc", "Low", "2025-11-15"))
+        
+        ordered = [task.task_id for task in self.manager.sort_by_due_date()]
+        self.assertEqual(ordered, [2, 3, 1])
+    
+    def test_due_date_index_follows_edits(self):
+        """Test due-date edits and deletions reorder the index"""
+        task1 = Task(1, "Task 1", "Desc", "High", "2025-11-20")
+        task2 = Task(2, "Task 2", "Desc", "Low", "2025-11-10")
+        self.manager.add_task(task1)
+        self.manager.add_task(task2)
+        
+        task1.due_date = "2025-11-01"
+        self.assertEqual(self.manager.sort_by_due_date(), [task1, task2])
+        
+        self.manager.delete_task(1)
+        self.assertEqual(self.manager.sort_by_due_date(), [task2])
+        self.assertEqual(self.manager.check_indexes(), [])
+    
+    def test_due_between(self):
+        """Test range queries include both boundaries"""
+        for task_id, due in enumerate(["2025-11-01", "2025-11-05", "2025-11-05", "2025-11-09", "2025-11-12"], 1):
+            self.manager.add_task(Task(task_id, f"Task {task_id}", "Desc", "Low", due))
+        
+        in_range = [task.task_id for task in self.manager.due_between("2025-11-05", "2025-11-09")]
+        self.assertEqual(in_range, [2, 3, 4])
+        self.assertEqual(self.manager.due_between("2025-12-01", "2025-12-31"), [])
+    
+    def test_next_due(self):
+        """Test next_due returns the k soonest tasks from a start date"""
+        for task_id, due in enumerate(["2025-11-01", "2025-11-05", "2025-11-07", "2025-11-09"], 1):
+            self.manager.add_task(Task(task_id, f"Task {task_id}", "Desc", "Low", due))
+        
+        upcoming = [task.task_id for task in self.manager.next_due(2, start="2025-11-02")]
+        self.assertEqual(upcoming, [2, 3])
+    
+    def test_page_views(self):
+        """Test pages of each view hold only the requested slice"""
+        for task_id, (priority, due) in enumerate([("High", "2025-11-20"), ("Low", "2025-11-10"),
+                                                   ("High", "2025-11-15"), ("High", "2025-11-01")], 1):
+            self.manager.add_task(Task(task_id, f"Task {task_id}", "Desc", priority, due))
+        
+        self.assertEqual([task.task_id for task in self.manager.page("all", offset=1, limit=2)], [2, 3])
+        self.assertEqual([task.task_id for task in self.manager.page("due_date", offset=0, limit=3)], [4, 2, 3])
+        self.assertEqual([task.task_id for task in self.manager.page("priority", "High", 2, 2)], [4])
+        self.assertEqual(self.manager.page("status", "Complete"), [])
+    
+    def test_count_view(self):
+        """Test view sizes come from the indexes"""
+        self.manager.add_task(Task(1, "Task 1", "Desc", "High", "2025-11-15"))
+        self.manager.add_task(Task(2, "Task 2", "Desc", "Low", "2025-11-16"))
+        self.manager.get_task_by_id(2).mark_complete()
+        
+        self.assertEqual(self.manager.count_view("all"), 2)
+        self.assertEqual(self.manager.count_view("status", "Complete"), 1)
+        self.assertEqual(self.manager.count_view("priority", "Medium"), 0)
+        with self.assertRaises(ValueError):
+            self.manager.count_view("title")
+    
+    def test_len_and_is_empty(self):
+        """Test size checks without building a list"""
+        self.assertTrue(self.manager.is_empty())
+        self.manager.add_task(Task(1, "Task 1", "Desc", "High", "2025-11-15"))
+        self.assertFalse(self.manager.is_empty())
+        self.assertEqual(len(self.manager), 1)
 
 if __name__ == '__main__':
     unittest.main()
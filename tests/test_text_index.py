@@ -0,0 +1,47 @@
+import unittest
+from task import Task
+from task_manager import TaskManager
+
+class TestTextIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a manager with a few searchable tasks"""
+        self.manager = TaskManager()
+        self.manager.add_task(Task(1, "Write report", "Quarterly sales report", "High", "2025-11-15"))
+        self.manager.add_task(Task(2, "Review report", "Check the draft", "Low", "2025-11-20"))
+        self.manager.add_task(Task(3, "Plan sprint", "Write tickets for the report", "Medium", "2025-11-25"))
+
+    def ids(self, query, limit=None):
+        return [task.task_id for task in self.manager.search(query, limit)]
+
+    def test_and_query(self):
+        """Test every word of the query must match"""
+        self.assertEqual(sorted(self.ids("write report")), [1, 3])
+        self.assertEqual(self.ids("review draft"), [2])
+        self.assertEqual(self.ids("review sprint"), [])
+
+    def test_ranking_prefers_title_and_frequency(self):
+        """Test title matches and repeated words rank higher"""
+        self.assertEqual(self.ids("report"), [1, 2, 3])
+        self.assertEqual(self.ids("report", limit=1), [1])
+
+    def test_prefix_search_is_case_insensitive(self):
+        """Test a trailing * matches word prefixes"""
+        self.assertEqual(sorted(self.ids("REP*")), [1, 2, 3])
+        self.assertEqual(self.ids("spr*"), [3])
+        self.assertEqual(self.ids("rep"), [])
+
+    def test_index_follows_edits_and_deletes(self):
+        """Test title/description edits and deletions update the index"""
+        task = self.manager.get_task_by_id(2)
+        task.title = "Approve budget"
+        task.description = ""
+        self.manager.delete_task(3)
+
+        self.assertEqual(self.ids("report"), [1])
+        self.assertEqual(self.ids("budget"), [2])
+        self.assertEqual(self.ids("sprint"), [])
+        self.assertEqual(self.manager.check_indexes(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -32,6 +32,39 @@ class TestValidator(unittest.TestCase):
         self.assertFalse(Validator.validate_priority(""))
         self.assertFalse(Validator.validate_priority("high"))  # Wrong case
         self.assertFalse(Validator.validate_priority("123"))
+    
+    def test_leap_years(self):
+        """Test February 29th follows the Gregorian leap year rules"""
+        self.assertTrue(Validator.validate_date("2024-02-29"))
+        self.assertTrue(Validator.validate_date("2000-02-29"))
+        self.assertFalse(Validator.validate_date("2023-02-29"))
+        self.assertFalse(Validator.validate_date("1900-02-29"))
+        self.assertFalse(Validator.validate_date("0000-01-01"))
+        self.assertFalse(Validator.validate_date("2025-11-15\n"))
+    
+    def test_validate_dates_column(self):
+        """Test a column of dates reports only the invalid rows"""
+        dates = ["2025-11-15"] * 3 + ["2025-02-30", "", None, "2025-11-15"]
+        self.assertEqual(Validator.validate_dates(dates), [(3, "2025-02-30"), (4, ""), (5, None)])
+    
+    def test_validate_priorities_column(self):
+        """Test a column of priorities reports only the invalid rows"""
+        priorities = ["High", "Low", "high", "Medium", 3]
+        self.assertEqual(Validator.validate_priorities(priorities), [(2, "high"), (4, 3)])
+    
+    def test_validate_records(self):
+        """Test per-row reports for whole task records"""
+        good = {"task_id": 1, "title": "T", "description": "", "priority": "High",
+                "due_date": "2025-11-15", "status": "Pending"}
+        bad = dict(good, task_id="2", priority="Urgent", status="Done")
+        missing = {"task_id": 3}
+        
+        errors = Validator.validate_records([good, bad, missing])
+        
+        self.assertEqual([(row, field) for row, field, _ in errors],
+                         [(1, "task_id"), (1, "priority"), (1, "status"),
+                          (2, "title"), (2, "description"), (2, "priority"),
+                          (2, "due_date"), (2, "status")])
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,202 @@
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+
+WORD = re.compile(r"\w+")
+QUERY_TERM = re.compile(r"(\w+)(\*?)")
+
+# Title words count more than description words when ranking
+FIELD_WEIGHTS = {"title": 2, "description": 1}
+
+def tokenize(text):
+    """Split text into lower-case words"""
+    if not isinstance(text, str):
+        return []
+    return WORD.findall(text.lower())
+
+class TextIndex:
+    """Inverted index from words in titles and descriptions to tasks"""
+    
+    def __init__(self):
+        # word -> {task_id: weighted occurrence count}
+        self.postings = {}
+        # Sorted words, for prefix lookups
+        self.vocabulary = []
+        self.tasks = {}
+    
+    def _add_words(self, task_id, text, weight):
+        for word in tokenize(text):
+            postings = self.postings.get(word)
+            if postings is None:
+                postings = self.postings[word] = {}
+                insort(self.vocabulary, word)
+            postings[task_id] = postings.get(task_id, 0) + weight
+    
+    def _remove_words(self, task_id, text, weight):
+        for word in tokenize(text):
+            postings = self.postings.get(word)
+            if postings is None or task_id not in postings:
+                continue
+            remaining = postings[task_id] - weight
+            if remaining > 0:
+                postings[task_id] = remaining
+            else:
+                del postings[task_id]
+                if not postings:
+                    del self.postings[word]
+                    del self.vocabulary[bisect_left(self.vocabulary, word)]
+    
+    def add(self, task):
+        """Index the words of a task's title and description"""
+        self.tasks[task.task_id] = task
+        for field, weight in FIELD_WEIGHTS.items():
+            self._add_words(task.task_id, getattr(task, field), weight)
+    
+    def remove(self, task, value=None):
+        """Remove a task using its current title and description"""
+        if self.tasks.pop(task.task_id, None) is None:
+            return
+        for field, weight in FIELD_WEIGHTS.items():
+            self._remove_words(task.task_id, getattr(task, field), weight)
+    
+    def update(self, task, field, old_value):
+        """Re-index a task after its title or description changed"""
+        weight = FIELD_WEIGHTS.get(field)
+        if weight is not None and task.task_id in self.tasks:
+            self._remove_words(task.task_id, old_value, weight)
+            self._add_words(task.task_id, getattr(task, field), weight)
+    
+    def clear(self):
+        """Drop every entry"""
+        self.postings = {}
+        self.vocabulary = []
+        self.tasks = {}
+    
+    def rebuild(self, tasks):
+        """Index every task in a collection from scratch"""
+        self.clear()
+        for task in tasks:
+            self.tasks[task.task_id] = task
+            for field, weight in FIELD_WEIGHTS.items():
+                for word in tokenize(getattr(task, field)):
+                    postings = self.postings.setdefault(word, {})
+                    postings[task.task_id] = postings.get(task.task_id, 0) + weight
+        self.vocabulary = sorted(self.postings)
+    
+    def _term_matches(self, term, prefix):
+        """Merge the postings of a word, or of every word starting with it"""
+        if not prefix:
+            return self.postings.get(term, {})
+        merged = {}
+        position = bisect_left(self.vocabulary, term)
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(term):
+            for task_id, weight in self.postings[self.vocabulary[position]].items():
+                merged[task_id] = merged.get(task_id, 0) + weight
+            position += 1
+        return merged
+    
+    @staticmethod
+    def parse_query(query):
+        """Split a query into (word, is_prefix) terms"""
+        return [(term.lower(), bool(star)) for term, star in QUERY_TERM.findall(query)]
+    
+    def estimate(self, terms):
+        """
+        Cheaply bound the number of tasks matching every term
+        Returns:
+            Posting count of the rarest term, summed over words for a prefix
+        """
+        if not terms:
+            return 0
+        counts = []
+        for term, prefix in terms:
+            if not prefix:
+                counts.append(len(self.postings.get(term, ())))
+                continue
+            count = 0
+            position = bisect_left(self.vocabulary, term)
+            while position < len(self.vocabulary) and self.vocabulary[position].startswith(term):
+                count += len(self.postings[self.vocabulary[position]])
+                position += 1
+            counts.append(count)
+        return min(counts)
+    
+    def matches(self, task, terms):
+        """Check whether a task's own text contains every term"""
+        words = set(tokenize(task.title))
+        words.update(tokenize(task.description))
+        for term, prefix in terms:
+            if prefix:
+                if not any(word.startswith(term) for word in words):
+                    return False
+            elif term not in words:
+                return False
+        return bool(terms)
+    
+    def scores(self, terms):
+        """
+        Score the tasks containing every term
+        Args:
+            terms: (word, is_prefix) pairs from parse_query
+        Returns:
+            Dictionary {task_id: relevance score}
+        """
+        if not terms:
+            return {}
+        
+        # Intersect starting from the rarest term so the working set stays small
+        matches = sorted((self._term_matches(term, prefix) for term, prefix in terms), key=len)
+        if not matches[0]:
+            return {}
+        
+        total = len(self.tasks)
+        scores = {}
+        for task_id, weight in matches[0].items():
+            scores[task_id] = weight * math.log(1 + total / len(matches[0]))
+        for postings in matches[1:]:
+            idf = math.log(1 + total / len(postings))
+            scores = {task_id: score + postings[task_id] * idf
+                      for task_id, score in scores.items() if task_id in postings}
+            if not scores:
+                return {}
+        return scores
+    
+    def search(self, query, limit=None):
+        """
+        Find tasks containing every term of a query, best matches first
+        Args:
+            query: Words to match; a trailing * makes a word a prefix
+            limit: Maximum number of results, or None for all
+        Returns:
+            List of tasks
+        """
+        scores = self.scores(self.parse_query(query))
+        
+        # Highest score first, lower task ID breaking ties
+        if limit is None:
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        else:
+            ranked = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [self.tasks[task_id] for task_id, _ in ranked]
+    
+    def check(self, tasks):
+        """
+        Compare the index against the tasks it was built from
+        Args:
+            tasks: Dictionary of tasks {task_id: Task object}
+        Returns:
+            List of problem descriptions, empty when consistent
+        """
+        expected = TextIndex()
+        expected.rebuild(tasks.values())
+        problems = []
+        if set(self.tasks) != set(tasks):
+            problems.append(f"text index holds {len(self.tasks)} of {len(tasks)} tasks")
+        if self.postings != expected.postings:
+            stale = sorted(word for word in set(self.postings) | set(expected.postings)
+                           if self.postings.get(word) != expected.postings.get(word))
+            problems.append(f"text index postings differ for: {', '.join(stale[:10])}")
+        if self.vocabulary != expected.vocabulary:
+            problems.append("text index vocabulary is out of date")
+        return problems
@@ -1,30 +1,127 @@
 import re
-from datetime import datetime
+
+# Compiled once instead of on every validate_date call
+DATE_PATTERN = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}')
+DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+VALID_PRIORITIES = ("High", "Medium", "Low")
+VALID_STATUSES = ("Pending", "Complete")
+REQUIRED_FIELDS = ("task_id", "title", "description", "priority", "due_date", "status")
+
+# Results for date strings already checked; bounded so hostile input
+# cannot grow it without limit
+MAX_CACHED_DATES = 100000
+_date_cache = {}
+
+def _check_date(date_string):
+    """Check a YYYY-MM-DD string arithmetically"""
+    if not DATE_PATTERN.fullmatch(date_string):
+        return False
+    year = int(date_string[0:4])
+    month = int(date_string[5:7])
+    day = int(date_string[8:10])
+    if year < 1 or not 1 <= month <= 12 or day < 1:
+        return False
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return day <= 29
+    return day <= DAYS_IN_MONTH[month]
 
 class Validator:
     """Validates user inputs"""
-    
+
     @staticmethod
     def validate_date(date_string):
         """Validate date format YYYY-MM-DD"""
         if not date_string:
             return False
-        
-        # Check format with regex
-        pattern = r'^\d{4}-\d{2}-\d{2}$'
-        if not re.match(pattern, date_string):
-            return False
-        
-        # Check if it's a valid date
-        try:
-            datetime.strptime(date_string, '%Y-%m-%d')
-            return True
-        except ValueError:
-            return False
-    
+
+        result = _date_cache.get(date_string)
+        if result is None:
+            result = _check_date(date_string)
+            if len(_date_cache) < MAX_CACHED_DATES:
+                _date_cache[date_string] = result
+        return result
+
     @staticmethod
     def validate_priority(priority):
         """Validate priority level"""
-        valid_priorities = ["High", "Medium", "Low"]
-        return priority in valid_priorities
+        return priority in VALID_PRIORITIES
 
+    @staticmethod
+    def validate_dates(dates):
+        """
+        Validate a whole column of dates
+        Args:
+            dates: Sequence of date strings
+        Returns:
+            List of (row, value) for every invalid entry
+        """
+        # Each distinct value is checked once however often it repeats
+        verdicts = {}
+        errors = []
+        for row, value in enumerate(dates):
+            try:
+                valid = verdicts[value]
+            except KeyError:
+                valid = verdicts[value] = isinstance(value, str) and Validator.validate_date(value)
+            except TypeError:
+                valid = False
+            if not valid:
+                errors.append((row, value))
+        return errors
+
+    @staticmethod
+    def validate_priorities(priorities):
+        """
+        Validate a whole column of priorities
+        Args:
+            priorities: Sequence of priority strings
+        Returns:
+            List of (row, value) for every invalid entry
+        """
+        return [(row, value) for row, value in enumerate(priorities)
+                if not isinstance(value, str) or value not in VALID_PRIORITIES]
+
+    @staticmethod
+    def validate_record(record, row=0):
+        """
+        Validate one task dictionary in the tasks.json layout
+        Args:
+            record: Task dictionary
+            row: Row number to put in the report
+        Returns:
+            List of (row, field, message), empty when the record is valid
+        """
+        if not isinstance(record, dict):
+            return [(row, None, "Record is not an object")]
+
+        errors = [(row, field, "Missing field") for field in REQUIRED_FIELDS if field not in record]
+        if errors:
+            return errors
+
+        if type(record["task_id"]) is not int:
+            errors.append((row, "task_id", "Task ID must be an integer"))
+        if not isinstance(record["title"], str) or not record["title"]:
+            errors.append((row, "title", "Title cannot be empty"))
+        if not isinstance(record["description"], str):
+            errors.append((row, "description", "Description must be text"))
+        if not isinstance(record["priority"], str) or record["priority"] not in VALID_PRIORITIES:
+            errors.append((row, "priority", f"Invalid priority {record['priority']!r}"))
+        if not isinstance(record["due_date"], str) or not Validator.validate_date(record["due_date"]):
+            errors.append((row, "due_date", f"Invalid date {record['due_date']!r}"))
+        if not isinstance(record["status"], str) or record["status"] not in VALID_STATUSES:
+            errors.append((row, "status", f"Invalid status {record['status']!r}"))
+        return errors
+
+    @staticmethod
+    def validate_records(records):
+        """
+        Validate many task dictionaries at once
+        Args:
+            records: Sequence of task dictionaries
+        Returns:
+            List of (row, field, message) for every problem found
+        """
+        errors = []
+        for row, record in enumerate(records):
+            errors.extend(Validator.validate_record(record, row))
+        return errors